@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Supabase client construction and connection reuse (utils/db.py)
+
+Against the local PostgREST stand-in (standins/postgrest.py) with an emulated
+per-connection handshake and per-request latency, measures:
+
+  1. construction   create_client() per call vs the shared get_supabase_client()
+  2. sequential     N small queries with a new client per call (the old
+                    utils.db behaviour) vs the shared client
+  3. concurrent     N row updates, sequential on the shared sync client vs
+                    asyncio.gather() on get_async_supabase_client()
+
+Usage:
+    python bench_db_client.py
+    python bench_db_client.py --queries 300 --handshake-ms 80 --latency-ms 20
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Supabase client reuse')
+    parser.add_argument('--queries', type=int, default=100, help='Queries per run (default: 100)')
+    parser.add_argument('--handshake-ms', type=float, default=50.0,
+                        help='Simulated connection setup cost (default: 50)')
+    parser.add_argument('--latency-ms', type=float, default=10.0,
+                        help='Simulated per-request latency (default: 10)')
+    args = parser.parse_args()
+
+    from standins.postgrest import start_postgrest_standin
+    server = start_postgrest_standin(handshake_ms=args.handshake_ms, latency_ms=args.latency_ms)
+    standin = server.standin
+
+    # config reads these at import time, so they must be set before importing utils.db
+    os.environ['SUPABASE_URL'] = server.url
+    os.environ['SUPABASE_KEY'] = 'offline-benchmark'
+
+    logging.basicConfig(level=logging.WARNING)
+    from supabase import create_client
+    from utils import db
+
+    standin.table('crawl_state').append({'listing': 'meetings', 'high_water_date': '2025-01-01'})
+    ids = [str(i) for i in range(args.queries)]
+    standin.tables['meetings'] = [{'id': i, 'title': f'회의 {i}', 'committee_id': None} for i in ids]
+    results = []
+
+    def run(label, func):
+        standin.reset_counters()
+        seconds = timed(func)
+        counters = standin.counters()
+        results.append((label, seconds, counters['db_requests'], counters['connections']))
+
+    # 1. Construction only (no requests)
+    n = args.queries
+    per_new = timed(lambda: [create_client(server.url, 'offline-benchmark') for _ in range(n)]) / n
+    db.get_supabase_client()
+    per_shared = timed(lambda: [db.get_supabase_client() for _ in range(n)]) / n
+
+    # 2. Sequential queries through utils.db
+    shared = db.get_supabase_client
+
+    def new_client_per_call():
+        db.get_supabase_client = lambda: create_client(server.url, 'offline-benchmark')
+        try:
+            for _ in range(n):
+                db.get_high_water_mark('meetings')
+        finally:
+            db.get_supabase_client = shared
+
+    run('new client per call', new_client_per_call)
+    run('shared client', lambda: [db.get_high_water_mark('meetings') for _ in range(n)])
+
+    # 3. Independent writes: sequential sync vs concurrent async
+    def sync_updates():
+        client = db.get_supabase_client()
+        for i in ids:
+            client.table('meetings').update({'committee_id': 'c'}).eq('id', i).execute()
+
+    async def async_updates():
+        client = await db.get_async_supabase_client()
+        await asyncio.gather(*(
+            client.table('meetings').update({'committee_id': 'c'}).eq('id', i).execute() for i in ids
+        ))
+
+    run('sync updates', sync_updates)
+    run('async gather', lambda: asyncio.run(async_updates()))
+
+    server.shutdown()
+
+    print(f"\nStand-in: handshake {args.handshake_ms:.0f} ms/connection, "
+          f"latency {args.latency_ms:.0f} ms/request, {n} operations per run\n")
+    print(f"Client construction: create_client() {per_new * 1000:.2f} ms, "
+          f"get_supabase_client() {per_shared * 1e6:.2f} µs\n")
+    print(f"{'run':<22}{'wall (s)':>10}{'requests':>10}{'conns':>8}{'ms/op':>8}")
+    for label, seconds, requests_made, connections in results:
+        print(f"{label:<22}{seconds:>10.3f}{requests_made:>10}{connections:>8}{seconds / n * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
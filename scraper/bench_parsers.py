@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: HTML parser backends (utils/htmlparse.py) over the checked-in captures
+
+Runs every page extractor (councillors, meetings, bills, transcript) on its
+fixture with each backend, checks the records are identical to the original
+full-tree html.parser extraction, and reports parse time and peak memory.
+Each backend runs in a fresh process so peak RSS is not shared between them;
+the Python heap peak comes from tracemalloc, RSS also covers the C parsers.
+
+Usage:
+    python bench_parsers.py
+    python bench_parsers.py --iterations 50
+"""
+import argparse
+import logging
+import multiprocessing
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+try:
+    import resource
+except ImportError:  # Windows: report the Python heap peak only
+    resource = None
+
+FIXTURES = ('councillor_page.html', 'meetings_page.html', 'bills_page.html', 'transcript_page.html')
+BASELINE = 'full tree'
+
+
+def _extractors():
+    from scrapers import bills, councillors, meetings
+    return {
+        'councillor_page.html': councillors.parse_councillors_page,
+        'meetings_page.html': meetings.parse_meetings_page,
+        'bills_page.html': bills.parse_bills_page,
+        'transcript_page.html': meetings.parse_transcript_html,
+    }
+
+
+def _use_full_tree():
+    """Patch the scrapers back to the original whole-document html.parser soup"""
+    from bs4 import BeautifulSoup
+    from scrapers import bills, councillors, meetings
+
+    def full_tree(html, *args, **kwargs):
+        return BeautifulSoup(html, 'html.parser')
+
+    for module in (bills, councillors, meetings):
+        module.parse_scoped = full_tree
+
+
+def _max_rss_mb():
+    if resource is None:
+        return 0.0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def run_backend(job):
+    """Worker (fresh process): returns per-fixture seconds, memory peaks and results"""
+    backend, iterations = job
+    logging.disable(logging.CRITICAL)
+
+    extractors = _extractors()
+    if backend == BASELINE:
+        _use_full_tree()
+        backend = None
+    pages = {}
+    for name in FIXTURES:
+        with open(name, encoding='utf-8') as f:
+            pages[name] = f.read()
+
+    rss_before = _max_rss_mb()
+
+    timings, results = {}, {}
+    for name in FIXTURES:
+        parse = extractors[name]
+        results[name] = parse(pages[name], backend=backend)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            parse(pages[name], backend=backend)
+        timings[name] = (time.perf_counter() - start) / iterations
+
+    rss_delta = _max_rss_mb() - rss_before
+
+    # Separate pass: tracemalloc slows allocation-heavy code too much to time under it
+    tracemalloc.start()
+    for name in FIXTURES:
+        extractors[name](pages[name], backend=backend)
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'timings': timings, 'py_peak': py_peak, 'rss_delta_mb': rss_delta, 'results': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark HTML parser backends')
+    parser.add_argument('--iterations', type=int, default=20, help='Parses per fixture (default: 20)')
+    args = parser.parse_args()
+
+    from utils.htmlparse import BACKENDS, _selectolax_parser
+
+    backends = [BASELINE] + [b for b in BACKENDS if b != 'selectolax' or _selectolax_parser()]
+    if 'selectolax' not in backends:
+        print("selectolax not installed, skipping that backend (pip install selectolax)")
+
+    reports = {}
+    context = multiprocessing.get_context('spawn')
+    for backend in backends:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            reports[backend] = pool.submit(run_backend, (backend, args.iterations)).result()
+
+    reference = reports[BASELINE]['results']
+
+    print(f"\n{args.iterations} parses per fixture, milliseconds per parse\n")
+    header = f"{'backend':<13}" + ''.join(f"{name.replace('_page.html', ''):>13}" for name in FIXTURES)
+    print(header + f"{'total':>10}{'py peak':>10}{'rss +':>9}  identical")
+    for backend, report in reports.items():
+        times = [report['timings'][name] * 1000 for name in FIXTURES]
+        identical = all(report['results'][name] == reference[name] for name in FIXTURES)
+        print(f"{backend:<13}" + ''.join(f"{t:>13.2f}" for t in times)
+              + f"{sum(times):>10.2f}{report['py_peak'] / 1e6:>8.1f}MB"
+              + f"{report['rss_delta_mb']:>7.1f}MB  {'yes' if identical else 'NO'}")
+
+    print()
+    baseline_total = sum(reports[BASELINE]['timings'].values())
+    for backend in backends[1:]:
+        total = sum(reports[backend]['timings'].values())
+        print(f"{backend}: {baseline_total / total:.1f}x faster than the full html.parser tree")
+
+
+if __name__ == "__main__":
+    main()
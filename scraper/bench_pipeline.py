@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Offline end-to-end benchmark of the nightly pipeline
+
+Runs main.run_all() + extract_transcripts + extract_committees +
+link_meetings_to_committees with no network access: council pages are
+replayed from the checked-in captures (utils/replay.py) and every Supabase
+call goes to an in-memory PostgREST stand-in (standins/postgrest.py).
+Reports per-stage wall time, council HTTP requests, DB requests and rows
+written, so throughput regressions show up before they reach production.
+
+Usage:
+    python bench_pipeline.py
+    python bench_pipeline.py --rounds 3
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+
+def run_stage(name, func, replay, standin):
+    replay.requests.clear()
+    standin.reset_counters()
+
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+
+    counters = standin.counters()
+    return {
+        'stage': name,
+        'seconds': elapsed,
+        'http': replay.request_count(),
+        'db': counters['db_requests'],
+        'rows': counters['rows_written'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline end-to-end pipeline benchmark')
+    parser.add_argument('--rounds', type=int, default=1,
+                        help='Pipeline runs, each against a fresh database (default: 1)')
+    # The captures are single listing pages that the replay serves for every page
+    # number, so deeper crawls only re-read the same rows
+    parser.add_argument('--max-pages', type=int, default=1,
+                        help='Listing pages per scraper (default: 1)')
+    parser.add_argument('--verbose', action='store_true', help='Show pipeline logs')
+    args = parser.parse_args()
+
+    from standins.postgrest import start_postgrest_standin
+    server = start_postgrest_standin()
+    workdir = tempfile.mkdtemp(prefix='bench_pipeline_')
+
+    # config reads these at import time, so they must be set before importing the pipeline
+    os.environ['SUPABASE_URL'] = server.url
+    os.environ['SUPABASE_KEY'] = 'offline-benchmark'
+    os.environ['COUNCIL_BASE_URL'] = 'https://council.yongin.go.kr'
+    os.environ['REQUEST_DELAY'] = '0'
+    os.environ['RATE_MAX'] = '1000'
+    os.environ['HTTP_CACHE_DIR'] = os.path.join(workdir, 'cache')
+    os.environ['ARCHIVE_ENABLED'] = 'false'
+
+    import main as pipeline
+    from extract_transcripts import extract_all_transcripts
+    from extract_committees import extract_committees_from_meetings
+    from link_meetings_to_committees import link_meetings_to_committees
+    from utils.replay import install_replay
+
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.CRITICAL)
+    replay = install_replay()
+
+    stages = [
+        ('run_all', lambda: pipeline.run_all(full=True, max_pages=args.max_pages)),
+        ('transcripts', extract_all_transcripts),
+        ('committees', extract_committees_from_meetings),
+        ('link committees', link_meetings_to_committees),
+    ]
+
+    rounds = []
+    for _ in range(args.rounds):
+        # Fresh, empty database per round so every run does the same work
+        server.standin.truncate()
+        rounds.append([run_stage(name, func, replay, server.standin) for name, func in stages])
+
+    server.shutdown()
+
+    print(f"\nOffline pipeline, {args.max_pages} listing pages, {args.rounds} round(s)")
+    print(f"Replay misses (404): {replay.misses}\n")
+    print(f"{'stage':<18}{'wall (s)':>10}{'http':>8}{'db req':>8}{'rows':>8}")
+
+    totals = {'seconds': 0.0, 'http': 0, 'db': 0, 'rows': 0}
+    for i, stage in enumerate(rounds[0]):
+        # Best wall time across rounds; counts are identical per round
+        best = min(r[i]['seconds'] for r in rounds)
+        print(f"{stage['stage']:<18}{best:>10.3f}{stage['http']:>8}{stage['db']:>8}{stage['rows']:>8}")
+        totals['seconds'] += best
+        for key in ('http', 'db', 'rows'):
+            totals[key] += stage[key]
+
+    print(f"{'total':<18}{totals['seconds']:>10.3f}{totals['http']:>8}{totals['db']:>8}{totals['rows']:>8}")
+
+    tables = {name: len(rows) for name, rows in server.standin.tables.items() if rows}
+    print(f"\nFinal row counts: {tables}")
+
+
+if __name__ == "__main__":
+    main()
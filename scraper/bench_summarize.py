@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: concurrent speech summarization (extract_speeches.save_speeches_to_db)
+
+Summarizes one synthetic plenary session (mostly short chair lines, some
+long member speeches) against the local Claude stand-in (standins/claude_api.py)
+with an emulated model latency, and saves the rows with one replace_meeting_speeches()
+call into the PostgREST stand-in. Compares wall time, request count, input tokens,
+peak requests in flight and 429s for each concurrency cap and speeches-per-
+request limit (1 = one request per speech).
+
+Usage:
+    python bench_summarize.py
+    python bench_summarize.py --speeches 200 --latency-ms 500 --concurrency 1 4 8 16
+    python bench_summarize.py --batch-max 1 10 25 --drop-every 7   # drop items from first replies
+    python bench_summarize.py --rpm 60   # also enforce a per-minute limit on both sides
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark concurrent speech summarization')
+    parser.add_argument('--speeches', type=int, default=60, help='Speeches in the meeting (default: 60)')
+    parser.add_argument('--latency-ms', type=float, default=200.0,
+                        help='Simulated model latency per request (default: 200)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8],
+                        help='Concurrency caps to compare (default: 1 4 8)')
+    parser.add_argument('--batch-max', type=int, nargs='+', default=[1, 25],
+                        help='Speeches per request to compare (default: 1 25)')
+    parser.add_argument('--drop-every', type=int, default=0,
+                        help='Leave every Nth speech out of its first reply to exercise re-requests')
+    parser.add_argument('--rpm', type=int, default=None,
+                        help='Requests per minute for the limiter and the stand-in (default: unlimited)')
+    args = parser.parse_args()
+
+    import json
+    from standins.claude_api import ClaudeStandIn, start_claude_standin, summary_responder
+    from standins.postgrest import start_postgrest_standin
+
+    answered = set()
+
+    def responder(body):
+        reply = json.loads(summary_responder(body))
+        if args.drop_every and 'summaries' in reply:
+            kept = []
+            for item in reply['summaries']:
+                order = item['speech_order']
+                if order % args.drop_every or order in answered:
+                    kept.append(item)
+                answered.add(order)
+            reply['summaries'] = kept
+        return json.dumps(reply, ensure_ascii=False)
+
+    llm = start_claude_standin(ClaudeStandIn(responder, rpm_limit=args.rpm), latency_ms=args.latency_ms)
+    db = start_postgrest_standin()
+
+    # config reads these at import time, so they must be set before importing extract_speeches
+    os.environ['ANTHROPIC_BASE_URL'] = llm.url
+    os.environ['ANTHROPIC_API_KEY'] = 'offline-benchmark'
+    os.environ['SUPABASE_URL'] = db.url
+    os.environ['SUPABASE_KEY'] = 'offline-benchmark'
+    os.environ['LLM_RPM'] = str(args.rpm or 1_000_000)
+    os.environ['LLM_INPUT_TPM'] = str(1_000_000_000)
+    os.environ['LLM_CACHE_ENABLED'] = 'false'  # every run must reach the model
+
+    logging.basicConfig(level=logging.WARNING)
+    import extract_speeches
+    extract_speeches.logger.setLevel(logging.WARNING)
+    from utils import llm as llm_utils
+
+    # Plenary sessions: mostly procedural chair lines, every fifth a member's speech
+    speeches = []
+    for i in range(1, args.speeches + 1):
+        if i % 5:
+            speeches.append({'order': i, 'speaker': '홍길동', 'role': '의장', 'councillor_id': None,
+                             'text': f'{i}번 안건을 상정합니다. 의석을 정돈해 주시기 바랍니다.'})
+        else:
+            speeches.append({'order': i, 'speaker': f'의원{i % 7}', 'role': '의원', 'councillor_id': None,
+                             'text': f'{i}번째 질의입니다. ' + '예산 심사와 관련하여 집행부의 답변을 요청드립니다. ' * 12})
+    results = []
+
+    for batch_max in args.batch_max:
+        for concurrency in args.concurrency:
+            extract_speeches.LLM_CONCURRENCY = concurrency
+            extract_speeches.SUMMARY_BATCH_MAX_SPEECHES = batch_max
+            llm_utils._limiter = None  # fresh per-minute budget per run
+            llm.standin.reset_counters()
+            db.standin.truncate()
+            answered.clear()
+
+            start = time.perf_counter()
+            saved = extract_speeches.save_speeches_to_db(speeches, f'meeting-{batch_max}-{concurrency}')
+            seconds = time.perf_counter() - start
+
+            counters = llm.standin.counters()
+            db_counters = db.standin.counters()
+            summarized = sum(1 for row in db.standin.table('speeches') if row['summary'])
+            results.append((batch_max, concurrency, seconds, saved, summarized, counters['llm_requests'],
+                            counters['input_tokens'], counters['peak_in_flight'], counters['rejected'],
+                            db_counters['db_requests']))
+
+    llm.shutdown()
+    db.shutdown()
+
+    print(f"\n{args.speeches} speeches, model latency {args.latency_ms:.0f} ms/request, "
+          f"rpm {args.rpm or 'unlimited'}\n")
+    print(f"{'per req':<9}{'conc':>5}{'wall (s)':>10}{'saved':>7}{'summed':>8}{'llm req':>9}{'in tok':>9}"
+          f"{'peak':>6}{'429s':>6}{'db req':>8}{'speedup':>9}")
+    baseline = results[0][2]
+    for (batch_max, concurrency, seconds, saved, summarized, requests_made, input_tokens, peak, rejected,
+         db_requests) in results:
+        print(f"{batch_max:<9}{concurrency:>5}{seconds:>10.3f}{saved:>7}{summarized:>8}{requests_made:>9}"
+              f"{input_tokens:>9}{peak:>6}{rejected:>6}{db_requests:>8}{baseline / seconds:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
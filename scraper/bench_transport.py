@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: bare requests.get vs the shared pooled transport (utils/http.py)
+
+Runs a 3-page meeting listing crawl plus 30 transcript fetches against a local
+stand-in server that serves the checked-in HTML captures. The stand-in sleeps
+once per accepted connection to emulate the TCP+TLS handshake cost of
+council.yongin.go.kr, so the difference between the two runs is the cost of
+not reusing connections.
+
+Usage:
+    python bench_transport.py
+    python bench_transport.py --handshake-ms 80 --rounds 3
+"""
+import argparse
+import gzip
+import logging
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+FIXTURE_DIR = os.path.dirname(os.path.abspath(__file__))
+LISTING_PAGES = 3
+TRANSCRIPTS = 30
+
+
+def _read_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+        return f.read()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves captured council pages with keep-alive and gzip"""
+    protocol_version = 'HTTP/1.1'
+    routes = {}
+    handshake_delay = 0.0
+    connections = 0
+    requests_served = 0
+    counter_lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StandInHandler.counter_lock:
+            StandInHandler.connections += 1
+        # One sleep per connection == handshake cost the pool should amortize
+        time.sleep(self.handshake_delay)
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        body = self.routes.get(path)
+        if body is None:
+            self.send_error(404)
+            return
+
+        with StandInHandler.counter_lock:
+            StandInHandler.requests_served += 1
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(handshake_ms):
+    """Start the stand-in server on a free local port"""
+    StandInHandler.routes = {
+        '/kr/minutes/late.do': _read_fixture('meetings_page.html'),
+        '/viewer/minutes.do': _read_fixture('transcript_page.html'),
+    }
+    StandInHandler.handshake_delay = handshake_ms / 1000.0
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def crawl(meetings_module):
+    """3 listing pages + 30 transcripts, same code path as the nightly job"""
+    items = meetings_module.scrape_meetings(max_pages=LISTING_PAGES)
+    urls = [m['transcript_url'] for m in items if m.get('transcript_url')][:TRANSCRIPTS]
+    chars = 0
+    for url in urls:
+        chars += len(meetings_module.scrape_transcript_text(url))
+    return len(items), len(urls), chars
+
+
+def run_round(label, meetings_module):
+    StandInHandler.connections = 0
+    StandInHandler.requests_served = 0
+
+    start = time.perf_counter()
+    n_meetings, n_transcripts, chars = crawl(meetings_module)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'label': label,
+        'seconds': elapsed,
+        'meetings': n_meetings,
+        'transcripts': n_transcripts,
+        'chars': chars,
+        'connections': StandInHandler.connections,
+        'requests': StandInHandler.requests_served,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pooled HTTP transport')
+    parser.add_argument('--handshake-ms', type=float, default=50.0,
+                        help='Simulated per-connection handshake latency (default: 50)')
+    parser.add_argument('--rounds', type=int, default=1, help='Rounds per transport (default: 1)')
+    args = parser.parse_args()
+
+    server = start_server(args.handshake_ms)
+    host, port = server.server_address
+
+    # config reads these at import time, so they must be set before importing scrapers
+    os.environ['COUNCIL_BASE_URL'] = f"http://{host}:{port}"
+    os.environ['REQUEST_DELAY'] = '0'
+    # Lift the adaptive rate ceiling so pacing does not mask transport cost
+    os.environ['RATE_MAX'] = '1000'
+
+    logging.basicConfig(level=logging.WARNING)
+    import requests
+    from config import USER_AGENT, REQUEST_TIMEOUT
+    from scrapers import meetings
+    from utils import http
+    logging.getLogger().setLevel(logging.WARNING)
+
+    pooled_fetch = meetings.fetch
+
+    def legacy_fetch(url, params=None, timeout=None, encoding='utf-8', use_cache=False):
+        # What every scraper did before: new headers, new connection, per call
+        # (same signature as utils.http.fetch; there is no cache to revalidate against)
+        headers = {'User-Agent': USER_AGENT}
+        response = requests.get(url, params=params, headers=headers, timeout=timeout or REQUEST_TIMEOUT)
+        response.raise_for_status()
+        response.encoding = encoding
+        response.not_modified = False
+        return response
+
+    results = []
+    for _ in range(args.rounds):
+        meetings.fetch = legacy_fetch
+        results.append(run_round('bare requests.get', meetings))
+
+        meetings.fetch = pooled_fetch
+        http.close_session()
+        results.append(run_round('pooled session', meetings))
+
+    server.shutdown()
+
+    print(f"\nStand-in: {host}:{port}, handshake {args.handshake_ms:.0f} ms/connection")
+    print(f"Workload: {LISTING_PAGES} listing pages + {TRANSCRIPTS} transcripts\n")
+    print(f"{'transport':<20}{'wall (s)':>10}{'requests':>10}{'conns':>8}{'chars':>10}")
+    for r in results:
+        print(f"{r['label']:<20}{r['seconds']:>10.3f}{r['requests']:>10}{r['connections']:>8}{r['chars']:>10}")
+
+    legacy = [r['seconds'] for r in results if r['label'] == 'bare requests.get']
+    pooled = [r['seconds'] for r in results if r['label'] == 'pooled session']
+    best_legacy, best_pooled = min(legacy), min(pooled)
+    print(f"\nBest of {args.rounds}: {best_legacy:.3f}s -> {best_pooled:.3f}s "
+          f"({best_legacy / best_pooled:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
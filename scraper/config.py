@@ -17,10 +17,68 @@ ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
 COUNCIL_BASE_URL = os.getenv('COUNCIL_BASE_URL', 'https://council.yongin.go.kr')
 
 # Scraping Settings
-REQUEST_TIMEOUT = 30
-REQUEST_DELAY = 1  # Delay between requests in seconds
+REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', '30'))  # Read timeout in seconds
+CONNECT_TIMEOUT = float(os.getenv('CONNECT_TIMEOUT', '5'))  # TCP/TLS connect timeout in seconds
+REQUEST_DELAY = float(os.getenv('REQUEST_DELAY', '1'))  # Initial delay between requests in seconds
+INCREMENTAL_MAX_PAGES = int(os.getenv('INCREMENTAL_MAX_PAGES', '20'))  # Safety cap on pages of an incremental listing crawl
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 
+# HTTP Transport (shared keep-alive session, see utils/http.py)
+HTTP_POOL_HOSTS = int(os.getenv('HTTP_POOL_HOSTS', '4'))  # Number of hosts to keep pools for
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '4'))  # Max open connections per host
+HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', '2'))  # Retries on connect errors and 429/5xx
+
+# Adaptive crawl rate (AIMD, see utils/ratecontrol.py); starts at 1 / REQUEST_DELAY
+RATE_MIN = float(os.getenv('RATE_MIN', '0.2'))  # Floor in requests per second per host
+RATE_MAX = float(os.getenv('RATE_MAX', '5'))  # Ceiling in requests per second per host
+RATE_INCREASE = float(os.getenv('RATE_INCREASE', '0.25'))  # Additive step per healthy response
+RATE_BACKOFF = float(os.getenv('RATE_BACKOFF', '0.5'))  # Multiplier on 429/5xx/timeout
+RATE_LATENCY_TARGET = float(os.getenv('RATE_LATENCY_TARGET', '1.0'))  # Only speed up below this latency (s)
+
+# On-disk HTTP response cache (conditional GET, see utils/httpcache.py)
+HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'http'))
+HTTP_CACHE_MAX_MB = int(os.getenv('HTTP_CACHE_MAX_MB', '200'))  # Evict least recently used beyond this size
+HTTP_CACHE_MAX_AGE_DAYS = float(os.getenv('HTTP_CACHE_MAX_AGE_DAYS', '30'))  # Evict entries older than this
+
+# Raw page archive (content-addressed, see utils/archive.py and main.py --reparse)
+ARCHIVE_ENABLED = os.getenv('ARCHIVE_ENABLED', 'true').lower() == 'true'
+ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.archive'))
+ARCHIVE_KEEP_VERSIONS = int(os.getenv('ARCHIVE_KEEP_VERSIONS', '10'))  # Distinct versions kept per URL
+ARCHIVE_MAX_MB = int(os.getenv('ARCHIVE_MAX_MB', '300'))  # Prune the oldest snapshots beyond this size
+
+# Concurrent fetching (transcript backfills, see utils/fetcher.py)
+FETCH_CONCURRENCY = int(os.getenv('FETCH_CONCURRENCY', '4'))  # Max in-flight requests (paced per host by the rate controller)
+
+# Retried DB writes (see utils/dbwrite.py)
+DB_WRITE_RETRIES = int(os.getenv('DB_WRITE_RETRIES', '3'))  # Retries of a write on transient errors
+DB_SCAN_PAGE_SIZE = int(os.getenv('DB_SCAN_PAGE_SIZE', '1000'))  # Rows per page of full-table reads (see utils/scan.py)
+
+# Claude API (see utils/llm.py); defaults match the Tier 1 limits of Claude Haiku
+LLM_CONCURRENCY = int(os.getenv('LLM_CONCURRENCY', '8'))  # Max requests in flight
+LLM_RPM = float(os.getenv('LLM_RPM', '50'))  # Requests per minute
+LLM_INPUT_TPM = float(os.getenv('LLM_INPUT_TPM', '50000'))  # Input tokens per minute
+SUMMARY_BATCH_TOKENS = int(os.getenv('SUMMARY_BATCH_TOKENS', '6000'))  # Speech tokens per summarization request
+SUMMARY_BATCH_MAX_SPEECHES = int(os.getenv('SUMMARY_BATCH_MAX_SPEECHES', '25'))  # Speeches per request (bounds output size)
+SUMMARY_RETRIES = int(os.getenv('SUMMARY_RETRIES', '2'))  # Re-requests of speeches missing from a reply
+# Speech extraction replies repeat the transcript verbatim, so a chunk must fit the 8k output cap
+EXTRACTION_CHUNK_TOKENS = int(os.getenv('EXTRACTION_CHUNK_TOKENS', '5000'))  # Transcript tokens per extraction request
+EXTRACTION_CHUNK_OVERLAP = int(os.getenv('EXTRACTION_CHUNK_OVERLAP', '1'))  # Speaker turns repeated at the start of the next chunk
+SPEECH_MEETINGS_PER_PAGE = int(os.getenv('SPEECH_MEETINGS_PER_PAGE', '100'))  # Pending meetings listed per query (no transcripts)
+
+# Local keyword extraction (see utils/keywords.py, extract_keywords.py)
+KEYWORD_COUNT = int(os.getenv('KEYWORD_COUNT', '5'))  # Keywords per speech
+KEYWORD_MAX_NGRAM = int(os.getenv('KEYWORD_MAX_NGRAM', '2'))  # Longest noun n-gram ("예산 집행" = 2)
+KEYWORD_MEETINGS_PER_BATCH = int(os.getenv('KEYWORD_MEETINGS_PER_BATCH', '50'))  # Meetings indexed per request
+
+# Claude response cache (content-hash keyed, see utils/llmcache.py)
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+LLM_CACHE_DIR = os.getenv('LLM_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'llm'))
+LLM_CACHE_MAX_MB = int(os.getenv('LLM_CACHE_MAX_MB', '100'))  # Evict least recently used beyond this size
+LLM_CACHE_MAX_AGE_DAYS = float(os.getenv('LLM_CACHE_MAX_AGE_DAYS', '180'))  # Evict entries older than this
+
+# HTML parsing (see utils/htmlparse.py): 'html.parser', 'lxml' or 'selectolax' (falls back to lxml)
+HTML_PARSER = os.getenv('HTML_PARSER', 'selectolax')
+
 # Paths
 COUNCILLORS_URL = f"{COUNCIL_BASE_URL}/kr/member/intro.do"
 MEETINGS_URL = f"{COUNCIL_BASE_URL}/kr/minutes.do"
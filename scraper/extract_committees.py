@@ -3,6 +3,7 @@
 Extract committee information from existing meeting data
 """
 from utils.db import get_supabase_client
+from utils.scan import scan_table
 import logging
 import re
 
@@ -15,17 +16,13 @@ def extract_committees_from_meetings():
     """
     client = get_supabase_client()
 
-    # Get all meetings
-    response = client.table('meetings').select('id, title, meeting_type').execute()
-    meetings = response.data
-
-    logger.info(f"Found {len(meetings)} meetings")
-
-    # Extract committee names
+    # Extract committee names from all meeting titles
     committee_names = set()
+    meeting_count = 0
 
-    for meeting in meetings:
-        title = meeting.get('title', '')
+    for meeting in scan_table('meetings', ['title']):
+        meeting_count += 1
+        title = meeting.title or ''
 
         # Extract committee name from title
         # Examples: "의회운영위원회", "예산결산특별위원회", "자치행정위원회"
@@ -38,6 +35,7 @@ def extract_committees_from_meetings():
                 committee_name = match.group(1)
                 committee_names.add(committee_name)
 
+    logger.info(f"Found {meeting_count} meetings")
     logger.info(f"\nFound {len(committee_names)} unique committees:")
     for name in sorted(committee_names):
         logger.info(f"  - {name}")
@@ -57,20 +55,13 @@ def extract_committees_from_meetings():
         })
 
     if committees_data:
-        # Insert committees (upsert to avoid duplicates)
-        for committee in committees_data:
-            try:
-                # Check if committee already exists
-                existing = client.table('committees').select('id').eq('name', committee['name']).execute()
-
-                if not existing.data:
-                    # Insert new committee
-                    result = client.table('committees').insert(committee).execute()
-                    logger.info(f"✓ Created committee: {committee['name']}")
-                else:
-                    logger.info(f"  Committee already exists: {committee['name']}")
-            except Exception as e:
-                logger.error(f"Error inserting committee {committee['name']}: {e}")
+        # One upsert keyed on the unique name; existing committees are left as they are
+        result = client.table('committees')\
+            .upsert(sorted(committees_data, key=lambda c: c['name']), on_conflict='name', ignore_duplicates=True)\
+            .execute()
+        for committee in result.data:
+            logger.info(f"✓ Created committee: {committee['name']}")
+        logger.info(f"  {len(committees_data) - len(result.data)} committees already exist")
 
         logger.info(f"\n=== Committee extraction complete ===")
         logger.info(f"Total unique committees: {len(committees_data)}")
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Fill speeches.keywords locally with TF-IDF noun n-grams (no LLM calls)
+
+Each run indexes the meetings whose speeches were saved (or re-saved) since
+the last run: their term counts are added to the keyword_terms IDF table in
+the database, then their speeches get the top KEYWORD_COUNT terms. --refresh
+rebuilds the IDF table from every speech and rewrites all keywords, so the
+whole corpus is rescored against the same IDF.
+
+Usage:
+    python extract_keywords.py                       # new and re-extracted meetings
+    python extract_keywords.py --refresh             # whole corpus
+    python extract_keywords.py --meeting-id <uuid>   # one meeting
+"""
+import argparse
+import logging
+import sys
+import time
+
+import pandas as pd
+
+from config import KEYWORD_MEETINGS_PER_BATCH
+from utils.dbwrite import with_retries
+from utils.db import get_supabase_client
+from utils.keywords import inverse_document_frequencies, term_frequencies, top_keywords
+from utils.scan import scan_table
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+KEYWORD_ROWS_PER_REQUEST = 500  # speeches per set_speech_keywords() call
+
+
+def pending_meetings(refresh: bool = False) -> list:
+    """
+    Processed meetings that need (re-)indexing
+
+    Returns:
+        Meeting ids: every processed meeting if refresh, otherwise those never
+        indexed or marked stale since (their speeches were replaced)
+    """
+    processed = [row.id for row in scan_table('meetings', [], filters=lambda q: q.is_('is_processed', 'true'))]
+    if refresh:
+        return processed
+
+    indexed = {row.meeting_id: row.stale for row in scan_table('keyword_meetings', ['stale'], key='meeting_id')}
+    return [meeting_id for meeting_id in processed if indexed.get(meeting_id, True)]
+
+
+def load_speeches(meeting_ids: list) -> pd.DataFrame:
+    """Speech texts of some meetings, indexed by speech id"""
+    rows = scan_table('speeches', ['meeting_id', 'speech_text'], filters=lambda q: q.in_('meeting_id', meeting_ids))
+    frame = pd.DataFrame(list(rows), columns=['id', 'meeting_id', 'speech_text'])
+    return frame.set_index('id')
+
+
+def index_payload(speeches: pd.DataFrame, tf: pd.DataFrame, meeting_ids: list) -> list:
+    """
+    index_meeting_keywords() argument: speeches and documents per term of each meeting
+
+    Meetings without speeches are indexed too (empty), so they stop being pending.
+    """
+    documents = speeches.groupby('meeting_id').size()
+    term_counts = tf.assign(meeting_id=tf['doc'].map(speeches['meeting_id']))\
+        .groupby(['meeting_id', 'term']).size()
+
+    terms = {
+        meeting_id: {term: int(count) for term, count in counts.droplevel(0).items()}
+        for meeting_id, counts in term_counts.groupby(level=0)
+    }
+    return [
+        {'meeting_id': meeting_id, 'documents': int(documents.get(meeting_id, 0)), 'terms': terms.get(meeting_id, {})}
+        for meeting_id in meeting_ids
+    ]
+
+
+def reset_index(client):
+    """Drop the IDF table and every meeting's contribution (--refresh)"""
+    with_retries(lambda: client.table('keyword_meetings').delete().not_.is_('meeting_id', 'null').execute())
+    with_retries(lambda: client.table('keyword_terms').delete().not_.is_('term', 'null').execute())
+
+
+def extract_keywords(refresh: bool = False, meeting_id: str = None) -> dict:
+    """
+    Index pending meetings and fill the keywords of their speeches
+
+    All meetings are indexed first, so every speech of the run is scored
+    against the same, final IDF.
+
+    Args:
+        refresh: Rebuild the IDF table from all speeches and rewrite all keywords
+        meeting_id: Only (re-)index this meeting
+
+    Returns:
+        {"meetings", "speeches", "terms", "documents", "requests"} statistics
+    """
+    client = get_supabase_client()
+    stats = {'meetings': 0, 'speeches': 0, 'terms': 0, 'documents': 0, 'requests': 0}
+
+    if meeting_id:
+        meeting_ids = [meeting_id]
+    else:
+        meeting_ids = pending_meetings(refresh)
+        if refresh:
+            reset_index(client)
+    if not meeting_ids:
+        logger.info("No meetings to index")
+        return stats
+
+    logger.info(f"🔎 Indexing {len(meeting_ids)} meetings...")
+    frames, speech_ids, doc_freq = [], [], {}
+    for start in range(0, len(meeting_ids), KEYWORD_MEETINGS_PER_BATCH):
+        chunk = meeting_ids[start:start + KEYWORD_MEETINGS_PER_BATCH]
+        speeches = load_speeches(chunk)
+        tf = term_frequencies(speeches['speech_text'])
+
+        result = with_retries(lambda: client.rpc('index_meeting_keywords', {
+            'p_meetings': index_payload(speeches, tf, chunk)
+        }).execute()).data
+        stats['requests'] += 1
+        stats['documents'] = result['documents']
+        doc_freq.update(result['terms'])
+
+        frames.append(tf)
+        speech_ids.extend(speeches.index)
+        stats['meetings'] += len(chunk)
+        logger.info(f"  📚 {stats['meetings']}/{len(meeting_ids)} meetings, {len(speeches)} speeches")
+
+    tf = pd.concat(frames, ignore_index=True)
+    idf = inverse_document_frequencies(pd.Series(doc_freq, dtype=float), stats['documents'])
+    keywords = top_keywords(tf, idf, stats['documents'])
+    stats['terms'] = len(doc_freq)
+
+    rows = [{'id': speech_id, 'keywords': keywords.get(speech_id, [])} for speech_id in speech_ids]
+    for start in range(0, len(rows), KEYWORD_ROWS_PER_REQUEST):
+        batch = rows[start:start + KEYWORD_ROWS_PER_REQUEST]
+        stats['speeches'] += with_retries(
+            lambda: client.rpc('set_speech_keywords', {'p_rows': batch}).execute()
+        ).data
+        stats['requests'] += 1
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill speech keywords with local TF-IDF noun n-grams")
+    parser.add_argument("--refresh", action="store_true", help="Rebuild the IDF table and rewrite all keywords")
+    parser.add_argument("--meeting-id", help="Re-index one meeting")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        stats = extract_keywords(refresh=args.refresh, meeting_id=args.meeting_id)
+    except Exception as e:
+        logger.error(f"Fatal error: {e}")
+        sys.exit(1)
+
+    logger.info("=" * 60)
+    logger.info("Keyword extraction complete!")
+    logger.info(f"  📚 Meetings indexed: {stats['meetings']} (corpus: {stats['documents']} speeches)")
+    logger.info(f"  🏷️  Speeches updated: {stats['speeches']}, terms touched: {stats['terms']}")
+    logger.info(f"  ⏱️  {time.perf_counter() - started:.1f}s, {stats['requests']} requests")
+    logger.info("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,49 @@
 """
-회의록에서 AI를 활용하여 개별 의원 발언을 추출하고 요약하는 스크립트
+회의록에서 개별 의원 발언을 추출하고 AI로 요약하는 스크립트
+(발언 키워드는 extract_keywords.py가 LLM 없이 따로 채움)
+
+발언 분리는 회의록 페이지 마크업(speaker-block)에서 바로 수행하고,
+마크업이 없거나 깨진 경우에만 Claude로 분리합니다.
 
 Usage:
     python extract_speeches.py --limit 5
     python extract_speeches.py --meeting-id <uuid>
     python extract_speeches.py --force  # 기존 발언 재추출
+
+    # 배치 모드 (Message Batches API, 결과는 다음 실행에서 수집)
+    python extract_speeches.py --batch submit   # 처리되지 않은 회의 전체를 배치로 제출
+    python extract_speeches.py --batch poll     # 제출한 배치 상태 확인
+    python extract_speeches.py --batch collect  # 끝난 배치 결과 저장 (후속 요약은 다시 제출)
 """
 
 import os
+import re
 import sys
+import asyncio
 import logging
 import argparse
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
-import anthropic
-from supabase import create_client, Client
+from supabase import Client
 from dotenv import load_dotenv
+from config import (
+    ARCHIVE_ENABLED, EXTRACTION_CHUNK_OVERLAP, EXTRACTION_CHUNK_TOKENS, LLM_CONCURRENCY,
+    SPEECH_MEETINGS_PER_PAGE, SUMMARY_BATCH_TOKENS, SUMMARY_BATCH_MAX_SPEECHES, SUMMARY_RETRIES
+)
+from scrapers.meetings import parse_speaker_blocks
+from utils.archive import get_archive
+from utils.dbwrite import replace_meeting_speeches, with_retries
+from utils.db import (
+    close_llm_batch, get_open_llm_batches, get_speech_checkpoint, get_supabase_client, save_llm_batch,
+    save_speech_checkpoint, update_speech_checkpoint
+)
+from utils.http import fetch
+from utils.llmcache import get_llm_cache
+from utils.llm import (
+    complete, estimate_tokens, get_batch, get_batch_results, message_params,
+    parse_json_response, submit_batch
+)
+from utils.resolver import CouncillorResolver
 
 # 환경변수 로드
 load_dotenv()
@@ -39,28 +67,33 @@ if not all([SUPABASE_URL, SUPABASE_KEY, ANTHROPIC_API_KEY]):
     logger.error(f"ANTHROPIC_API_KEY: {'✓' if ANTHROPIC_API_KEY else '✗'}")
     sys.exit(1)
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-claude_client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+supabase: Client = get_supabase_client()
 
+EXTRACTION_MODEL = "claude-3-5-sonnet-20241022"
+SUMMARY_MODEL = "claude-3-5-haiku-20241022"  # 요약은 Haiku로
 
-def extract_speeches_from_transcript(
-    transcript: str,
-    meeting_id: str,
-    meeting_title: str
-) -> List[Dict]:
-    """
-    Claude API를 사용하여 회의록에서 개별 발언 추출
+# 프롬프트 템플릿 버전 (LLM 응답 캐시 키의 일부): 프롬프트 문구를 바꾸면 올릴 것
+EXTRACTION_PROMPT_VERSION = "extract-chunk-v1"
+SUMMARY_PROMPT_VERSION = "summary-batch-v2"
 
-    Args:
-        transcript: 회의록 전문
-        meeting_id: 회의 ID
-        meeting_title: 회의 제목
+# 발언 요약 시 발언당 최대 입력 길이
+SPEECH_SUMMARY_CHARS = 5000
 
-    Returns:
-        추출된 발언 리스트 [{"speaker": "name", "text": "...", "order": 1}, ...]
-    """
+# 회의 목록 조회 컬럼 (transcript_text는 필요할 때 meeting_transcript()로 따로 불러옴)
+MEETING_COLUMNS = "id, title, transcript_url, is_processed, created_at"
 
-    prompt = f"""다음은 용인시의회 "{meeting_title}" 회의록 전문입니다.
+
+def extraction_prompt(transcript: str, meeting_title: str, part: int = 1, parts: int = 1) -> str:
+    """회의록(또는 그 일부)에서 발언을 추출하는 프롬프트"""
+
+    if parts > 1:
+        scope = f"""회의록 일부({part}/{parts})입니다.
+
+회의록이 길어 발언자 경계에서 나눈 부분만 제공합니다. 이 부분에 있는 발언만 추출해주세요."""
+    else:
+        scope = "회의록 전문입니다."
+
+    return f"""다음은 용인시의회 "{meeting_title}" {scope}
 
 이 회의록에서 각 의원의 발언을 추출하여 JSON 형식으로 정리해주세요.
 
@@ -88,201 +121,821 @@ def extract_speeches_from_transcript(
 }}
 
 회의록:
-{transcript[:50000]}
+{transcript}
 
 위 형식에 맞춰 JSON만 출력해주세요. 다른 설명은 필요 없습니다."""
 
-    try:
-        logger.info(f"  🤖 Calling Claude API for speech extraction...")
-
-        message = claude_client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=8000,
-            temperature=0,
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        )
 
-        response_text = message.content[0].text
-        logger.debug(f"Claude response: {response_text[:500]}...")
+def extraction_params(chunk: Dict, meeting_title: str) -> Dict:
+    """회의록 조각 하나의 발언 추출 요청 본문"""
+    prompt = extraction_prompt(chunk["text"], meeting_title, chunk["part"], chunk["parts"])
+    return message_params(prompt, EXTRACTION_MODEL, 8000)
+
+
+def parse_extracted_speeches(response_text: str) -> List[Dict]:
+    """
+    발언 추출 응답 파싱 (```json ... ``` 형식 처리)
+
+    Returns:
+        발언 리스트, order는 응답 순서대로 1부터 다시 매김
+    """
+
+    data = parse_json_response(response_text)
+    speeches = [
+        s for s in data.get("speeches", [])
+        if isinstance(s, dict) and s.get("speaker") and isinstance(s.get("text"), str)
+    ]
+    for order, speech in enumerate(speeches, 1):
+        speech["order"] = order
+    return speeches
+
 
-        # JSON 파싱
-        import json
+def split_speaker_turns(transcript: str) -> List[str]:
+    """
+    회의록 전문을 발언자 단위("○발언자" 줄부터 다음 "○" 줄 전까지)로 분리
+
+    첫 발언자 줄 앞의 내용(회의 개요 등)은 하나의 단위로 남깁니다.
+    """
 
-        # JSON 블록 추출 (```json ... ``` 형식 처리)
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0].strip()
+    turns = re.split(r'\n+(?=○)', transcript.strip())
+    return [turn.strip() for turn in turns if turn.strip()]
 
-        data = json.loads(response_text)
-        speeches = data.get("speeches", [])
 
-        logger.info(f"  ✅ Extracted {len(speeches)} speeches")
+def split_long_turn(turn: str, token_budget: int) -> List[str]:
+    """
+    예산보다 긴 발언을 줄 경계에서 나누기 (이어지는 조각에도 발언자 줄을 붙임)
+
+    한 줄이 예산보다 길면 글자 수로 자릅니다 (한글 1자 ≈ 1토큰).
+    """
+
+    header, _, body = turn.partition('\n')
+    if not header.startswith('○'):
+        header, body = '', turn
+
+    budget = max(1, token_budget - estimate_tokens(header))
+    lines = []
+    for line in body.split('\n'):
+        while estimate_tokens(line) > budget:
+            lines.append(line[:budget])
+            line = line[budget:]
+        lines.append(line)
+
+    pieces, current, current_tokens = [], [], 0
+    for line in lines:
+        tokens = estimate_tokens(line) + 1
+        if current and current_tokens + tokens > budget:
+            pieces.append(current)
+            current, current_tokens = [], 0
+        current.append(line)
+        current_tokens += tokens
+    if current:
+        pieces.append(current)
+
+    return ['\n'.join(([header] if header else []) + piece) for piece in pieces]
+
+
+def chunk_transcript(transcript: str, token_budget: int = EXTRACTION_CHUNK_TOKENS,
+                     overlap: int = EXTRACTION_CHUNK_OVERLAP) -> List[Dict]:
+    """
+    회의록 전문을 발언자 경계에서 토큰 예산 이하의 조각으로 나누기
+
+    조각은 발언 단위로 순서대로 채우고, 다음 조각 앞에는 직전 발언 overlap개를
+    문맥으로 다시 넣습니다 (병합 시 중복 제거). 예산보다 긴 발언은 줄 경계에서
+    여러 조각으로 나누며, 이어지는 조각은 continued로 표시합니다.
+
+    Args:
+        transcript: 회의록 전문
+        token_budget: 조각당 회의록 토큰 예산
+        overlap: 다음 조각 앞에 반복할 발언 수
+
+    Returns:
+        [{"text", "part", "parts", "overlap", "continued"}, ...] (part는 1부터)
+    """
+
+    units = []  # (text, tokens, 앞 조각에서 이어지는 발언 조각 여부, 나누지 않은 발언 여부)
+    for turn in split_speaker_turns(transcript):
+        tokens = estimate_tokens(turn) + 1  # 발언 사이 빈 줄
+        if tokens <= token_budget:
+            units.append((turn, tokens, False, True))
+        else:
+            for i, piece in enumerate(split_long_turn(turn, token_budget - 1)):
+                units.append((piece, estimate_tokens(piece) + 1, i > 0, False))
+
+    chunks = []
+    current, current_tokens, repeated = [], 0, 0
+    for unit in units:
+        text, tokens, continued, _ = unit
+        if current and current_tokens + tokens > token_budget:
+            chunks.append({"units": current, "overlap": repeated})
+
+            # 직전 발언을 문맥으로 반복 (나눈 발언이거나 예산을 많이 차지하면 생략)
+            context = current[-overlap:] if overlap and not continued else []
+            context_tokens = sum(u[1] for u in context)
+            if (not all(u[3] for u in context) or context_tokens > token_budget // 2
+                    or context_tokens + tokens > token_budget):
+                context, context_tokens = [], 0
+            current, current_tokens, repeated = list(context), context_tokens, len(context)
+
+        current.append(unit)
+        current_tokens += tokens
+    if current:
+        chunks.append({"units": current, "overlap": repeated})
+
+    return [
+        {
+            "text": "\n\n".join(u[0] for u in chunk["units"]),
+            "part": part,
+            "parts": len(chunks),
+            "overlap": chunk["overlap"],
+            "continued": chunk["units"][0][2]
+        }
+        for part, chunk in enumerate(chunks, 1)
+    ]
+
+
+def speech_fingerprint(text: str) -> str:
+    """중복 비교용 발언 지문 (공백을 제거한 앞 200자)"""
+    return re.sub(r'\s+', '', text)[:200]
+
+
+def same_speech(a: str, b: str) -> bool:
+    """두 지문이 같은 발언인지 (한쪽이 잘린 경우 포함)"""
+    n = min(len(a), len(b))
+    return n >= 10 and a[:n] == b[:n]
+
+
+def merge_chunk_speeches(chunks: List[Dict], results: List[List[Dict]]) -> List[Dict]:
+    """
+    조각별 추출 결과를 회의 전체 발언 순서로 병합
+
+    조각 앞에 문맥으로 반복한 발언은 직전 조각 결과와 지문이 같으면 버리고,
+    발언 중간에서 나뉜 조각의 첫 발언은 직전 발언 뒤에 이어 붙입니다.
+
+    Args:
+        chunks: chunk_transcript() 결과
+        results: 조각별 발언 리스트 (chunks와 같은 순서)
+
+    Returns:
+        발언 리스트, order는 1부터 다시 매김
+    """
+
+    merged = []
+    for chunk, speeches in zip(chunks, results):
+        speeches = [dict(s) for s in speeches]
+
+        if chunk["overlap"] and merged:
+            # 모델이 반복 발언을 나누어 추출했을 수도 있어 조금 넓게 비교
+            recent = [speech_fingerprint(s["text"]) for s in merged[-(chunk["overlap"] + 2):]]
+            while speeches and any(same_speech(speech_fingerprint(speeches[0]["text"]), r) for r in recent):
+                speeches.pop(0)
+
+        if chunk["continued"] and merged and speeches:
+            merged[-1]["text"] = f"{merged[-1]['text']}\n{speeches.pop(0)['text']}"
+
+        merged.extend(speeches)
+
+    for order, speech in enumerate(merged, 1):
+        speech["order"] = order
+    return merged
+
+
+def extraction_cache_input(chunk: Dict, meeting_title: str) -> Dict:
+    """발언 추출 응답 캐시 키의 입력 (프롬프트에 실제로 들어가는 내용)"""
+    return {"title": meeting_title, "transcript": chunk["text"], "part": chunk["part"], "parts": chunk["parts"]}
+
+
+def cached_chunk_speeches(chunks: List[Dict], meeting_title: str) -> Dict[int, List[Dict]]:
+    """캐시에 있는 조각별 추출 결과 {part: 발언 리스트}"""
+    cache = get_llm_cache()
+    results = {}
+    for chunk in chunks:
+        speeches = cache.get(EXTRACTION_MODEL, EXTRACTION_PROMPT_VERSION, extraction_cache_input(chunk, meeting_title))
+        if speeches is not None:
+            results[chunk["part"]] = speeches
+    return results
+
+
+async def extract_chunks(chunks: List[Dict], meeting_title: str) -> List[Optional[List[Dict]]]:
+    """
+    회의록 조각들에서 LLM_CONCURRENCY개 요청까지 동시에 발언 추출
+
+    Returns:
+        조각별 발언 리스트 (실패한 조각은 None)
+    """
+
+    semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+    cache = get_llm_cache()
+    cached = cached_chunk_speeches(chunks, meeting_title)
+
+    async def extract(chunk):
+        if chunk["part"] in cached:
+            return cached[chunk["part"]]
+        try:
+            params = extraction_params(chunk, meeting_title)
+            response_text = await complete(
+                params["messages"][0]["content"],
+                model=params["model"],
+                max_tokens=params["max_tokens"],
+                semaphore=semaphore
+            )
+            logger.debug(f"Claude response ({chunk['part']}/{chunk['parts']}): {response_text[:500]}...")
+            speeches = parse_extracted_speeches(response_text)
+        except Exception as e:
+            logger.error(f"  ❌ Error extracting speeches from chunk {chunk['part']}/{chunk['parts']}: {e}")
+            return None
+
+        cache.put(EXTRACTION_MODEL, EXTRACTION_PROMPT_VERSION, extraction_cache_input(chunk, meeting_title), speeches)
         return speeches
 
+    return await asyncio.gather(*(extract(chunk) for chunk in chunks))
+
+
+def extract_speeches_from_transcript(
+    transcript: str,
+    meeting_id: str,
+    meeting_title: str
+) -> List[Dict]:
+    """
+    Claude API를 사용하여 회의록에서 개별 발언 추출 (마크업으로 분리할 수 없는 회의록용 폴백)
+
+    긴 회의록은 발언자 경계에서 EXTRACTION_CHUNK_TOKENS 이하의 조각으로 나누어
+    동시에 추출한 뒤 순서대로 병합하므로, 소요 시간은 가장 느린 조각에 좌우됩니다.
+    한 조각이라도 실패하면 발언이 빠지지 않도록 회의 전체를 실패로 처리합니다
+    (성공한 조각은 캐시되어 재실행 시 다시 요청하지 않음).
+
+    Args:
+        transcript: 회의록 전문
+        meeting_id: 회의 ID
+        meeting_title: 회의 제목
+
+    Returns:
+        추출된 발언 리스트 [{"speaker": "name", "text": "...", "order": 1}, ...]
+    """
+
+    chunks = chunk_transcript(transcript)
+    if not chunks:
+        return []
+
+    logger.info(f"  🤖 Calling Claude API for speech extraction ({len(chunks)} chunks)...")
+    results = asyncio.run(extract_chunks(chunks, meeting_title))
+
+    failed = sum(1 for speeches in results if speeches is None)
+    if failed:
+        logger.error(f"  ❌ Failed to extract {failed}/{len(chunks)} transcript chunks")
+        return []
+
+    speeches = merge_chunk_speeches(chunks, results)
+    logger.info(f"  ✅ Extracted {len(speeches)} speeches")
+    return speeches
+
+
+def load_transcript_html(transcript_url: str) -> Optional[str]:
+    """
+    회의록 페이지 원문 HTML 가져오기 (페이지 아카이브 우선, 없으면 다시 요청)
+
+    Args:
+        transcript_url: 회의록 URL
+
+    Returns:
+        HTML 또는 None
+    """
+
+    if not transcript_url:
+        return None
+
+    if ARCHIVE_ENABLED:
+        archive = get_archive()
+        snapshots = archive.history(transcript_url)
+        if snapshots:
+            return archive.load(snapshots[-1][1]).decode("utf-8", errors="replace")
+
+    try:
+        return fetch(transcript_url).text
     except Exception as e:
-        logger.error(f"  ❌ Error extracting speeches: {e}")
+        logger.warning(f"  ⚠️  Could not fetch transcript page: {e}")
+        return None
+
+
+def segment_from_markup(meeting: Dict) -> List[Dict]:
+    """
+    회의록 마크업의 발언자 블록에서 (발언자, 직책, 내용)을 순서대로 추출 (LLM 호출 없음)
+
+    Args:
+        meeting: 회의 정보 dict (transcript_url)
+
+    Returns:
+        발언 리스트 (블록을 찾지 못하면 빈 리스트)
+    """
+
+    html = load_transcript_html(meeting.get("transcript_url"))
+    if not html:
         return []
 
+    speeches = parse_speaker_blocks(html)
+    if speeches:
+        logger.info(f"  ✅ Segmented {len(speeches)} speeches from markup")
+    else:
+        logger.warning(f"  ⚠️  No speaker blocks in transcript page")
+    return speeches
 
-def summarize_speech(speech_text: str, speaker: str) -> Dict:
+
+def segment_speeches(meeting: Dict) -> List[Dict]:
     """
-    Claude API를 사용하여 발언 요약 및 키워드 추출
+    회의록을 발언 단위로 분리
+
+    회의록 마크업의 발언자 블록에서 (발언자, 직책, 내용)을 순서대로 추출합니다.
+    블록을 찾지 못한 경우에만 회의록 전문을 Claude로 분리합니다.
 
     Args:
-        speech_text: 발언 내용
-        speaker: 발언자 이름
+        meeting: 회의 정보 dict (id, title, transcript_url)
 
     Returns:
-        {"summary": "...", "keywords": ["...", "..."]}
+        발언 리스트 [{"order": 1, "speaker": "이윤미", "role": "위원장", "text": "..."}, ...]
     """
 
-    prompt = f"""다음은 "{speaker}"의 의회 발언입니다.
+    speeches = segment_from_markup(meeting)
+    if speeches:
+        return speeches
 
-발언 내용:
-{speech_text[:5000]}
+    transcript = meeting_transcript(meeting)
+    if len(transcript) < 100:
+        return []
+    logger.info(f"  🤖 Falling back to Claude for segmentation")
+    return extract_speeches_from_transcript(transcript, meeting["id"], meeting["title"])
 
-이 발언을 분석하여 다음을 제공해주세요:
-1. 핵심 요약 (2-3문장, 200자 이내)
-2. 주요 키워드 (최대 5개)
 
-출력 형식:
+def pack_speeches(speeches: List[Dict], token_budget: int, max_speeches: int) -> List[List[Dict]]:
+    """
+    발언을 요약 요청 단위로 묶기 (발언 순서 유지)
+
+    한 요청의 발언 토큰 합이 token_budget, 발언 수가 max_speeches를 넘지 않도록
+    순서대로 채웁니다. 예산보다 긴 발언은 혼자 한 요청이 됩니다.
+
+    Args:
+        speeches: 발언 리스트
+        token_budget: 요청당 발언 입력 토큰 예산
+        max_speeches: 요청당 최대 발언 수
+
+    Returns:
+        발언 묶음 리스트
+    """
+
+    batches = []
+    current, current_tokens = [], 0
+
+    for speech in speeches:
+        tokens = estimate_tokens(speech["text"][:SPEECH_SUMMARY_CHARS])
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_speeches):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(speech)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def summary_prompt(speeches: List[Dict]) -> str:
+    """여러 발언을 한 번에 요약하는 프롬프트 (발언은 speech_order로 구분)"""
+
+    blocks = "\n\n".join(
+        f"[발언 #{s['order']}] {s.get('speaker', '')} {s.get('role', '')}".rstrip()
+        + f"\n{s['text'][:SPEECH_SUMMARY_CHARS]}"
+        for s in speeches
+    )
+
+    return f"""다음은 용인시의회 회의의 발언 {len(speeches)}건입니다. 각 발언은 "[발언 #번호] 발언자"로 시작합니다.
+
+{blocks}
+
+각 발언의 핵심을 2-3문장, 200자 이내로 요약해주세요.
+
+출력 형식 (모든 발언을 번호와 함께 빠짐없이):
 {{
-  "summary": "발언 요약...",
-  "keywords": ["키워드1", "키워드2", "키워드3"]
+  "summaries": [
+    {{
+      "speech_order": 1,
+      "summary": "발언 요약..."
+    }}
+  ]
 }}
 
 JSON만 출력해주세요."""
 
+
+def summary_params(speeches: List[Dict]) -> Dict:
+    """여러 발언 요약 요청 본문 (발언당 출력 약 200토큰)"""
+    return message_params(summary_prompt(speeches), SUMMARY_MODEL, min(8000, 200 * len(speeches) + 200))
+
+
+def parse_summaries(response_text: str, orders: set) -> Dict[int, Dict]:
+    """
+    요약 응답을 발언별로 분리하고 검증
+
+    요청하지 않은 번호나 빈 요약 항목은 버립니다.
+
+    Args:
+        response_text: Claude 응답
+        orders: 요청에 포함된 speech_order 집합
+
+    Returns:
+        {speech_order: {"summary": "..."}} (유효한 항목만)
+    """
+
     try:
-        message = claude_client.messages.create(
-            model="claude-3-5-haiku-20241022",  # 요약은 Haiku로
-            max_tokens=1000,
-            temperature=0,
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        )
+        data = parse_json_response(response_text)
+    except ValueError:
+        return {}
+    items = data.get("summaries") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return {}
+
+    results = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            order = int(item.get("speech_order"))
+        except (TypeError, ValueError):
+            continue
+        summary = item.get("summary")
+        if order not in orders or not isinstance(summary, str) or not summary.strip():
+            continue
+        results[order] = {"summary": summary.strip()}
+    return results
 
-        response_text = message.content[0].text
 
-        # JSON 블록 추출
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0].strip()
+def summary_cache_input(speech: Dict) -> Dict:
+    """발언 요약 캐시 키의 입력 (발언 번호는 제외: 같은 발언이면 회의 안 위치와 무관)"""
+    return {
+        "speaker": speech.get("speaker") or "",
+        "role": speech.get("role") or "",
+        "text": speech["text"][:SPEECH_SUMMARY_CHARS]
+    }
 
-        import json
-        data = json.loads(response_text)
 
-        return {
-            "summary": data.get("summary", ""),
-            "keywords": data.get("keywords", [])
-        }
+def cached_summaries(speeches: List[Dict]) -> Dict[int, Dict]:
+    """캐시에 있는 요약 {speech_order: {"summary"}}"""
+    cache = get_llm_cache()
+    results = {}
+    for speech in speeches:
+        summary_data = cache.get(SUMMARY_MODEL, SUMMARY_PROMPT_VERSION, summary_cache_input(speech))
+        if summary_data is not None:
+            results[speech["order"]] = summary_data
+    return results
+
+
+def cache_summaries(speeches: List[Dict], results: Dict[int, Dict]):
+    """검증된 요약을 발언별로 캐시에 저장"""
+    cache = get_llm_cache()
+    for speech in speeches:
+        if speech["order"] in results:
+            cache.put(SUMMARY_MODEL, SUMMARY_PROMPT_VERSION, summary_cache_input(speech), results[speech["order"]])
+
+
+async def summarize_batch(speeches: List[Dict], semaphore: Optional[asyncio.Semaphore] = None) -> Dict[int, Dict]:
+    """
+    Claude API 한 번으로 여러 발언 요약 (비동기)
+
+    Args:
+        speeches: 한 요청에 담을 발언 리스트
+        semaphore: 동시 요청 수 제한
+
+    Returns:
+        {speech_order: {"summary": "..."}} (응답에서 검증된 항목만)
+    """
+
+    try:
+        params = summary_params(speeches)
+        response_text = await complete(
+            summary_prompt(speeches),
+            model=params["model"],
+            max_tokens=params["max_tokens"],
+            semaphore=semaphore
+        )
+        results = parse_summaries(response_text, {s["order"] for s in speeches})
+        cache_summaries(speeches, results)
+        return results
 
     except Exception as e:
-        logger.error(f"  ⚠️ Error summarizing speech: {e}")
-        return {"summary": "", "keywords": []}
+        logger.error(f"  ⚠️ Error summarizing {len(speeches)} speeches: {e}")
+        return {}
+
+
+def speech_row(meeting_id: str, speech: Dict, summary_data: Dict) -> Dict:
+    """발언과 요약으로 speeches 테이블 행 만들기 (keywords는 extract_keywords.py가 채움)"""
+    return {
+        "meeting_id": meeting_id,
+        "councillor_id": speech.get("councillor_id"),
+        "speech_order": speech["order"],
+        "speech_text": speech["text"],
+        "summary": summary_data["summary"],
+        "keywords": summary_data.get("keywords") or [],
+        "created_at": datetime.utcnow().isoformat(),
+        "updated_at": datetime.utcnow().isoformat()
+    }
+
+
+def stored_speeches(speeches: List[Dict]) -> List[Dict]:
+    """체크포인트·배치 context에 저장할 발언 필드만 남기기 (10자 미만 발언 제외)"""
+    return [
+        {
+            "order": s["order"],
+            "speaker": s.get("speaker") or "",
+            "role": s.get("role") or "",
+            "text": s["text"],
+            "councillor_id": s.get("councillor_id")
+        }
+        for s in speeches
+        if s.get("text") and len(s["text"]) >= 10
+    ]
 
 
-def match_councillor(speaker_name: str) -> Optional[str]:
+async def summarize_speeches(speeches: List[Dict], on_done=None) -> Dict[int, Dict]:
     """
-    발언자 이름으로 의원 ID 찾기
+    회의 발언을 여러 건씩 묶어 LLM_CONCURRENCY개 요청까지 동시에 요약
+
+    발언은 SUMMARY_BATCH_TOKENS 예산 안에서 한 요청으로 묶고, 응답은
+    speech_order별로 분리합니다. 누락되거나 잘못된 항목만 SUMMARY_RETRIES번까지
+    다시 요청하며, 끝내 실패한 발언은 결과와 on_done에서 빠집니다(다음 실행에서
+    다시 요약). 요청 속도는
+    utils.llm의 분당 요청/토큰 한도를 따르며, 요청 하나가 끝날 때마다 그 결과를
+    on_done({speech_order: 요약})으로 바로 넘깁니다 (워커 스레드에서 호출).
 
     Args:
-        speaker_name: "홍길동 의원" 또는 "홍길동 의장" 형식
+        speeches: 발언 리스트 (order는 회의 안에서 고유)
+        on_done: 끝난 요약을 받는 콜백 (예: 체크포인트 기록)
 
     Returns:
-        의원 UUID 또는 None
+        {speech_order: {"summary": "..."}} (요약에 성공한 발언만)
     """
 
-    # 이름에서 직책 제거
-    name = speaker_name.replace("의원", "").replace("의장", "").replace("부의장", "").strip()
+    semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+
+    async def summarize(batch):
+        summaries = {}
+        pending = batch
+        for attempt in range(SUMMARY_RETRIES + 1):
+            if attempt:
+                logger.warning(f"    🔁 Re-requesting {len(pending)} unsummarized speeches")
+            results = await summarize_batch(pending, semaphore)
+            summaries.update(results)
+            pending = [s for s in pending if s["order"] not in results]
+            if not pending:
+                break
+
+        for speech in pending:
+            logger.error(f"  ⚠️ No summary for speech #{speech['order']}")
+        return summaries
+
+    # 같은 발언의 요약은 캐시에서 (재실행 시 API 호출 없음)
+    summaries = cached_summaries(speeches)
+    if summaries and on_done:
+        await asyncio.to_thread(on_done, dict(summaries))
+
+    uncached = [s for s in speeches if s["order"] not in summaries]
+    batches = pack_speeches(uncached, SUMMARY_BATCH_TOKENS, SUMMARY_BATCH_MAX_SPEECHES)
+    logger.info(f"    📝 Summarizing {len(uncached)} speeches in {len(batches)} requests"
+                f" ({len(summaries)} cached)...")
+
+    tasks = [asyncio.ensure_future(summarize(batch)) for batch in batches]
+    for finished in asyncio.as_completed(tasks):
+        results = await finished
+        summaries.update(results)
+        if on_done:
+            # DB 쓰기(체크포인트)가 다른 요약 요청을 막지 않도록 스레드에서 처리
+            await asyncio.to_thread(on_done, results)
+
+    return summaries
+
+
+def attribute_speeches(speeches: List[Dict], resolver: CouncillorResolver) -> List[Dict]:
+    """
+    회의 전체 발언의 발언자를 한 번에 의원 ID로 매칭 (DB 조회 없음)
 
-    try:
-        response = supabase.table("councillors")\
-            .select("id")\
-            .ilike("name", f"%{name}%")\
-            .limit(1)\
-            .execute()
+    프로필 링크가 있는 발언자는 이름으로, 그 외에는 "직책 이름"으로 매칭하므로
+    의원 직책(의장, 부의장, 위원장 등)은 제거되고 공무원 발언은 매칭되지 않습니다.
 
-        if response.data and len(response.data) > 0:
-            return response.data[0]["id"]
+    Args:
+        speeches: 발언 리스트 (speaker, role, is_member)
+        resolver: 실행당 한 번 로드한 CouncillorResolver
 
-    except Exception as e:
-        logger.debug(f"  Could not match councillor '{name}': {e}")
+    Returns:
+        councillor_id가 채워진 같은 리스트
+    """
+
+    def label(speech):
+        if speech.get("is_member"):
+            return speech.get("speaker", "")
+        return f"{speech.get('role', '')} {speech.get('speaker', '')}".strip()
 
-    return None
+    resolved = resolver.resolve_many([label(s) for s in speeches], fuzzy=True)
+    for speech in speeches:
+        speech["councillor_id"] = resolved.get(label(speech))
+
+    matched = sum(1 for s in speeches if s["councillor_id"])
+    logger.info(f"  👤 Attributed {matched}/{len(speeches)} speeches to councillors")
+    return speeches
 
 
-def save_speeches_to_db(speeches: List[Dict], meeting_id: str) -> int:
+def save_speeches_to_db(
+    speeches: List[Dict],
+    meeting_id: str,
+    summaries: Optional[Dict[int, Dict]] = None
+) -> int:
     """
-    추출된 발언을 Supabase에 저장
+    남은 발언을 동시에 요약하면서 체크포인트에 기록하고, 끝나면 한 번에 저장
+
+    요청 하나가 끝날 때마다 지금까지의 요약을 speech_checkpoints에 기록하므로
+    중단된 실행은 남은 발언만 다시 요약합니다. 저장은 replace_meeting_speeches()
+    함수 호출 한 번으로 회의의 기존 발언 교체, meetings.is_processed 설정,
+    체크포인트 삭제를 한 트랜잭션에서 처리합니다 (재시도해도 안전).
+    요약이 하나라도 빠지면 저장하지 않고 체크포인트만 남겨 다음 실행에서
+    빠진 발언만 다시 요약합니다.
 
     Args:
-        speeches: 발언 리스트
+        speeches: 발언 리스트 (stored_speeches() 형식)
         meeting_id: 회의 ID
+        summaries: 체크포인트에 이미 있는 요약 {speech_order: {"summary"}}
 
     Returns:
-        저장된 발언 수
+        저장된 발언 수 (요약이 빠져 저장하지 않았으면 0)
     """
 
-    saved_count = 0
+    summaries = dict(summaries or {})
 
-    for speech in speeches:
+    def checkpoint(results):
+        summaries.update(results)
         try:
-            speaker = speech.get("speaker", "")
-            speech_text = speech.get("text", "")
-            order = speech.get("order", 0)
+            update_speech_checkpoint(meeting_id, summaries)
+        except Exception as e:
+            logger.warning(f"    ⚠️  Could not checkpoint summaries: {e}")
+        logger.info(f"    💾 Summarized {len(summaries)}/{len(speeches)}")
 
-            if not speech_text or len(speech_text) < 10:
-                continue
+    pending = [s for s in speeches if s["order"] not in summaries]
+    if pending:
+        asyncio.run(summarize_speeches(pending, checkpoint))
 
-            # 의원 매칭
-            councillor_id = match_councillor(speaker)
-
-            # 요약 및 키워드 추출
-            logger.info(f"    📝 Summarizing speech #{order} by {speaker}...")
-            summary_data = summarize_speech(speech_text, speaker)
-
-            # DB 저장
-            data = {
-                "meeting_id": meeting_id,
-                "councillor_id": councillor_id,
-                "speech_order": order,
-                "speech_text": speech_text,
-                "summary": summary_data["summary"],
-                "keywords": summary_data["keywords"],
-                "created_at": datetime.utcnow().isoformat(),
-                "updated_at": datetime.utcnow().isoformat()
-            }
+    missing = [s["order"] for s in speeches if s["order"] not in summaries]
+    if missing:
+        logger.error(f"    ❌ {len(missing)} speeches unsummarized, not saving (checkpoint kept)")
+        return 0
+
+    rows = [speech_row(meeting_id, s, summaries[s["order"]]) for s in speeches]
+    try:
+        return replace_meeting_speeches(meeting_id, rows)
+    except Exception as e:
+        logger.error(f"    ❌ Error saving speeches (checkpoint kept): {e}")
+        return 0
 
-            supabase.table("speeches").insert(data).execute()
-            saved_count += 1
-            logger.info(f"    ✅ Saved speech #{order}")
 
-        except Exception as e:
-            logger.error(f"    ❌ Error saving speech #{order}: {e}")
-            continue
+def is_meeting_processed(meeting_id: str) -> bool:
+    """회의의 발언 저장이 끝났는지 확인 (meetings.is_processed)"""
+
+    existing = supabase.table("meetings")\
+        .select("is_processed")\
+        .eq("id", meeting_id)\
+        .execute()
+    return bool(existing.data and existing.data[0].get("is_processed"))
+
+
+def resume_checkpoint(meeting_id: str) -> Optional[Dict]:
+    """
+    중단된 실행의 체크포인트 불러오기
+
+    Returns:
+        {"speeches": [...], "summaries": {speech_order: 요약}} 또는 None
+    """
+
+    checkpoint = get_speech_checkpoint(meeting_id)
+    if not checkpoint:
+        return None
+
+    logger.info(f"  ♻️  Resuming from checkpoint: {checkpoint['stage']}, "
+                f"summarized {checkpoint['summarized']}/{checkpoint['total']}")
+    return {
+        "speeches": checkpoint["speeches"],
+        "summaries": {int(order): data for order, data in (checkpoint["summaries"] or {}).items()}
+    }
+
+
+def meeting_transcript(meeting: Dict) -> str:
+    """
+    회의록 전문을 필요할 때 한 회의만 불러오기 (meeting dict에 보관해 다시 조회하지 않음)
+
+    Returns:
+        transcript_text (없으면 빈 문자열)
+    """
+
+    if "transcript_text" not in meeting:
+        response = with_retries(lambda: supabase.table("meetings")
+                                .select("transcript_text")
+                                .eq("id", meeting["id"])
+                                .execute())
+        meeting["transcript_text"] = response.data[0]["transcript_text"] if response.data else None
+    return meeting["transcript_text"] or ""
 
-    return saved_count
 
+def mark_checkpointed(meetings: List[Dict]) -> List[Dict]:
+    """
+    체크포인트가 있는 회의 표시 (has_checkpoint, 목록 전체에 한 번만 조회)
+
+    체크포인트 내용(발언·요약)은 해당 회의를 처리할 때 resume_checkpoint()로 불러옵니다.
+    """
+
+    ids = [meeting["id"] for meeting in meetings]
+    checkpointed = set()
+    if ids:
+        response = with_retries(lambda: supabase.table("speech_checkpoints")
+                                .select("meeting_id")
+                                .in_("meeting_id", ids)
+                                .execute())
+        checkpointed = {row["meeting_id"] for row in response.data}
+    for meeting in meetings:
+        meeting["has_checkpoint"] = meeting["id"] in checkpointed
+    return meetings
+
+
+def count_meetings(force: bool = False) -> int:
+    """iter_meetings()가 돌려줄 회의 수 (진행률 표시용, 같은 is_processed 조건)"""
+
+    query = supabase.table("meetings")\
+        .select("id", count="exact", head=True)\
+        .not_.is_("transcript_text", "null")
+    if not force:
+        query = query.not_.is_("is_processed", "true")
+    return with_retries(lambda: query.execute()).count or 0
+
+
+def iter_meetings(
+    force: bool = False,
+    limit: Optional[int] = None,
+    page_size: int = SPEECH_MEETINGS_PER_PAGE
+) -> Iterator[Dict]:
+    """
+    회의록이 있는 회의를 최신순으로 한 페이지씩 가져오는 제너레이터
+
+    목록에는 회의록 전문을 담지 않고, 페이지는 마지막 행의 (created_at, id)
+    뒤에서 이어 읽습니다(키셋). 처리한 회의가 목록에서 빠져도 건너뛰는 행이
+    없고, 회의가 늘어도 메모리에는 한 페이지의 목록과 처리 중인 회의의
+    전문만 남습니다.
+
+    처리 여부는 speeches와 조인하지 않고 meetings.is_processed로만 거릅니다.
+    체크포인트 도입 전에 발언이 저장된 회의는
+    20261018000400_add_speech_checkpoints.sql이 처리된 것으로 표시해 두므로,
+    그 마이그레이션 없이는 과거 회의가 모두 다시 처리 대상이 됩니다.
+
+    Args:
+        force: 처리가 끝난 회의도 포함
+        limit: 최대 회의 수
+        page_size: 한 번에 가져올 회의 수
 
-def process_meeting(meeting: Dict, force: bool = False) -> bool:
+    Yields:
+        회의 정보 dict (MEETING_COLUMNS, has_checkpoint)
+    """
+
+    cursor = None
+    remaining = limit
+    while remaining is None or remaining > 0:
+        query = supabase.table("meetings")\
+            .select(MEETING_COLUMNS)\
+            .not_.is_("transcript_text", "null")
+        if not force:
+            query = query.not_.is_("is_processed", "true")
+        if cursor:
+            created_at, meeting_id = cursor
+            query = query.or_(
+                f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{meeting_id})'
+            )
+        size = page_size if remaining is None else min(page_size, remaining)
+        query = query.order("created_at", desc=True).order("id", desc=True).limit(size)
+
+        page = with_retries(lambda: query.execute()).data
+        yield from mark_checkpointed(page)
+
+        if len(page) < size:
+            return
+        cursor = (page[-1]["created_at"], page[-1]["id"])
+        if remaining is not None:
+            remaining -= len(page)
+
+
+def process_meeting(
+    meeting: Dict,
+    resolver: CouncillorResolver,
+    force: bool = False
+) -> bool:
     """
     회의록 처리: 발언 추출 및 저장
 
+    단계(분리 → 요약 k/N → 저장)마다 speech_checkpoints에 기록하므로, 중단된
+    회의는 다음 실행에서 멈춘 단계부터 이어서 처리합니다.
+
     Args:
-        meeting: 회의 정보 dict
-        force: 기존 발언 재추출 여부
+        meeting: 회의 정보 dict (MEETING_COLUMNS, has_checkpoint; 전문은 필요할 때 불러옴)
+        resolver: 발언자 매칭용 CouncillorResolver
+        force: 저장이 끝난 회의도 체크포인트 없이 처음부터 재추출 (기존 발언은 원자적으로 교체)
 
     Returns:
         성공 여부
@@ -290,89 +943,485 @@ def process_meeting(meeting: Dict, force: bool = False) -> bool:
 
     meeting_id = meeting["id"]
     title = meeting["title"]
-    transcript = meeting.get("transcript_text", "")
 
     logger.info(f"Processing: {title}")
 
     # 이미 처리된 회의인지 확인
-    if not force:
-        existing = supabase.table("speeches")\
-            .select("id")\
-            .eq("meeting_id", meeting_id)\
-            .limit(1)\
-            .execute()
-
-        if existing.data and len(existing.data) > 0:
-            logger.info(f"  ⏭️  Already processed (use --force to re-extract)")
-            return True
-
-    # 회의록 전문이 없으면 스킵
-    if not transcript or len(transcript) < 100:
-        logger.warning(f"  ⚠️  No transcript available")
-        return False
-
-    # 발언 추출
-    speeches = extract_speeches_from_transcript(transcript, meeting_id, title)
-
-    if not speeches:
-        logger.error(f"  ❌ Failed to extract speeches")
-        return False
-
-    # 기존 발언 삭제 (force 모드)
-    if force:
-        supabase.table("speeches")\
-            .delete()\
-            .eq("meeting_id", meeting_id)\
-            .execute()
-        logger.info(f"  🗑️  Deleted existing speeches")
-
-    # 발언 저장
-    saved = save_speeches_to_db(speeches, meeting_id)
+    if not force and meeting.get("is_processed"):
+        logger.info(f"  ⏭️  Already processed (use --force to re-extract)")
+        return True
+
+    checkpoint = resume_checkpoint(meeting_id) if meeting.get("has_checkpoint") and not force else None
+    if checkpoint:
+        speeches, summaries = checkpoint["speeches"], checkpoint["summaries"]
+    else:
+        # 회의록이 없으면 스킵
+        if not meeting.get("transcript_url") and len(meeting_transcript(meeting)) < 100:
+            logger.warning(f"  ⚠️  No transcript available")
+            return False
+
+        # 발언 분리 (10자 미만 발언은 저장하지 않음)
+        speeches = segment_speeches(meeting)
+        speeches = stored_speeches(attribute_speeches(speeches, resolver)) if speeches else []
+
+        if not speeches:
+            logger.error(f"  ❌ Failed to extract speeches")
+            return False
+
+        save_speech_checkpoint(meeting_id, speeches)
+        summaries = {}
+
+    # 요약 후 저장 (기존 발언과 한 번에 교체, is_processed 설정)
+    saved = save_speeches_to_db(speeches, meeting_id, summaries)
 
     logger.info(f"  ✅ Saved {saved}/{len(speeches)} speeches")
 
     return saved > 0
 
+# ---------------------------------------------------------------------------
+# 배치 모드 (Message Batches API): 제출한 배치는 llm_batches에 기록하고
+# 다음 실행에서 결과를 수집합니다. 배치 context에는 회의 ID와 단계, 요청별
+# 조각 번호·speech_order만 담고, 회의록은 meetings에서, 분리한 발언과 모인
+# 요약은 speech_checkpoints에서 다시 불러옵니다.
+# ---------------------------------------------------------------------------
+
+def summary_job(speeches: List[Dict], summaries: Optional[Dict[int, Dict]] = None, attempt: int = 0) -> Dict:
+    """요약 단계 배치 작업 (체크포인트의 발언에 모인 요약을 합친 것)"""
+
+    summaries = summaries or {}
+    return {
+        "stage": "summarize",
+        "speeches": [dict(s, **summaries.get(s["order"], {})) for s in speeches],
+        "attempt": attempt
+    }
+
+
+def checkpointed_summary_job(meeting_id: str, speeches: List[Dict]) -> Dict:
+    """분리한 발언을 체크포인트에 한 번 저장하고 요약 단계 작업으로"""
+
+    save_speech_checkpoint(meeting_id, speeches)
+    return summary_job(speeches)
+
+
+def job_summaries(job: Dict) -> Dict[int, Dict]:
+    """요약 단계 작업에서 요약이 모인 발언 {speech_order: {"summary", "keywords"}}"""
+
+    return {
+        s["order"]: {k: s[k] for k in ("summary", "keywords") if k in s}
+        for s in job["speeches"] if "summary" in s
+    }
+
+
+def queue_batch_requests(meeting_id: str, job: Dict, context: Dict, requests: Dict) -> int:
+    """
+    회의 작업의 다음 단계 요청을 배치에 추가
+
+    추출 단계(stage "extract")는 결과가 없는 회의록 조각의 발언 추출 요청을,
+    요약 단계는 요약이 없는 발언을 토큰 예산 단위로 묶은 요약 요청들을
+    추가합니다. 캐시에 있는 요약은 요청하지 않고 체크포인트에 바로 채웁니다.
+    context에는 단계와 시도 횟수, 요청별 조각 번호·speech_order만 기록합니다.
+
+    Args:
+        meeting_id: 회의 ID
+        job: 추출 {"stage", "title", "transcript", "chunks", "attempt"}
+            (chunks: 추출이 끝난 조각 {part: 발언 리스트}) 또는
+            요약 {"stage", "speeches", "attempt"}
+        context: 배치 context ({"meetings": {...}, "requests": {...}})
+        requests: {custom_id: 요청 본문}
+
+    Returns:
+        추가한 요청 수 (0이면 모든 발언의 요약이 준비된 상태이며 context에도 넣지 않음)
+    """
+
+    prefix = f"{meeting_id}-{job['attempt']}"
+
+    if job["stage"] == "extract":
+        # 회의록 조각마다 추출 요청 하나 (이미 결과가 있는 조각 제외)
+        chunks = chunk_transcript(job["transcript"])
+        done = job.get("chunks") or {}
+        context["meetings"][meeting_id] = {"stage": "extract", "attempt": job["attempt"], "parts": len(chunks)}
+        before = len(requests)
+        for chunk in chunks:
+            if chunk["part"] in done:
+                continue
+            custom_id = f"{prefix}-x{chunk['part']}"
+            requests[custom_id] = extraction_params(chunk, job["title"])
+            context["requests"][custom_id] = {"meeting_id": meeting_id, "kind": "extract", "part": chunk["part"]}
+        return len(requests) - before
+
+    pending = [s for s in job["speeches"] if "summary" not in s]
+    cached = cached_summaries(pending)
+    if cached:
+        for speech in pending:
+            speech.update(cached.get(speech["order"], {}))
+        update_speech_checkpoint(meeting_id, job_summaries(job))
+    pending = [s for s in pending if "summary" not in s]
+    if not pending:
+        return 0
+
+    context["meetings"][meeting_id] = {"stage": "summarize", "attempt": job["attempt"]}
+    before = len(requests)
+    for i, batch in enumerate(pack_speeches(pending, SUMMARY_BATCH_TOKENS, SUMMARY_BATCH_MAX_SPEECHES), 1):
+        custom_id = f"{prefix}-s{i}"
+        requests[custom_id] = summary_params(batch)
+        context["requests"][custom_id] = {
+            "meeting_id": meeting_id,
+            "kind": "summarize",
+            "orders": [s["order"] for s in batch]
+        }
+    return len(requests) - before
+
+
+def save_batch_job(meeting_id: str, job: Dict) -> int:
+    """
+    요약이 모두 모인 배치 작업의 발언 저장 (is_processed 설정, 체크포인트 삭제)
+
+    Returns:
+        저장된 발언 수 (다른 실행이 먼저 저장한 회의는 0)
+    """
+
+    if is_meeting_processed(meeting_id):
+        logger.info(f"  ⏭️  {meeting_id} already processed, skipping")
+        return 0
+
+    rows = [
+        speech_row(meeting_id, speech, {
+            "summary": speech["summary"],
+            "keywords": speech.get("keywords", [])
+        })
+        for speech in job["speeches"]
+    ]
+    try:
+        return replace_meeting_speeches(meeting_id, rows)
+    except Exception as e:
+        logger.error(f"  ❌ Error saving speeches of {meeting_id}: {e}")
+        return 0
+
+
+def extraction_job(meeting_id: str, title: str, transcript: str, resolver: CouncillorResolver) -> Dict:
+    """
+    LLM 발언 추출이 필요한 회의의 배치 작업 (모든 조각의 추출 결과가 캐시에 있으면 바로 요약 단계로)
+    """
+
+    chunks = chunk_transcript(transcript)
+    cached = cached_chunk_speeches(chunks, title)
+    if len(cached) == len(chunks):
+        speeches = merge_chunk_speeches(chunks, [cached[chunk["part"]] for chunk in chunks])
+        attribute_speeches(speeches, resolver)
+        return checkpointed_summary_job(meeting_id, stored_speeches(speeches))
+    return {"stage": "extract", "title": title, "transcript": transcript, "chunks": cached, "attempt": 0}
+
+
+def batch_meeting(meeting_id: str) -> Optional[Dict]:
+    """배치 수집 시 회의 제목과 회의록 전문 다시 불러오기 (없으면 None)"""
+
+    response = with_retries(lambda: supabase.table("meetings")
+                            .select("title, transcript_text")
+                            .eq("id", meeting_id)
+                            .execute())
+    return response.data[0] if response.data else None
+
+
+def submit_pending_batch(context: Dict, requests: Dict) -> Optional[str]:
+    """배치를 제출하고 llm_batches에 기록 (요청이 없으면 None)"""
+
+    if not requests:
+        return None
+    batch_id = submit_batch(requests)
+    save_llm_batch(batch_id, len(requests), context)
+    return batch_id
+
+
+def submit_batch_jobs(meetings: Iterator[Dict], resolver: CouncillorResolver) -> Optional[str]:
+    """
+    처리되지 않은 회의의 발언 추출/요약 요청을 하나의 메시지 배치로 제출
+
+    마크업으로 분리되는 회의는 발언을 바로 분리·매칭해 체크포인트에 저장하고
+    요약 요청만 보내며, 나머지는 발언 추출 요청을 보냅니다 (요약은 수집
+    단계에서 이어서 제출). 중단된 실행의 체크포인트가 있으면 남은 요약만
+    요청합니다. 처리가 끝났거나 수집 대기 중인 배치에 들어 있는 회의는 건너뜁니다.
+
+    Args:
+        meetings: 회의 정보 dict (iter_meetings())
+        resolver: 발언자 매칭용 CouncillorResolver
+
+    Returns:
+        제출한 배치 ID (제출할 요청이 없으면 None)
+    """
+
+    queued = {
+        meeting_id
+        for batch in get_open_llm_batches()
+        for meeting_id in batch["context"]["meetings"]
+    }
+    context = {"meetings": {}, "requests": {}}
+    requests = {}
+
+    for meeting in meetings:
+        meeting_id = meeting["id"]
+        if meeting_id in queued or meeting.get("is_processed"):
+            continue
+
+        logger.info(f"Queueing: {meeting['title']}")
+        checkpoint = resume_checkpoint(meeting_id) if meeting.get("has_checkpoint") else None
+        speeches = None if checkpoint else segment_from_markup(meeting)
+        if checkpoint:
+            job = summary_job(checkpoint["speeches"], checkpoint["summaries"])
+        elif speeches:
+            attribute_speeches(speeches, resolver)
+            job = checkpointed_summary_job(meeting_id, stored_speeches(speeches))
+        elif len(meeting_transcript(meeting)) >= 100:
+            job = extraction_job(meeting_id, meeting["title"], meeting_transcript(meeting), resolver)
+        else:
+            logger.warning(f"  ⚠️  No transcript available")
+            continue
+
+        if not queue_batch_requests(meeting_id, job, context, requests):
+            saved = save_batch_job(meeting_id, job)
+            logger.info(f"  💾 Saved {saved} speeches from cache")
+
+    batch_id = submit_pending_batch(context, requests)
+    if batch_id:
+        logger.info(f"📤 Submitted {len(requests)} requests for {len(context['meetings'])} meetings: {batch_id}")
+    else:
+        logger.info("No meetings to queue")
+    return batch_id
+
+
+def poll_batch_jobs() -> List[Dict]:
+    """
+    수집 대기 중인 배치의 처리 상태 조회
+
+    Returns:
+        [{"id", "status", "counts"}, ...]
+    """
+
+    statuses = []
+    for record in get_open_llm_batches():
+        batch = get_batch(record["id"])
+        counts = batch.request_counts
+        logger.info(
+            f"  {record['id']}: {batch.processing_status} "
+            f"(processing {counts.processing}, succeeded {counts.succeeded}, errored {counts.errored}, "
+            f"expired {counts.expired})"
+        )
+        statuses.append({"id": record["id"], "status": batch.processing_status, "counts": counts})
+    return statuses
+
+
+def collect_extraction(meeting_id: str, entry: Dict, job_requests: Dict, results: Dict) -> Optional[Dict]:
+    """
+    회의록 조각별 발언 추출 결과를 모아 추출 단계 작업으로 (회의가 없으면 None)
+
+    회의록은 meetings에서 다시 불러와 조각으로 나누고, 앞선 배치에서 끝난
+    조각은 LLM 응답 캐시에서 채웁니다. 제출 후 회의록이 바뀌어 조각 수가
+    다르면 이번 결과는 버리고 다시 요청합니다.
+    """
+
+    meeting = batch_meeting(meeting_id)
+    if not meeting:
+        return None
+
+    title, transcript = meeting["title"], meeting["transcript_text"] or ""
+    chunks = chunk_transcript(transcript)
+    done = cached_chunk_speeches(chunks, title)
+    if len(chunks) != entry["parts"]:
+        logger.warning(f"  ⚠️  Transcript of {meeting_id} changed since submission, re-requesting")
+        job_requests = {}
+
+    for custom_id, request in job_requests.items():
+        chunk = chunks[request["part"] - 1]
+        try:
+            speeches = parse_extracted_speeches(results.get(custom_id) or "")
+        except ValueError as e:
+            logger.warning(f"  ⚠️  Invalid extraction reply for {meeting_id} "
+                           f"({chunk['part']}/{chunk['parts']}): {e}")
+            continue
+        done[chunk["part"]] = speeches
+        get_llm_cache().put(EXTRACTION_MODEL, EXTRACTION_PROMPT_VERSION,
+                            extraction_cache_input(chunk, title), speeches)
+
+    return {"stage": "extract", "title": title, "transcript": transcript, "chunks": done,
+            "attempt": entry["attempt"]}
+
+
+def collect_batch_jobs(resolver: CouncillorResolver) -> Dict:
+    """
+    처리가 끝난 배치의 결과를 수집해 발언을 저장
+
+    발언 추출 결과는 분리·매칭해 체크포인트에 저장한 뒤 요약 요청으로,
+    요약은 체크포인트에 모으고, 응답에서 빠지거나 잘못된 요약은
+    SUMMARY_RETRIES번까지 다시 묶어 후속 배치로 제출합니다. 회의의 모든 발언
+    요약이 모이면 발언을 저장하고, 재시도 후에도 요약이 빠진 회의는 체크포인트로
+    남겨 다음 제출에서 빠진 발언만 다시 요청합니다.
+
+    Args:
+        resolver: 발언자 매칭용 CouncillorResolver
+
+    Returns:
+        {"batches", "meetings", "speeches", "requeued", "failed"} 통계
+    """
+
+    stats = {"batches": 0, "meetings": 0, "speeches": 0, "requeued": 0, "failed": 0}
+
+    for record in get_open_llm_batches():
+        batch_id = record["id"]
+        batch = get_batch(batch_id)
+        if batch.processing_status != "ended":
+            logger.info(f"  ⏳ {batch_id} still {batch.processing_status}")
+            continue
+
+        results = get_batch_results(batch_id)
+        context = record["context"]
+        follow_up = {"meetings": {}, "requests": {}}
+        follow_requests = {}
+
+        for meeting_id, entry in context["meetings"].items():
+            job_requests = {
+                custom_id: request for custom_id, request in context["requests"].items()
+                if request["meeting_id"] == meeting_id
+            }
+
+            if entry["stage"] == "extract":
+                # 조각별 발언 추출 결과 -> 모든 조각이 모이면 병합해 요약 요청
+                job = collect_extraction(meeting_id, entry, job_requests, results)
+                if job is None:
+                    logger.error(f"  ❌ Meeting {meeting_id} no longer exists")
+                    stats["failed"] += 1
+                    continue
+
+                chunks = chunk_transcript(job["transcript"])
+                if len(job["chunks"]) < len(chunks):
+                    if job["attempt"] < SUMMARY_RETRIES:
+                        queue_batch_requests(meeting_id, dict(job, attempt=job["attempt"] + 1),
+                                             follow_up, follow_requests)
+                        stats["requeued"] += 1
+                    else:
+                        logger.error(f"  ❌ Failed to extract speeches for {meeting_id}")
+                        stats["failed"] += 1
+                    continue
+
+                speeches = merge_chunk_speeches(chunks, [job["chunks"][chunk["part"]] for chunk in chunks])
+                if not speeches:
+                    logger.error(f"  ❌ No speeches extracted for {meeting_id}")
+                    stats["failed"] += 1
+                    continue
+
+                attribute_speeches(speeches, resolver)
+                job = checkpointed_summary_job(meeting_id, stored_speeches(speeches))
+                if queue_batch_requests(meeting_id, job, follow_up, follow_requests):
+                    stats["requeued"] += 1
+                    continue
+            else:
+                # 요약 결과를 speech_order별로 분리해 체크포인트에 모음
+                checkpoint = resume_checkpoint(meeting_id)
+                if not checkpoint:
+                    logger.info(f"  ⏭️  {meeting_id} has no checkpoint (already saved), skipping")
+                    continue
+                job = summary_job(checkpoint["speeches"], checkpoint["summaries"], entry["attempt"])
+                by_order = {s["order"]: s for s in job["speeches"]}
+                for custom_id, request in job_requests.items():
+                    orders = {order for order in request["orders"] if order in by_order}
+                    summaries = parse_summaries(results.get(custom_id) or "", orders)
+                    cache_summaries([by_order[order] for order in orders], summaries)
+                    for order, summary_data in summaries.items():
+                        by_order[order].update(summary_data)
+                update_speech_checkpoint(meeting_id, job_summaries(job))
+
+            missing = [s for s in job["speeches"] if "summary" not in s]
+            if missing and job["attempt"] < SUMMARY_RETRIES and queue_batch_requests(
+                    meeting_id, dict(job, attempt=job["attempt"] + 1), follow_up, follow_requests):
+                logger.warning(f"  🔁 Re-queued {len(missing)} unsummarized speeches of {meeting_id}")
+                stats["requeued"] += 1
+                continue
+            if missing:
+                logger.error(f"  ❌ {len(missing)} speeches of {meeting_id} unsummarized (checkpoint kept)")
+                stats["failed"] += 1
+                continue
+
+            stats["speeches"] += save_batch_job(meeting_id, job)
+            stats["meetings"] += 1
+
+        # 후속 배치를 먼저 기록한 뒤 닫아야 중단되어도 작업이 사라지지 않음
+        submit_pending_batch(follow_up, follow_requests)
+        close_llm_batch(batch_id)
+        stats["batches"] += 1
+
+    return stats
+
+
+def log_cache_stats():
+    """LLM 응답 캐시 적중률 출력"""
+    stats = get_llm_cache().stats()
+    logger.info(f"  💾 LLM cache: {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['hit_rate']:.0%}), {stats['entries']} entries, {stats['bytes'] / 1024:.0f} KB")
+
 
 def main():
     parser = argparse.ArgumentParser(description="Extract speeches from meeting transcripts using AI")
     parser.add_argument("--limit", type=int, help="Number of meetings to process")
     parser.add_argument("--meeting-id", help="Specific meeting ID to process")
     parser.add_argument("--force", action="store_true", help="Re-extract even if already processed")
+    parser.add_argument("--batch", choices=["submit", "poll", "collect"],
+                        help="Offline mode via the Message Batches API: queue pending meetings, "
+                             "show batch status, or ingest finished batches")
 
     args = parser.parse_args()
 
     logger.info("Starting speech extraction...")
     logger.info(f"  Limit: {args.limit if args.limit else 'All'}")
     logger.info(f"  Force re-extract: {args.force}")
+    if args.batch:
+        logger.info(f"  Batch mode: {args.batch}")
 
     try:
-        # 처리할 회의 가져오기
+        if args.batch == "poll":
+            poll_batch_jobs()
+            return
+
+        if args.batch == "collect":
+            resolver = CouncillorResolver.load()
+            stats = collect_batch_jobs(resolver)
+
+            logger.info("=" * 60)
+            logger.info("Batch collection complete!")
+            logger.info(f"  📥 Batches collected: {stats['batches']}")
+            logger.info(f"  ✅ Meetings saved: {stats['meetings']} ({stats['speeches']} speeches)")
+            logger.info(f"  🔁 Meetings re-queued: {stats['requeued']}")
+            logger.info(f"  ❌ Failed: {stats['failed']}")
+            log_cache_stats()
+            logger.info("=" * 60)
+            return
+
+        # 처리할 회의 (목록만 페이지 단위로 가져오고 회의록 전문은 처리할 때 불러옴)
         if args.meeting_id:
             # 특정 회의만 처리
             response = supabase.table("meetings")\
-                .select("id, title, transcript_text")\
+                .select(MEETING_COLUMNS)\
                 .eq("id", args.meeting_id)\
                 .execute()
+            meetings = mark_checkpointed(response.data)
+            total = len(meetings)
         else:
-            # transcript_text가 있는 회의들 가져오기
-            query = supabase.table("meetings")\
-                .select("id, title, transcript_text")\
-                .not_.is_("transcript_text", "null")\
-                .order("created_at", desc=True)
-
+            # transcript_text가 있는 회의들 (--force가 아니면 처리되지 않은 회의만)
+            total = count_meetings(args.force)
             if args.limit:
-                query = query.limit(args.limit)
+                total = min(total, args.limit)
+            meetings = iter_meetings(args.force, args.limit)
 
-            response = query.execute()
-
-        meetings = response.data
-
-        if not meetings:
+        if not total:
             logger.warning("No meetings found to process")
             return
 
-        logger.info(f"Found {len(meetings)} meetings to process\n")
+        logger.info(f"Found {total} meetings to process\n")
+
+        # 의원 명단은 실행당 한 번만 로드
+        resolver = CouncillorResolver.load()
+
+        if args.batch == "submit":
+            submit_batch_jobs(meetings, resolver)
+            log_cache_stats()
+            return
 
         # 통계
         success_count = 0
@@ -380,10 +1429,10 @@ def main():
 
         # 각 회의 처리
         for i, meeting in enumerate(meetings, 1):
-            logger.info(f"[{i}/{len(meetings)}] {meeting['title']}")
+            logger.info(f"[{i}/{total}] {meeting['title']}")
 
             try:
-                if process_meeting(meeting, args.force):
+                if process_meeting(meeting, resolver, args.force):
                     success_count += 1
                 else:
                     error_count += 1
@@ -398,7 +1447,9 @@ def main():
         logger.info("Extraction complete!")
         logger.info(f"  ✅ Success: {success_count}")
         logger.info(f"  ❌ Errors: {error_count}")
-        logger.info(f"  📊 Total: {len(meetings)}")
+        logger.info(f"  📊 Total: {success_count + error_count}")
+        logger.info(f"  👤 Speakers matched: {resolver.hits} (fuzzy: {resolver.fuzzy_hits}), unmatched: {resolver.misses}")
+        log_cache_stats()
         logger.info("=" * 60)
 
     except Exception as e:
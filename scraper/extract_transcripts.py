@@ -5,12 +5,14 @@ Phase 2 準備: 회의록 전문 텍스트 추출
 
 Usage:
     python extract_transcripts.py --limit 10
+    python extract_transcripts.py --concurrency 8
 """
 import argparse
 import logging
-import time
-from scrapers.meetings import scrape_transcript_text
+from scrapers.meetings import parse_transcript_html
 from utils.db import get_supabase_client
+from utils.fetcher import fetch_all
+from utils.ratecontrol import get_rate_controller
 
 logging.basicConfig(
     level=logging.INFO,
@@ -19,18 +21,20 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def extract_all_transcripts(limit=None, force=False):
+def extract_all_transcripts(limit=None, force=False, concurrency=None):
     """
     Extract full transcript text for all meetings that don't have it yet
 
     Args:
         limit: Maximum number of transcripts to extract (None = all)
         force: Re-extract even if transcript_text already exists
+        concurrency: Max in-flight requests (None = config.FETCH_CONCURRENCY);
+            the per-host rate is set by the adaptive rate controller (RATE_MAX)
     """
     supabase = get_supabase_client()
 
     # Query meetings without transcript text
-    query = supabase.from_('meetings').select('id, title, transcript_url, transcript_text')
+    query = supabase.from_('meetings').select('id, title, transcript_url')
 
     if not force:
         query = query.is_('transcript_text', 'null')
@@ -47,53 +51,45 @@ def extract_all_transcripts(limit=None, force=False):
 
     logger.info(f"Found {len(meetings)} meetings to process")
 
-    success_count = 0
-    error_count = 0
-
-    for i, meeting in enumerate(meetings, 1):
-        meeting_id = meeting['id']
-        title = meeting['title']
-        transcript_url = meeting['transcript_url']
-
-        logger.info(f"[{i}/{len(meetings)}] Processing: {title}")
-
-        if not transcript_url:
-            logger.warning(f"  ⚠️ No transcript URL for: {title}")
-            error_count += 1
-            continue
-
-        try:
-            # Extract transcript text
-            logger.info(f"  📄 Fetching from: {transcript_url}")
-            transcript_text = scrape_transcript_text(transcript_url)
-
-            if not transcript_text:
-                logger.warning(f"  ⚠️ No text extracted from: {transcript_url}")
-                error_count += 1
-                continue
-
-            # Update database
-            supabase.from_('meetings').update({
-                'transcript_text': transcript_text
-            }).eq('id', meeting_id).execute()
-
-            logger.info(f"  ✅ Extracted {len(transcript_text)} characters")
-            success_count += 1
-
-            # Rate limiting
-            time.sleep(2)  # 2초 대기 (서버 부하 방지)
+    for meeting in meetings:
+        if not meeting['transcript_url']:
+            logger.warning(f"  ⚠️ No transcript URL for: {meeting['title']}")
+
+    def save_transcript(meeting, transcript_text):
+        # Called as soon as each transcript is parsed
+        if not transcript_text:
+            logger.warning(f"  ⚠️ No text extracted from: {meeting['transcript_url']}")
+            return False
+
+        supabase.from_('meetings').update({
+            'transcript_text': transcript_text
+        }).eq('id', meeting['id']).execute()
+
+        logger.info(f"  ✅ {meeting['title']}: {len(transcript_text)} characters")
+        return True
+
+    stats = fetch_all(
+        meetings,
+        get_url=lambda m: m['transcript_url'],
+        parse=parse_transcript_html,
+        store=save_transcript,
+        concurrency=concurrency,
+        # On re-extraction, pages unchanged since the last fetch skip parsing and the DB write
+        use_cache=force,
+    )
 
-        except Exception as e:
-            logger.error(f"  ❌ Error processing {title}: {e}")
-            error_count += 1
-            continue
+    error_count = stats['errors'] + stats['empty'] + stats['skipped']
 
     logger.info("=" * 60)
     logger.info(f"Extraction complete!")
-    logger.info(f"  ✅ Success: {success_count}")
+    logger.info(f"  ✅ Success: {stats['success']}")
+    if force:
+        logger.info(f"  ⏭️ Unchanged: {stats['unchanged']}")
     logger.info(f"  ❌ Errors: {error_count}")
     logger.info(f"  📊 Total: {len(meetings)}")
+    logger.info(f"  ⏱️ Elapsed: {stats['seconds']:.1f}s")
     logger.info("=" * 60)
+    get_rate_controller().log_stats()
 
 
 def main():
@@ -109,6 +105,12 @@ def main():
         action='store_true',
         help='Re-extract even if transcript already exists'
     )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=None,
+        help='Maximum concurrent requests (default: FETCH_CONCURRENCY)'
+    )
 
     args = parser.parse_args()
 
@@ -116,7 +118,8 @@ def main():
     logger.info(f"  Limit: {args.limit if args.limit else 'No limit'}")
     logger.info(f"  Force re-extract: {args.force}")
 
-    extract_all_transcripts(limit=args.limit, force=args.force)
+    extract_all_transcripts(limit=args.limit, force=args.force,
+                            concurrency=args.concurrency)
 
 
 if __name__ == "__main__":
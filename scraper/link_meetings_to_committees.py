@@ -3,6 +3,7 @@
 Link existing meetings to their committees
 """
 from utils.db import get_supabase_client
+from utils.scan import scan_table
 import logging
 import re
 
@@ -16,20 +17,16 @@ def link_meetings_to_committees():
     client = get_supabase_client()
 
     # Get all committees
-    committees_response = client.table('committees').select('id, name').execute()
-    committees = {c['name']: c['id'] for c in committees_response.data}
+    committees = {c.name: c.id for c in scan_table('committees', ['name'])}
 
     logger.info(f"Found {len(committees)} committees")
 
-    # Get all meetings
-    meetings_response = client.table('meetings').select('id, title, meeting_type').execute()
-    meetings = meetings_response.data
-
-    logger.info(f"Found {len(meetings)} meetings")
-
+    # Stream all meetings
     updated_count = 0
-    for meeting in meetings:
-        title = meeting.get('title', '')
+    meeting_count = 0
+    for meeting in scan_table('meetings', ['title']):
+        meeting_count += 1
+        title = meeting.title or ''
 
         # Find which committee this meeting belongs to
         committee_id = None
@@ -43,7 +40,7 @@ def link_meetings_to_committees():
                 # Update meeting with committee_id
                 client.table('meetings').update({
                     'committee_id': committee_id
-                }).eq('id', meeting['id']).execute()
+                }).eq('id', meeting.id).execute()
 
                 logger.info(f"✓ Linked: {title[:50]}... → {committee_name}")
                 updated_count += 1
@@ -53,7 +50,7 @@ def link_meetings_to_committees():
             logger.debug(f"  No committee found for: {title}")
 
     logger.info(f"\n=== Linking complete ===")
-    logger.info(f"Linked {updated_count}/{len(meetings)} meetings to committees")
+    logger.info(f"Linked {updated_count}/{meeting_count} meetings to committees")
 
 if __name__ == "__main__":
     link_meetings_to_committees()
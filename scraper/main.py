@@ -4,6 +4,7 @@ Main entry point for Yongin Council data scraping pipeline
 import logging
 import argparse
 from scrapers import councillors, meetings, bills
+import reparse
 
 logging.basicConfig(
     level=logging.INFO,
@@ -11,19 +12,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def run_all():
-    """Run all scrapers"""
+def run_all(full=False, max_pages=3):
+    """
+    Run all scrapers
+
+    Args:
+        full: Ignore high-water marks and cached pages, crawl max_pages of each listing
+        max_pages: Listing depth for full (backfill) runs
+    """
     logger.info("Starting full scraping pipeline...")
 
     try:
         logger.info("=== Phase 1: Scraping Councillors ===")
-        councillors.run()
+        councillors.run(full=full)
 
         logger.info("=== Phase 2: Scraping Meetings ===")
-        meetings.run()
+        meetings.run(full=full, max_pages=max_pages)
 
         logger.info("=== Phase 3: Scraping Bills ===")
-        bills.run()
+        bills.run(full=full, max_pages=max_pages)
 
         logger.info("Scraping pipeline completed successfully!")
 
@@ -39,17 +46,40 @@ def main():
         default='all',
         help='Target to scrape'
     )
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Ignore high-water marks and cached pages, crawl --max-pages of each listing (backfill)'
+    )
+    parser.add_argument(
+        '--max-pages',
+        type=int,
+        default=3,
+        help='Listing pages to crawl in full mode (default: 3)'
+    )
+    parser.add_argument(
+        '--reparse',
+        action='store_true',
+        help='Rebuild records from the raw page archive instead of crawling'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='With --reparse: parse and count only, no DB writes'
+    )
 
     args = parser.parse_args()
 
-    if args.target == 'all':
-        run_all()
+    if args.reparse:
+        reparse.run(target=args.target, dry_run=args.dry_run)
+    elif args.target == 'all':
+        run_all(full=args.full, max_pages=args.max_pages)
     elif args.target == 'councillors':
-        councillors.run()
+        councillors.run(full=args.full)
     elif args.target == 'meetings':
-        meetings.run()
+        meetings.run(full=args.full, max_pages=args.max_pages)
     elif args.target == 'bills':
-        bills.run()
+        bills.run(full=args.full, max_pages=args.max_pages)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Merge duplicate councillors into one survivor each
+
+The survivor map is computed from one scan of councillors and applied by the
+merge_councillors() database function: every referencing table (bills,
+speeches, subscriptions, votes, bill_cosponsors, councillor_committees,
+investigation_councillors) is re-pointed in one transaction, then the
+duplicates are deleted.
+
+Usage:
+    python merge_councillors.py --dry-run     # show the diff, write nothing
+    python merge_councillors.py
+
+Duplicates share a name: (name, term_number) is unique, so re-scraped rows
+differ in term_number (NULL on legacy rows, or an earlier term) and are
+found by name alone.
+"""
+import argparse
+import logging
+import sys
+from utils.db import get_supabase_client
+from utils.merge import survivor_map, plan_merge, apply_merge, COUNCILLOR_REFERENCES
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+
+def log_counts(counts: dict):
+    """Per-table row counts of a merge (planned or applied)"""
+    logger.info(f"  {'table':<28}{'moved':>8}{'dropped':>9}")
+    for table, _, _ in COUNCILLOR_REFERENCES:
+        c = counts.get(table, {})
+        logger.info(f"  {table:<28}{c.get('moved', 0):>8}{c.get('dropped', 0):>9}")
+    logger.info(f"  councillors deleted: {counts.get('councillors', {}).get('deleted', 0)}")
+
+
+def merge_councillors(dry_run=False) -> dict:
+    """
+    Merge duplicate councillors (same name)
+
+    Args:
+        dry_run: Only report what would change
+
+    Returns:
+        Planned (dry_run) or applied row counts per table
+    """
+    merges, groups = survivor_map(('name',))
+
+    if not merges:
+        logger.info("No duplicates remaining!")
+        return {}
+
+    logger.info(f"Found {len(groups)} councillors with {len(merges)} duplicates")
+    for survivor, group in groups.items():
+        head = group[0]
+        logger.info(f"\n{head.name}")
+        logger.info(f"  keep   {survivor} (created {head.created_at})")
+        for c in group[1:]:
+            logger.info(f"  merge  {c.id} (created {c.created_at})")
+
+    if dry_run:
+        counts = plan_merge(merges)
+        logger.info("\n=== DRY RUN: planned changes ===")
+        log_counts(counts)
+        return counts
+
+    counts = apply_merge(merges)
+    logger.info("\n=== COMPLETE ===")
+    log_counts(counts)
+
+    response = get_supabase_client().table('councillors').select('id', count='exact', head=True).execute()
+    logger.info(f"Final count: {response.count} councillors")
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Merge duplicate councillors')
+    parser.add_argument('--dry-run', action='store_true', help='Show the planned changes without writing')
+    args = parser.parse_args()
+    merge_councillors(dry_run=args.dry_run)
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Rebuild scraped records from the raw page archive without re-crawling
+
+Every archived snapshot is parsed once (in a process pool) with the current
+extractors, so parser fixes can be applied to history in seconds.
+
+Usage:
+    python main.py --reparse
+    python main.py --reparse --target meetings --dry-run
+"""
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from config import COUNCIL_BASE_URL
+from scrapers.councillors import parse_councillors_page
+from scrapers.meetings import parse_meetings_page, parse_transcript_html
+from scrapers.bills import parse_bills_page, resolve_proposers
+from utils.archive import get_archive
+from utils.db import get_supabase_client, upsert_councillors, upsert_meetings, upsert_bills
+from utils.http import extract_uid
+
+logger = logging.getLogger(__name__)
+
+# Archive URL prefix and natural key of each listing
+LISTINGS = {
+    'councillors': (f"{COUNCIL_BASE_URL}/kr/member/name.do", 'name'),
+    'meetings': (f"{COUNCIL_BASE_URL}/kr/minutes/late.do", 'transcript_uid'),
+    'bills': (f"{COUNCIL_BASE_URL}/kr/bill.do", 'bill_number'),
+}
+TRANSCRIPTS_PREFIX = f"{COUNCIL_BASE_URL}/viewer/minutes.do"
+
+
+def _parse_snapshot(job):
+    """Process pool worker: (kind, sha256) -> parsed records or transcript text"""
+    kind, sha256 = job
+    html = get_archive().load(sha256).decode('utf-8', errors='replace')
+
+    if kind == 'transcripts':
+        return parse_transcript_html(html)
+
+    if kind == 'councillors':
+        result = parse_councillors_page(html)
+        return result[0] if result else []
+    if kind == 'meetings':
+        return parse_meetings_page(html) or []
+    return parse_bills_page(html) or []
+
+
+def _parse_all(kind, snapshots, pool):
+    """Parse each distinct body once; returns {sha256: result}"""
+    shas = list(dict.fromkeys(sha for _, _, sha in snapshots))
+    results = pool.map(_parse_snapshot, [(kind, sha) for sha in shas], chunksize=8)
+    return dict(zip(shas, results))
+
+
+def reparse_listing(kind, pool, dry_run=False) -> int:
+    """
+    Re-derive one listing from every archived snapshot of its pages
+
+    Rows that appear in several snapshots keep the version from the newest one.
+
+    Returns:
+        Number of records rebuilt
+    """
+    prefix, key = LISTINGS[kind]
+    snapshots = get_archive().snapshots(prefix)
+    if not snapshots:
+        logger.info(f"No archived {kind} pages")
+        return 0
+
+    parsed = _parse_all(kind, snapshots, pool)
+
+    # snapshots are oldest first, so newer versions overwrite older ones
+    records = {}
+    for _, _, sha in snapshots:
+        for record in parsed[sha]:
+            if record.get(key):
+                records[record[key]] = record
+    records = list(records.values())
+
+    logger.info(f"Rebuilt {len(records)} {kind} from {len(snapshots)} archived pages")
+    if dry_run or not records:
+        return len(records)
+
+    # Matched to stored rows by natural key; only changed rows are written
+    if kind == 'councillors':
+        upsert_councillors(records)
+    elif kind == 'meetings':
+        upsert_meetings(records)
+    else:
+        upsert_bills(resolve_proposers(records))
+    return len(records)
+
+
+def reparse_transcripts(pool, dry_run=False) -> int:
+    """
+    Re-derive meetings.transcript_text from the newest archived transcript pages
+
+    Returns:
+        Number of transcripts rebuilt
+    """
+    snapshots = get_archive().latest(TRANSCRIPTS_PREFIX)
+    if not snapshots:
+        logger.info("No archived transcript pages")
+        return 0
+
+    parsed = _parse_all('transcripts', snapshots, pool)
+    texts = {url: parsed[sha] for url, _, sha in snapshots if parsed[sha]}
+
+    logger.info(f"Rebuilt {len(texts)} transcripts from {len(snapshots)} archived pages")
+    if dry_run:
+        return len(texts)
+
+    client = get_supabase_client()
+
+    def save(item):
+        url, text = item
+        uid = extract_uid(url)
+        if uid is not None:
+            client.table('meetings').update({'transcript_text': text}).eq('transcript_uid', uid).execute()
+
+    with ThreadPoolExecutor(max_workers=8) as io_pool:
+        list(io_pool.map(save, texts.items()))
+    return len(texts)
+
+
+def run(target='all', dry_run=False):
+    """
+    Rebuild records for target from the archive
+
+    Args:
+        target: 'all', 'councillors', 'meetings' (listing + transcripts) or 'bills'
+        dry_run: Parse and count only, no DB writes
+    """
+    start = time.monotonic()
+    kinds = list(LISTINGS) if target == 'all' else [target]
+
+    with ProcessPoolExecutor() as pool:
+        for kind in kinds:
+            reparse_listing(kind, pool, dry_run)
+        if 'meetings' in kinds:
+            reparse_transcripts(pool, dry_run)
+
+    logger.info(f"Reparse complete in {time.monotonic() - start:.1f}s{' (dry run)' if dry_run else ''}")
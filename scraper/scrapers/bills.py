@@ -3,23 +3,35 @@
 Scraper for Yongin Council bill information
 """
 import requests
-from bs4 import BeautifulSoup
 import logging
-import time
-import re
 from datetime import datetime
-from config import COUNCIL_BASE_URL, REQUEST_TIMEOUT, REQUEST_DELAY, USER_AGENT
-from utils.db import upsert_bills, get_councillor_by_name
+from config import COUNCIL_BASE_URL, INCREMENTAL_MAX_PAGES
+from utils.htmlparse import parse_scoped
+from utils.http import fetch
+from utils.httpcache import get_response_cache
+from utils.ratecontrol import get_rate_controller
+from utils.db import upsert_bills, get_high_water_mark, set_high_water_mark
+from utils.resolver import CouncillorResolver
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def scrape_bills(max_pages=3):
+def scrape_bills(max_pages=3, high_water_date=None, if_changed=False):
     """
     Scrape bill information from Yongin Council website
 
     Args:
         max_pages: Maximum number of pages to scrape (default: 3)
+        high_water_date: Crawl incrementally: stop on the first page whose bills
+            are all dated at or before this date (crawl_state.high_water_date).
+            The listing is sorted by date, so the pages after it hold only older
+            rows. A late upload on a page that was read is still returned (the
+            upsert skips the unchanged rows around it); one further down is
+            picked up by a full run.
+        if_changed: Revalidate pages against the response cache; a page that has
+            not changed since the last run is not parsed. In an incremental crawl
+            it ends the crawl: the run that cached it saved its rows and then
+            advanced the mark past them
 
     Returns:
         List of bill dictionaries
@@ -27,7 +39,6 @@ def scrape_bills(max_pages=3):
     url = f"{COUNCIL_BASE_URL}/kr/bill.do"
     logger.info(f"Scraping bills from {url}")
 
-    headers = {'User-Agent': USER_AGENT}
     bills = []
 
     try:
@@ -35,43 +46,29 @@ def scrape_bills(max_pages=3):
             page_url = f"{url}?page={page}"
             logger.info(f"Fetching page {page}: {page_url}")
 
-            response = requests.get(page_url, headers=headers, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
+            response = fetch(page_url, use_cache=if_changed)
+            if response.not_modified:
+                # Its rows were saved, and the mark advanced past them, by the run that cached it
+                logger.info(f"Page {page} unchanged since last run")
+                if high_water_date is not None:
+                    break
+                continue
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Find the table with classes "board_list" and "bbs_bill"
-            table = soup.find('table', class_='board_list')
-            if not table:
+            page_items = parse_bills_page(response.text)
+            if page_items is None:
                 logger.warning(f"No bills table found on page {page}")
                 break
 
-            # Find all data rows (skip header)
-            rows = table.find_all('tr')[1:]  # Skip header row
-
-            if not rows:
-                logger.warning(f"No bill rows found on page {page}")
+            if not page_items:
                 break
 
-            page_bills = 0
-            for row in rows:
-                try:
-                    bill = extract_bill_info(row)
-                    if bill and bill.get('title'):
-                        bills.append(bill)
-                        page_bills += 1
-                        logger.info(f"Found: {bill['title'][:50]}... ({bill.get('proposal_date', 'N/A')})")
-                except Exception as e:
-                    logger.warning(f"Error parsing bill row: {e}")
-                    continue
-
-            logger.info(f"Page {page}: Found {page_bills} bills")
-
-            if page_bills == 0:
-                break
+            bills.extend(page_items)
+            logger.info(f"Page {page}: Found {len(page_items)} bills")
 
-            time.sleep(REQUEST_DELAY)
+            if high_water_date is not None and all(
+                    b.get('proposal_date') and b['proposal_date'] <= high_water_date for b in page_items):
+                logger.info(f"Page {page} is at or before the high-water mark ({high_water_date}), stopping")
+                break
 
         logger.info(f"Total bills scraped: {len(bills)}")
         return bills
@@ -83,6 +80,40 @@ def scrape_bills(max_pages=3):
         logger.error(f"Error parsing bills data: {e}")
         raise
 
+def parse_bills_page(html, backend=None):
+    """
+    Parse one bill listing page
+
+    Args:
+        html: Listing page HTML
+        backend: HTML parser backend (default: config.HTML_PARSER)
+
+    Returns:
+        List of bills, or None if the page has no bills table
+    """
+    soup = parse_scoped(html, 'table', class_='board_list', backend=backend)
+
+    # Find the table with classes "board_list" and "bbs_bill"
+    table = soup.find('table', class_='board_list')
+    if not table:
+        return None
+
+    # Find all data rows (skip header)
+    rows = table.find_all('tr')[1:]  # Skip header row
+
+    bills = []
+    for row in rows:
+        try:
+            bill = extract_bill_info(row)
+            if bill and bill.get('title'):
+                bills.append(bill)
+                logger.info(f"Found: {bill['title'][:50]}... ({bill.get('proposal_date', 'N/A')})")
+        except Exception as e:
+            logger.warning(f"Error parsing bill row: {e}")
+            continue
+
+    return bills
+
 def extract_bill_info(row):
     """
     Extract bill information from table row
@@ -139,22 +170,10 @@ def extract_bill_info(row):
     else:
         bill['bill_type'] = '기타'
 
-    # Cell 2: 발의자 (proposer)
+    # Cell 2: 발의자 (proposer) - resolved to proposer_id in bulk by resolve_proposers()
     proposer_text = cells[2].get_text().strip()
-
-    # Try to find proposer in database
     if proposer_text:
-        # Extract just the name (remove titles like "의원 외 10인")
-        proposer_match = re.match(r'([가-힣]{2,4})', proposer_text)
-        if proposer_match:
-            proposer_name = proposer_match.group(1)
-            try:
-                proposer = get_councillor_by_name(proposer_name)
-                if proposer:
-                    bill['proposer_id'] = proposer['id']
-                    logger.debug(f"Found proposer: {proposer_name}")
-            except Exception as e:
-                logger.debug(f"Could not find proposer {proposer_name}: {e}")
+        bill['proposer_name'] = proposer_text
 
     # Cell 3: 제출일자 (proposal_date)
     date_text = cells[3].get_text().strip()
@@ -171,21 +190,73 @@ def extract_bill_info(row):
 
     return bill
 
-def run():
-    """Main function to scrape and save bill data"""
+def resolve_proposers(bills, resolver=None):
+    """
+    Replace each bill's proposer_name (e.g. "홍길동 의원 외 10인") with proposer_id
+
+    Args:
+        bills: Bill dictionaries from parse_bills_page (modified in place)
+        resolver: CouncillorResolver (default: load one from the councillors table)
+
+    Returns:
+        The same list, ready to upsert
+    """
+    names = [bill.get('proposer_name') for bill in bills]
+    if any(names):
+        resolver = resolver or CouncillorResolver.load()
+        resolved = resolver.resolve_many(names)
+    else:
+        resolved = {}
+
+    for bill in bills:
+        proposer_id = resolved.get(bill.pop('proposer_name', None))
+        if proposer_id:
+            bill['proposer_id'] = proposer_id
+
+    unresolved = [name for name, proposer_id in resolved.items() if not proposer_id]
+    if unresolved:
+        logger.debug(f"Unresolved proposers: {unresolved}")
+    logger.info(f"Resolved {len(resolved) - len(unresolved)}/{len(resolved)} distinct proposers")
+    return bills
+
+def run(full=False, max_pages=3):
+    """
+    Main function to scrape and save bill data
+
+    Args:
+        full: Crawl max_pages regardless of what is stored (backfill mode)
+        max_pages: Pages to crawl in full mode or when the listing was never crawled
+    """
     try:
-        # Scrape first 3 pages (about 30 recent bills)
-        bills = scrape_bills(max_pages=3)
+        stored_date = get_high_water_mark('bills')
+
+        if full or stored_date is None:
+            # Full depth: first 3 pages by default (about 30 recent bills)
+            bills = scrape_bills(max_pages=max_pages)
+        else:
+            # Incremental: page down to the stored date mark, usually one request
+            bills = scrape_bills(max_pages=INCREMENTAL_MAX_PAGES, high_water_date=stored_date,
+                                 if_changed=True)
 
         if bills:
-            upsert_bills(bills)
-            logger.info(f"Successfully scraped and saved {len(bills)} bills")
+            stats = upsert_bills(resolve_proposers(bills))
+            logger.info(f"Successfully scraped {len(bills)} bills "
+                        f"({stats['inserted']} new, {stats['updated']} changed, {stats['skipped']} unchanged)")
         else:
-            logger.warning("No bill data scraped")
+            logger.info("No new bill data scraped")
+
+        # Advance the mark (newest date, the listing's sort key) only after the rows are saved
+        dates = [bill['proposal_date'] for bill in bills if bill.get('proposal_date')]
+        if dates and (stored_date is None or max(dates) > stored_date):
+            set_high_water_mark('bills', max(dates))
 
     except Exception as e:
+        # Forget cached pages so the next run does not skip them as unchanged
+        get_response_cache().discard_prefix(f"{COUNCIL_BASE_URL}/kr/bill.do")
         logger.error(f"Failed to scrape bills: {e}")
         raise
+    finally:
+        get_rate_controller().log_stats()
 
 if __name__ == "__main__":
     run()
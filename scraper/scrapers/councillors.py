@@ -3,27 +3,33 @@
 Scraper for Yongin Council councillor information
 """
 import requests
-from bs4 import BeautifulSoup
 import logging
-import time
 import re
-from config import COUNCIL_BASE_URL, REQUEST_TIMEOUT, REQUEST_DELAY, USER_AGENT
+from config import COUNCIL_BASE_URL
+from utils.htmlparse import parse_scoped
+from utils.http import fetch
+from utils.httpcache import get_response_cache
+from utils.ratecontrol import get_rate_controller
 from utils.db import upsert_councillors
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def scrape_councillors():
+def scrape_councillors(if_changed=False):
     """
     Scrape councillor information from Yongin Council website
 
+    Args:
+        if_changed: Revalidate pages against the response cache and leave out the
+            councillors of pages that have not changed since the last run (later
+            pages are still checked)
+
     Returns:
-        List of councillor dictionaries
+        List of councillor dictionaries (empty if nothing changed)
     """
     url = f"{COUNCIL_BASE_URL}/kr/member/name.do"
     logger.info(f"Scraping councillors from {url}")
 
-    headers = {'User-Agent': USER_AGENT}
     councillors = []
 
     try:
@@ -33,44 +39,28 @@ def scrape_councillors():
             page_url = f"{url}?page={page}"
             logger.info(f"Fetching page {page}: {page_url}")
 
-            response = requests.get(page_url, headers=headers, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
-
-            soup = BeautifulSoup(response.text, 'html.parser')
+            response = fetch(page_url, use_cache=if_changed)
 
-            # Find all councillor profile blocks
-            # Each councillor is in a <div class="profile"> element
-            # Include both visible (class="profile") and hidden (class="profile none")
-            councillor_blocks = soup.find_all('div', class_='profile')
-
-            if not councillor_blocks:
+            # An unchanged page (body served from the cache) is still parsed for its pager
+            page_result = parse_councillors_page(response.text)
+            if page_result is None:
                 logger.warning(f"No councillor blocks found on page {page}")
                 break
 
-            logger.info(f"Found {len(councillor_blocks)} profile blocks on page {page}")
-
-            page_councillors = 0
-            for block in councillor_blocks:
-                try:
-                    councillor = extract_councillor_info(block)
-                    if councillor and councillor.get('name'):
-                        councillors.append(councillor)
-                        page_councillors += 1
-                        logger.info(f"Found: {councillor['name']} ({councillor.get('party', 'N/A')})")
-                except Exception as e:
-                    logger.warning(f"Error parsing councillor block: {e}")
-                    continue
+            page_items, has_next = page_result
+            page_councillors = len(page_items)
 
-            logger.info(f"Page {page}: Found {page_councillors} councillors")
+            if response.not_modified:
+                logger.info(f"Page {page} unchanged since last run, skipping its {page_councillors} councillors")
+            else:
+                councillors.extend(page_items)
+                logger.info(f"Page {page}: Found {page_councillors} councillors")
 
             # Check if there's a next page
-            next_page = soup.find('a', string=lambda text: text and ('다음' in text or 'next' in text.lower()))
-            if not next_page or page_councillors == 0:
+            if not has_next or page_councillors == 0:
                 break
 
             page += 1
-            time.sleep(REQUEST_DELAY)
 
         logger.info(f"Total councillors scraped: {len(councillors)}")
         return councillors
@@ -82,6 +72,47 @@ def scrape_councillors():
         logger.error(f"Error parsing councillors data: {e}")
         raise
 
+def parse_councillors_page(html, backend=None):
+    """
+    Parse one councillor listing page
+
+    Args:
+        html: Listing page HTML
+        backend: HTML parser backend (default: config.HTML_PARSER)
+
+    Returns:
+        (councillors, has_next) tuple, or None if the page has no profile blocks
+    """
+    soup = parse_scoped(html, 'div', class_='profile', backend=backend)
+
+    # Find all councillor profile blocks
+    # Each councillor is in a <div class="profile"> element
+    # Include both visible (class="profile") and hidden (class="profile none")
+    councillor_blocks = soup.find_all('div', class_='profile')
+
+    if not councillor_blocks:
+        return None
+
+    logger.info(f"Found {len(councillor_blocks)} profile blocks")
+
+    councillors = []
+    for block in councillor_blocks:
+        try:
+            councillor = extract_councillor_info(block)
+            if councillor and councillor.get('name'):
+                councillors.append(councillor)
+                logger.info(f"Found: {councillor['name']} ({councillor.get('party', 'N/A')})")
+        except Exception as e:
+            logger.warning(f"Error parsing councillor block: {e}")
+            continue
+
+    # The pager is outside the profile blocks; only parse links if a next label can exist
+    next_page = None
+    if '다음' in html or 'next' in html.lower():
+        links = parse_scoped(html, 'a', backend=backend)
+        next_page = links.find('a', string=lambda text: text and ('다음' in text or 'next' in text.lower()))
+    return councillors, next_page is not None
+
 def extract_councillor_info(block):
     """
     Extract councillor information from HTML block
@@ -179,20 +210,30 @@ def extract_councillor_info(block):
 
     return councillor
 
-def run():
-    """Main function to scrape and save councillor data"""
+def run(full=False):
+    """
+    Main function to scrape and save councillor data
+
+    Args:
+        full: Re-scrape even if the profile pages are unchanged
+    """
     try:
-        councillors = scrape_councillors()
+        councillors = scrape_councillors(if_changed=not full)
 
         if councillors:
-            upsert_councillors(councillors)
-            logger.info(f"Successfully scraped and saved {len(councillors)} councillors")
+            stats = upsert_councillors(councillors)
+            logger.info(f"Successfully scraped {len(councillors)} councillors "
+                        f"({stats['inserted']} new, {stats['updated']} changed, {stats['skipped']} unchanged)")
         else:
-            logger.warning("No councillor data scraped")
+            logger.info("No councillor changes to save")
 
     except Exception as e:
+        # Forget cached pages so the next run does not skip them as unchanged
+        get_response_cache().discard_prefix(f"{COUNCIL_BASE_URL}/kr/member/name.do")
         logger.error(f"Failed to scrape councillors: {e}")
         raise
+    finally:
+        get_rate_controller().log_stats()
 
 if __name__ == "__main__":
     run()
@@ -3,23 +3,35 @@
 Scraper for Yongin Council meeting transcripts
 """
 import requests
-from bs4 import BeautifulSoup
 import logging
-import time
 import re
 from datetime import datetime
-from config import COUNCIL_BASE_URL, REQUEST_TIMEOUT, REQUEST_DELAY, USER_AGENT
-from utils.db import upsert_meetings
+from config import COUNCIL_BASE_URL, INCREMENTAL_MAX_PAGES
+from utils.htmlparse import parse_scoped
+from utils.http import fetch, extract_uid
+from utils.httpcache import get_response_cache
+from utils.ratecontrol import get_rate_controller
+from utils.db import upsert_meetings, get_high_water_mark, set_high_water_mark
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def scrape_meetings(max_pages=5):
+def scrape_meetings(max_pages=5, high_water_date=None, if_changed=False):
     """
     Scrape meeting information from Yongin Council website
 
     Args:
         max_pages: Maximum number of pages to scrape (default: 5)
+        high_water_date: Crawl incrementally: stop on the first page whose meetings
+            are all dated at or before this date (crawl_state.high_water_date).
+            The listing is sorted by date, so the pages after it hold only older
+            rows. A late upload on a page that was read is still returned (the
+            upsert skips the unchanged rows around it); one further down is
+            picked up by a full run.
+        if_changed: Revalidate pages against the response cache; a page that has
+            not changed since the last run is not parsed. In an incremental crawl
+            it ends the crawl: the run that cached it saved its rows and then
+            advanced the mark past them
 
     Returns:
         List of meeting dictionaries
@@ -27,7 +39,6 @@ def scrape_meetings(max_pages=5):
     url = f"{COUNCIL_BASE_URL}/kr/minutes/late.do"
     logger.info(f"Scraping meetings from {url}")
 
-    headers = {'User-Agent': USER_AGENT}
     meetings = []
 
     try:
@@ -35,45 +46,31 @@ def scrape_meetings(max_pages=5):
             page_url = f"{url}?page={page}"
             logger.info(f"Fetching page {page}: {page_url}")
 
-            response = requests.get(page_url, headers=headers, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
+            response = fetch(page_url, use_cache=if_changed)
+            if response.not_modified:
+                # Its rows were saved, and the mark advanced past them, by the run that cached it
+                logger.info(f"Page {page} unchanged since last run")
+                if high_water_date is not None:
+                    break
+                continue
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Find the table with class "normal_list"
-            table = soup.find('table', class_='normal_list')
-            if not table:
+            page_items = parse_meetings_page(response.text)
+            if page_items is None:
                 logger.warning(f"No meeting table found on page {page}")
                 break
 
-            # Find all data rows (skip header)
-            rows = table.find_all('tr')[1:]  # Skip header row
-
-            if not rows:
-                logger.warning(f"No meeting rows found on page {page}")
+            # Check if there's a next page
+            if not page_items:
                 break
 
-            page_meetings = 0
-            for row in rows:
-                try:
-                    meeting = extract_meeting_info(row)
-                    if meeting and meeting.get('title'):
-                        meetings.append(meeting)
-                        page_meetings += 1
-                        logger.info(f"Found: {meeting['title']} ({meeting.get('meeting_date', 'N/A')})")
-                except Exception as e:
-                    logger.warning(f"Error parsing meeting row: {e}")
-                    continue
+            meetings.extend(page_items)
+            logger.info(f"Page {page}: Found {len(page_items)} meetings")
 
-            logger.info(f"Page {page}: Found {page_meetings} meetings")
-
-            # Check if there's a next page
-            if page_meetings == 0:
+            if high_water_date is not None and all(
+                    m.get('meeting_date') and m['meeting_date'] <= high_water_date for m in page_items):
+                logger.info(f"Page {page} is at or before the high-water mark ({high_water_date}), stopping")
                 break
 
-            time.sleep(REQUEST_DELAY)
-
         logger.info(f"Total meetings scraped: {len(meetings)}")
         return meetings
 
@@ -84,6 +81,40 @@ def scrape_meetings(max_pages=5):
         logger.error(f"Error parsing meetings data: {e}")
         raise
 
+def parse_meetings_page(html, backend=None):
+    """
+    Parse one meeting listing page
+
+    Args:
+        html: Listing page HTML
+        backend: HTML parser backend (default: config.HTML_PARSER)
+
+    Returns:
+        List of meetings, or None if the page has no meeting table
+    """
+    soup = parse_scoped(html, 'table', class_='normal_list', backend=backend)
+
+    # Find the table with class "normal_list"
+    table = soup.find('table', class_='normal_list')
+    if not table:
+        return None
+
+    # Find all data rows (skip header)
+    rows = table.find_all('tr')[1:]  # Skip header row
+
+    meetings = []
+    for row in rows:
+        try:
+            meeting = extract_meeting_info(row)
+            if meeting and meeting.get('title'):
+                meetings.append(meeting)
+                logger.info(f"Found: {meeting['title']} ({meeting.get('meeting_date', 'N/A')})")
+        except Exception as e:
+            logger.warning(f"Error parsing meeting row: {e}")
+            continue
+
+    return meetings
+
 def extract_meeting_info(row):
     """
     Extract meeting information from table row
@@ -139,6 +170,8 @@ def extract_meeting_info(row):
                 meeting['transcript_url'] = href
             else:
                 meeting['transcript_url'] = f"{COUNCIL_BASE_URL}{href}" if href.startswith('/') else f"{COUNCIL_BASE_URL}/{href}"
+            # uid of the transcript: natural key of meetings (upsert on_conflict)
+            meeting['transcript_uid'] = extract_uid(meeting['transcript_url'])
     else:
         meeting['title'] = title_cell.get_text().strip()
 
@@ -167,15 +200,42 @@ def extract_meeting_info(row):
     else:
         meeting['meeting_type'] = '기타'
 
-    # Mark as not processed (will be processed by AI later)
-    meeting['is_processed'] = False
+    # is_processed is left to its column default: re-scraping a listing must not
+    # reset the extraction checkpoint of a meeting whose speeches are saved
 
     return meeting
 
-def scrape_transcript_text(transcript_url):
+def scrape_transcript_text(transcript_url, if_changed=False):
     """
     Scrape full text from a meeting transcript page
 
+    Args:
+        transcript_url: URL of the transcript
+        if_changed: Revalidate against the response cache; unchanged pages are not parsed
+
+    Returns:
+        Full transcript text ("" on error, None if if_changed and the page is unchanged)
+    """
+    try:
+        logger.info(f"Fetching transcript from: {transcript_url}")
+        response = fetch(transcript_url, use_cache=if_changed)
+        if response.not_modified:
+            logger.info("Transcript unchanged since last fetch")
+            return None
+
+        transcript_text = parse_transcript_html(response.text)
+
+        logger.info(f"Extracted transcript: {len(transcript_text)} characters")
+        return transcript_text
+
+    except Exception as e:
+        logger.error(f"Error fetching transcript from {transcript_url}: {e}")
+        return ""
+
+def parse_transcript_html(html, backend=None):
+    """
+    Extract full text from transcript page HTML
+
     Structure:
     <div id="minutes-body">
       <div class="contents-block speaker-block member-speech">
@@ -185,61 +245,137 @@ def scrape_transcript_text(transcript_url):
     </div>
 
     Args:
-        transcript_url: URL of the transcript
+        html: Transcript page HTML
+        backend: HTML parser backend (default: config.HTML_PARSER)
 
     Returns:
-        Full transcript text
+        Full transcript text ("" if the page has no minutes body)
     """
-    headers = {'User-Agent': USER_AGENT}
+    soup = parse_scoped(html, 'div', id='minutes-body', backend=backend)
 
-    try:
-        logger.info(f"Fetching transcript from: {transcript_url}")
-        response = requests.get(transcript_url, headers=headers, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-        response.encoding = 'utf-8'
+    # Find the main minutes body
+    minutes_body = soup.find('div', id='minutes-body')
+    if not minutes_body:
+        logger.warning("No minutes-body found in transcript")
+        return ""
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+    # Extract all content blocks
+    content_blocks = minutes_body.find_all('div', class_='contents-block')
 
-        # Find the main minutes body
-        minutes_body = soup.find('div', id='minutes-body')
-        if not minutes_body:
-            logger.warning("No minutes-body found in transcript")
-            return ""
+    transcript_parts = []
+    for block in content_blocks:
+        # Get the text content, preserving line breaks
+        text = block.get_text(separator='\n', strip=True)
+        if text:
+            transcript_parts.append(text)
 
-        # Extract all content blocks
-        content_blocks = minutes_body.find_all('div', class_='contents-block')
+    return '\n\n'.join(transcript_parts)
 
-        transcript_parts = []
-        for block in content_blocks:
-            # Get the text content, preserving line breaks
-            text = block.get_text(separator='\n', strip=True)
-            if text:
-                transcript_parts.append(text)
+# Header words that follow the name ("○홍길동 의원") rather than precede it ("○위원장 이윤미")
+NAME_FIRST_ROLES = ('의원', '위원')
 
-        transcript_text = '\n\n'.join(transcript_parts)
+def parse_speaker_blocks(html, backend=None):
+    """
+    Segment a transcript page into speeches from its markup
 
-        logger.info(f"Extracted transcript: {len(transcript_text)} characters")
-        return transcript_text
+    Each <div class="contents-block speaker-block"> is one speech; its <strong>
+    header holds the role and the speaker, the rest of the block is the text.
+    Procedural blocks (agenda items, time stamps) are skipped.
 
-    except Exception as e:
-        logger.error(f"Error fetching transcript from {transcript_url}: {e}")
-        return ""
+    Structure:
+    <div class="contents-block speaker-block member-speech">
+      <strong>○위원장 <a class="member_profile">이윤미</a></strong>
+      발언 내용...
+    </div>
+
+    Args:
+        html: Transcript page HTML
+        backend: HTML parser backend (default: config.HTML_PARSER)
+
+    Returns:
+        List of {'order', 'speaker', 'role', 'is_member', 'text'} dicts in page order
+        (empty if the page has no speaker blocks); is_member is True when the
+        header links to a councillor profile
+    """
+    soup = parse_scoped(html, 'div', id='minutes-body', backend=backend)
+    minutes_body = soup.find('div', id='minutes-body')
+    if not minutes_body:
+        return []
+
+    speeches = []
+    for block in minutes_body.find_all('div', class_='speaker-block'):
+        header = block.find('strong')
+        if not header:
+            continue
+
+        header_lines = header.get_text(separator='\n', strip=True).split('\n')
+        lines = block.get_text(separator='\n', strip=True).split('\n')
+        if lines[:len(header_lines)] != header_lines:
+            continue  # header is not the first text of the block
+        text = '\n'.join(lines[len(header_lines):])
+
+        # Councillors are linked to their profile; officials are plain text
+        profile = header.find('a', class_='member_profile')
+        tokens = header.get_text(separator=' ', strip=True).replace('○', ' ').split()
+        if profile:
+            speaker = profile.get_text().strip()
+            role = ' '.join(t for t in tokens if t != speaker)
+        elif len(tokens) >= 2 and tokens[-1] in NAME_FIRST_ROLES:
+            speaker, role = ' '.join(tokens[:-1]), tokens[-1]
+        elif len(tokens) >= 2:
+            speaker, role = tokens[-1], ' '.join(tokens[:-1])
+        else:
+            speaker, role = ''.join(tokens), ''
+
+        if speaker and text:
+            speeches.append({
+                'order': len(speeches) + 1,
+                'speaker': speaker,
+                'role': role,
+                'is_member': profile is not None,
+                'text': text,
+            })
 
-def run():
-    """Main function to scrape and save meeting data"""
+    return speeches
+
+def run(full=False, max_pages=3):
+    """
+    Main function to scrape and save meeting data
+
+    Args:
+        full: Crawl max_pages regardless of what is stored (backfill mode)
+        max_pages: Pages to crawl in full mode or when the listing was never crawled
+    """
     try:
-        # Scrape first 3 pages (about 30 recent meetings)
-        meetings = scrape_meetings(max_pages=3)
+        stored_date = get_high_water_mark('meetings')
+
+        if full or stored_date is None:
+            # Full depth: first 3 pages by default (about 30 recent meetings)
+            meetings = scrape_meetings(max_pages=max_pages)
+        else:
+            # Incremental: page down to the stored date mark, usually one request
+            meetings = scrape_meetings(max_pages=INCREMENTAL_MAX_PAGES, high_water_date=stored_date,
+                                       if_changed=True)
 
         if meetings:
-            upsert_meetings(meetings)
-            logger.info(f"Successfully scraped and saved {len(meetings)} meetings")
+            stats = upsert_meetings(meetings)
+            logger.info(f"Successfully scraped {len(meetings)} meetings "
+                        f"({stats['inserted']} new, {stats['updated']} changed, {stats['skipped']} unchanged)")
         else:
-            logger.warning("No meeting data scraped")
+            logger.info("No new meeting data scraped")
+
+        # Advance the mark (newest date, the listing's sort key) only after the rows are saved
+        dates = [meeting['meeting_date'] for meeting in meetings if meeting.get('meeting_date')]
+        if dates and (stored_date is None or max(dates) > stored_date):
+            set_high_water_mark('meetings', max(dates))
 
     except Exception as e:
+        # Forget cached pages so the next run does not skip them as unchanged
+        get_response_cache().discard_prefix(f"{COUNCIL_BASE_URL}/kr/minutes/late.do")
         logger.error(f"Failed to scrape meetings: {e}")
         raise
+    finally:
+        get_rate_controller().log_stats()
 
 if __name__ == "__main__":
     run()
@@ -0,0 +1 @@
+# Offline stand-ins for external services
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory Claude (Anthropic Messages API) stand-in for offline runs
+
+Serves POST /v1/messages with a configurable per-request latency and a
+pluggable responder (request body -> reply text). The default responder
+answers summarization prompts with a fixed-shape JSON summary. Requests,
+input tokens and the peak number of requests in flight are counted, and an
+optional requests-per-minute limit answers excess requests with 429.
+
+The Message Batches API is served too (create, retrieve, results): a batch
+ends ``batch_seconds`` after it was created, and its requests are answered by
+the same responder when it ends; a responder error becomes an errored result.
+
+Usage:
+    server = start_claude_standin(latency_ms=300)
+    os.environ['ANTHROPIC_BASE_URL'] = server.url   # before creating a client
+"""
+import json
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _prompt_text(body):
+    parts = []
+    for message in body.get('messages') or []:
+        content = message.get('content')
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(block.get('text', '') for block in content or [] if isinstance(block, dict))
+    return '\n'.join(parts)
+
+
+def count_tokens(text: str) -> int:
+    """Same approximation as utils.llm.estimate_tokens, kept local so the stand-in has no scraper imports"""
+    hangul = sum(1 for char in text if '가' <= char <= '힣')
+    return hangul + -(-(len(text) - hangul) // 4)
+
+
+SPEECH_HEADER = re.compile(r'^\[발언 #(\d+)\][^\n]*\n(.*?)(?=^\[발언 #|\Z)', re.M | re.S)
+
+
+def _summary(speech):
+    speech = speech.strip().split('\n', 1)[0]
+    return {'summary': speech[:60], 'keywords': speech.split()[:3]}
+
+
+def extraction_responder(prompt):
+    """Split the transcript of an extraction prompt on "○speaker" lines"""
+    transcript = prompt.split('회의록:\n', 1)[-1].rsplit('\n\n위 형식에', 1)[0]
+    speeches = []
+    for block in re.split(r'^○', transcript, flags=re.M)[1:]:
+        header, _, text = block.partition('\n')
+        if text.strip():
+            speeches.append({'order': len(speeches) + 1, 'speaker': header.strip(), 'text': text.strip()})
+    return json.dumps({'speeches': speeches}, ensure_ascii=False)
+
+
+def summary_responder(body):
+    """
+    Reply to a summarization prompt with short summaries of its speech text
+
+    Multi-speech prompts ("[발언 #N] ..." blocks) get one entry per speech_order;
+    speech extraction prompts get the transcript split on its speaker lines.
+    """
+    prompt = _prompt_text(body)
+    if '\n회의록:\n' in prompt:
+        return extraction_responder(prompt)
+    speeches = SPEECH_HEADER.findall(prompt.split('각 발언을 분석하여', 1)[0])
+    if speeches:
+        return json.dumps({
+            'summaries': [dict(speech_order=int(order), **_summary(text)) for order, text in speeches]
+        }, ensure_ascii=False)
+    return json.dumps(_summary(prompt.split('발언 내용:', 1)[-1]), ensure_ascii=False)
+
+
+class ClaudeStandIn:
+    """Request accounting and replies, independent of the HTTP layer"""
+
+    def __init__(self, responder=summary_responder, rpm_limit: int = None, batch_seconds: float = 0.0):
+        self.responder = responder
+        self.rpm_limit = rpm_limit
+        self.batch_seconds = batch_seconds
+        self.batches = {}             # batch id -> {'created', 'requests', 'results'}
+        self.base_url = ''            # set by start_claude_standin()
+        self.lock = threading.Lock()
+        self.requests = Counter()     # model -> count
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.rejected = 0             # 429 responses
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._allowance = float(rpm_limit or 0)
+        self._updated = time.monotonic()
+
+    def admit(self) -> bool:
+        """Count a request in; False if it exceeds the per-minute limit"""
+        with self.lock:
+            if self.rpm_limit:
+                # Continuously replenished bucket, as the real API enforces it
+                now = time.monotonic()
+                self._allowance = min(self.rpm_limit,
+                                      self._allowance + (now - self._updated) * self.rpm_limit / 60.0)
+                self._updated = now
+                if self._allowance < 1:
+                    self.rejected += 1
+                    return False
+                self._allowance -= 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            return True
+
+    def message(self, body) -> dict:
+        text = self.responder(body)
+        input_tokens = count_tokens(_prompt_text(body))
+        output_tokens = count_tokens(text)
+        with self.lock:
+            self.requests[body.get('model')] += 1
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+        return {
+            'id': f"msg_{uuid.uuid4().hex[:24]}",
+            'type': 'message',
+            'role': 'assistant',
+            'model': body.get('model'),
+            'content': [{'type': 'text', 'text': text}],
+            'stop_reason': 'end_turn',
+            'stop_sequence': None,
+            'usage': {'input_tokens': input_tokens, 'output_tokens': output_tokens},
+        }
+
+    # -- Message Batches API -------------------------------------------------
+
+    def create_batch(self, body) -> dict:
+        batch_id = f"msgbatch_{uuid.uuid4().hex[:24]}"
+        with self.lock:
+            self.batches[batch_id] = {
+                'created': time.time(),
+                'requests': list(body.get('requests') or []),
+                'results': None,
+            }
+        return self.batch(batch_id)
+
+    def batch(self, batch_id) -> dict:
+        with self.lock:
+            batch = self.batches.get(batch_id)
+        if batch is None:
+            return None
+
+        ended = time.time() - batch['created'] >= self.batch_seconds
+        if ended and batch['results'] is None:
+            results = []
+            for item in batch['requests']:
+                try:
+                    result = {'type': 'succeeded', 'message': self.message(item['params'])}
+                except Exception as e:
+                    result = {'type': 'errored', 'error': {'type': 'error', 'error': {
+                        'type': 'api_error', 'message': str(e)}}}
+                results.append({'custom_id': item['custom_id'], 'result': result})
+            batch['results'] = results
+
+        counts = {'processing': 0, 'succeeded': 0, 'errored': 0, 'canceled': 0, 'expired': 0}
+        if batch['results'] is None:
+            counts['processing'] = len(batch['requests'])
+        else:
+            for item in batch['results']:
+                counts[item['result']['type']] += 1
+
+        stamp = lambda t: datetime.fromtimestamp(t, timezone.utc).isoformat().replace('+00:00', 'Z')
+        return {
+            'id': batch_id,
+            'type': 'message_batch',
+            'processing_status': 'ended' if ended else 'in_progress',
+            'request_counts': counts,
+            'created_at': stamp(batch['created']),
+            'expires_at': stamp(batch['created'] + 86400),
+            'ended_at': stamp(time.time()) if ended else None,
+            'archived_at': None,
+            'cancel_initiated_at': None,
+            'results_url': f"{self.base_url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def batch_results(self, batch_id) -> list:
+        with self.lock:
+            batch = self.batches.get(batch_id)
+        return batch['results'] if batch else None
+
+    def done(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def reset_counters(self):
+        with self.lock:
+            self.requests.clear()
+            self.input_tokens = 0
+            self.output_tokens = 0
+            self.rejected = 0
+            self.peak_in_flight = self.in_flight
+            self._allowance = float(self.rpm_limit or 0)
+
+    def counters(self) -> dict:
+        with self.lock:
+            return {
+                'llm_requests': sum(self.requests.values()),
+                'input_tokens': self.input_tokens,
+                'output_tokens': self.output_tokens,
+                'rejected': self.rejected,
+                'peak_in_flight': self.peak_in_flight,
+            }
+
+
+def _make_handler(standin, latency=0.0):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def _send(self, status, payload, headers=None):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _error(self, status, kind, message, headers=None):
+            self._send(status, {'type': 'error', 'error': {'type': kind, 'message': message}}, headers)
+
+        def do_GET(self):
+            segments = self.path.split('?')[0].strip('/').split('/')
+            if segments[:3] != ['v1', 'messages', 'batches'] or len(segments) not in (4, 5):
+                self._error(404, 'not_found_error', f"unknown path {self.path}")
+                return
+
+            if len(segments) == 4:
+                batch = standin.batch(segments[3])
+                if batch is None:
+                    self._error(404, 'not_found_error', f"batch {segments[3]} not found")
+                else:
+                    self._send(200, batch)
+                return
+
+            results = standin.batch_results(segments[3]) if segments[4] == 'results' else None
+            if results is None:
+                self._error(404, 'not_found_error', f"no results for {segments[3]}")
+                return
+            body = ''.join(json.dumps(item, ensure_ascii=False) + '\n' for item in results).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/binary')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length) or b'{}')
+
+            if self.path.split('?')[0].rstrip('/') == '/v1/messages/batches':
+                self._send(200, standin.create_batch(body))
+                return
+            if self.path.split('?')[0].rstrip('/') != '/v1/messages':
+                self._error(404, 'not_found_error', f"unknown path {self.path}")
+                return
+            if not standin.admit():
+                self._error(429, 'rate_limit_error', 'requests per minute exceeded', {'retry-after': '1'})
+                return
+            try:
+                time.sleep(latency)
+                self._send(200, standin.message(body))
+            except Exception as e:
+                self._error(500, 'api_error', str(e))
+            finally:
+                standin.done()
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class _StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+def start_claude_standin(standin: ClaudeStandIn = None, port: int = 0, latency_ms: float = 0.0):
+    """
+    Serve a ClaudeStandIn on 127.0.0.1 in a background thread
+
+    Args:
+        standin: Stand-in to serve (default: a new ClaudeStandIn)
+        port: Port to bind (0 picks a free one)
+        latency_ms: Emulated model latency added to every request
+
+    Returns:
+        The running server; ``server.standin`` and ``server.url`` (base URL for
+        ANTHROPIC_BASE_URL) are set, stop it with ``server.shutdown()``
+    """
+    standin = standin or ClaudeStandIn()
+    server = _StandInServer(('127.0.0.1', port), _make_handler(standin, latency_ms / 1000.0))
+    server.standin = standin
+    server.url = standin.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,635 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory PostgREST-compatible stand-in for offline runs
+
+Implements the subset of the PostgREST HTTP API that supabase-py issues from
+this scraper: select with column projection, eq/neq/gt/gte/lt/lte/is/in/
+like/ilike filters (and their not. forms, or/and groups), order/limit/offset, exact counts,
+insert, upsert (merge/ignore duplicates, on_conflict), update and delete.
+Primary keys and the UNIQUE constraints of supabase/schema.sql are enforced,
+so duplicate-key behaviour matches the real database.
+
+Usage:
+    server = start_postgrest_standin()
+    os.environ['SUPABASE_URL'] = server.url   # before importing config
+"""
+import json
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+# Primary key and UNIQUE constraints per table (supabase/schema.sql + migrations)
+PRIMARY_KEYS = {
+    'crawl_state': ('listing',),
+    'cafe_posts': ('id',),
+    'speech_checkpoints': ('meeting_id',),
+    'keyword_terms': ('term',),
+    'keyword_meetings': ('meeting_id',),
+}
+UNIQUE_KEYS = {
+    'meetings': [('transcript_uid',)],
+    'councillors': [('name', 'term_number')],
+    'committees': [('name',)],
+    'bills': [('bill_number',)],
+    'bill_cosponsors': [('bill_id', 'councillor_id')],
+    'votes': [('bill_id', 'councillor_id')],
+    'councillor_committees': [('councillor_id', 'committee_id', 'start_date')],
+    'investigation_councillors': [('investigation_id', 'councillor_id')],
+}
+# UNIQUE NULLS NOT DISTINCT constraints: NULL key parts compare equal
+NULLS_NOT_DISTINCT = {
+    ('councillors', ('name', 'term_number')),
+}
+# Columns filled in by DEFAULT clauses
+DEFAULTS = {
+    'meetings': {'is_processed': False},
+    'councillors': {'is_active': True},
+    'llm_batches': {'status': 'submitted'},
+    'speech_checkpoints': {'summaries': {}, 'summarized': 0},
+}
+
+RESERVED_PARAMS = {'select', 'order', 'limit', 'offset', 'on_conflict', 'columns'}
+
+
+class PostgrestError(Exception):
+    def __init__(self, status, code, message):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+def _coerce(value):
+    """PostgREST filter values arrive as text; compare like Postgres would"""
+    if value == 'null':
+        return None
+    if value == 'true':
+        return True
+    if value == 'false':
+        return False
+    return value
+
+
+def _text(value):
+    """Render a stored value the way Postgres prints it in a filter comparison"""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def _compare_key(value):
+    if isinstance(value, bool) or value is None:
+        return (0, str(value))
+    if isinstance(value, (int, float)):
+        return (1, value)
+    try:
+        return (1, float(value))
+    except (TypeError, ValueError):
+        return (2, str(value))
+
+
+def _like(pattern, value, flags=0):
+    regex = '^' + re.escape(pattern).replace('%', '.*').replace(r'\*', '.*').replace('_', '.') + '$'
+    return re.match(regex, str(value), flags | re.DOTALL) is not None
+
+
+def _match(row, column, expr):
+    negate = expr.startswith('not.')
+    if negate:
+        expr = expr[4:]
+    op, _, raw = expr.partition('.')
+    value = row.get(column)
+
+    if op == 'is':
+        result = value is _coerce(raw) if raw in ('null', 'true', 'false') else False
+    elif op == 'eq':
+        result = value is not None and _text(value) == raw
+    elif op == 'neq':
+        result = value is not None and _text(value) != raw
+    elif op in ('gt', 'gte', 'lt', 'lte'):
+        if value is None:
+            result = False
+        else:
+            a, b = _compare_key(value), _compare_key(raw)
+            if a[0] != b[0]:
+                a, b = (2, str(value)), (2, raw)
+            result = {'gt': a > b, 'gte': a >= b, 'lt': a < b, 'lte': a <= b}[op]
+    elif op == 'in':
+        items = [i.strip().strip('"') for i in raw.strip('()').split(',')] if raw.strip('()') else []
+        result = value is not None and _text(value) in items
+    elif op == 'like':
+        result = value is not None and _like(raw, value)
+    elif op == 'ilike':
+        result = value is not None and _like(raw, value, re.IGNORECASE)
+    else:
+        raise PostgrestError(400, 'PGRST100', f"unsupported operator {op}")
+
+    return not result if negate else result
+
+
+def _split_top_level(expr):
+    """Split "a.eq.1,and(b.eq.2,c.eq.3)" on commas outside parentheses and quotes"""
+    parts, depth, quoted, start = [], 0, False, 0
+    for i, char in enumerate(expr):
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == '(':
+            depth += 1
+        elif not quoted and char == ')':
+            depth -= 1
+        elif not quoted and char == ',' and depth == 0:
+            parts.append(expr[start:i])
+            start = i + 1
+    parts.append(expr[start:])
+    return [p for p in parts if p]
+
+
+def _match_group(row, operator, expr):
+    """or=(...) / and=(...) logic trees; conditions are column.op.value"""
+    results = []
+    for condition in _split_top_level(expr.strip()[1:-1]):
+        nested = re.match(r'^(not\.)?(or|and)(\(.*\))$', condition)
+        if nested:
+            result = _match_group(row, nested.group(2), nested.group(3))
+            results.append(not result if nested.group(1) else result)
+        else:
+            column, _, rest = condition.partition('.')
+            op, _, raw = rest.partition('.')
+            if op == 'not':
+                op, _, raw = raw.partition('.')
+                op = 'not.' + op
+            results.append(_match(row, column, op + '.' + raw.strip('"')))
+    return any(results) if operator == 'or' else all(results)
+
+
+class PostgrestStandIn:
+    """Table storage and request semantics, independent of the HTTP layer"""
+
+    def __init__(self, max_rows: int = None):
+        self.tables = {}
+        self.max_rows = max_rows       # PostgREST db-max-rows: silent cap on rows per select
+        self.lock = threading.RLock()
+        self.requests = Counter()      # (method, table) -> count
+        self.rows_written = Counter()  # (op, table) -> rows
+        self.connections = 0           # accepted TCP connections
+        self.functions = dict(BUILTIN_FUNCTIONS)  # rpc name -> callable(standin, params) -> result
+
+    # -- helpers -------------------------------------------------------------
+
+    def table(self, name):
+        return self.tables.setdefault(name, [])
+
+    def primary_key(self, table):
+        return PRIMARY_KEYS.get(table, ('id',))
+
+    def _key(self, row, columns):
+        return tuple(str(row.get(c)) for c in columns)
+
+    @staticmethod
+    def _keyed(table, row, columns):
+        # A NULL key part never conflicts, unless the constraint is NULLS NOT DISTINCT
+        return (table, columns) in NULLS_NOT_DISTINCT or all(row.get(c) is not None for c in columns)
+
+    def _check_unique(self, table, row, ignore=None):
+        rows = self.table(table)
+        for columns in [self.primary_key(table)] + UNIQUE_KEYS.get(table, []):
+            if not self._keyed(table, row, columns):
+                continue
+            key = self._key(row, columns)
+            for other in rows:
+                if other is not ignore and other is not row and self._key(other, columns) == key:
+                    raise PostgrestError(
+                        409, '23505',
+                        f'duplicate key value violates unique constraint "{table}_{"_".join(columns)}_key"'
+                    )
+
+    def _new_row(self, table, values):
+        now = datetime.utcnow().isoformat()
+        row = dict(DEFAULTS.get(table, {}))
+        if self.primary_key(table) == ('id',):
+            row['id'] = str(uuid.uuid4())
+        row['created_at'] = now
+        row['updated_at'] = now
+        row.update(values)
+        return row
+
+    def _filter(self, table, filters):
+        rows = self.table(table)
+        for column, expr in filters:
+            if column in ('or', 'and'):
+                rows = [r for r in rows if _match_group(r, column, expr)]
+            else:
+                rows = [r for r in rows if _match(r, column, expr)]
+        return rows
+
+    @staticmethod
+    def _project(rows, select):
+        if not select or select.strip() == '*':
+            return [dict(r) for r in rows]
+        columns = [c.strip() for c in select.split(',') if c.strip()]
+        return [{c: r.get(c) for c in columns} for r in rows]
+
+    # -- operations ----------------------------------------------------------
+
+    def select(self, table, params, filters):
+        with self.lock:
+            rows = self._filter(table, filters)
+            total = len(rows)
+
+            order = params.get('order')
+            if order:
+                for part in reversed(order.split(',')):
+                    column, *mods = part.split('.')
+                    desc = 'desc' in mods
+                    present = [r for r in rows if r.get(column) is not None]
+                    missing = [r for r in rows if r.get(column) is None]
+                    present.sort(key=lambda r: _compare_key(r.get(column)), reverse=desc)
+                    # Postgres: NULLS LAST for asc, NULLS FIRST for desc
+                    rows = missing + present if desc else present + missing
+
+            offset = int(params.get('offset', 0))
+            limit = params.get('limit')
+            rows = rows[offset:offset + int(limit)] if limit is not None else rows[offset:]
+            if self.max_rows is not None:
+                rows = rows[:self.max_rows]
+            return self._project(rows, params.get('select')), total
+
+    def insert(self, table, payload, upsert=None, on_conflict=None):
+        """upsert: None (plain insert), 'merge' or 'ignore'"""
+        items = payload if isinstance(payload, list) else [payload]
+        with self.lock:
+            rows = self.table(table)
+            conflict_cols = tuple(c.strip() for c in on_conflict.split(',')) if on_conflict \
+                else self.primary_key(table)
+            constraints = [self.primary_key(table)] + UNIQUE_KEYS.get(table, [])
+            seen = set()
+            staged = []
+
+            for values in items:
+                existing = None
+                if upsert and self._keyed(table, values, conflict_cols):
+                    key = self._key(values, conflict_cols)
+                    existing = next((r for r in rows if self._key(r, conflict_cols) == key), None)
+
+                if existing is not None and upsert == 'ignore':
+                    continue
+                if existing is not None:
+                    row = dict(existing)
+                    row.update(values)
+                else:
+                    row = self._new_row(table, values)
+                self._check_unique(table, row, ignore=existing)
+
+                # Postgres also rejects two rows of one statement hitting the same key
+                for columns in constraints:
+                    if self._keyed(table, row, columns):
+                        key = (columns, self._key(row, columns))
+                        if key in seen and upsert and columns == conflict_cols:
+                            raise PostgrestError(
+                                500, '21000', 'ON CONFLICT DO UPDATE command cannot affect row a second time'
+                            )
+                        if key in seen:
+                            raise PostgrestError(409, '23505', 'duplicate key value violates unique constraint')
+                        seen.add(key)
+                staged.append((existing, row))
+
+            # Apply only after every row passed its checks (statement atomicity)
+            for existing, row in staged:
+                if existing is not None:
+                    existing.clear()
+                    existing.update(row)
+                    self.rows_written[('update', table)] += 1
+                else:
+                    rows.append(row)
+                    self.rows_written[('insert', table)] += 1
+            return [dict(row) for _, row in staged]
+
+    def update(self, table, values, filters):
+        with self.lock:
+            rows = self._filter(table, filters)
+            for row in rows:
+                merged = dict(row)
+                merged.update(values)
+                self._check_unique(table, merged, ignore=row)
+            for row in rows:
+                row.update(values)
+            self.rows_written[('update', table)] += len(rows)
+            return [dict(r) for r in rows]
+
+    def delete(self, table, filters):
+        with self.lock:
+            doomed = self._filter(table, filters)
+            ids = {id(r) for r in doomed}
+            self.tables[table] = [r for r in self.table(table) if id(r) not in ids]
+            self.rows_written[('delete', table)] += len(doomed)
+            return [dict(r) for r in doomed]
+
+    def rpc(self, name, params):
+        if name not in self.functions:
+            raise PostgrestError(404, 'PGRST202', f"function {name} not found")
+        with self.lock:
+            return self.functions[name](self, params)
+
+    # -- stats ---------------------------------------------------------------
+
+    def truncate(self):
+        """Drop every table's rows and reset counters (functions are kept)"""
+        with self.lock:
+            self.tables.clear()
+        self.reset_counters()
+
+    def reset_counters(self):
+        with self.lock:
+            self.requests.clear()
+            self.rows_written.clear()
+            self.connections = 0
+
+    def counters(self) -> dict:
+        with self.lock:
+            return {
+                'db_requests': sum(self.requests.values()),
+                'connections': self.connections,
+                'rows_written': sum(self.rows_written.values()),
+                'by_request': dict(self.requests),
+                'by_write': dict(self.rows_written),
+            }
+
+
+def _replace_meeting_speeches(standin, params):
+    """supabase/migrations/20261018000400_add_speech_checkpoints.sql"""
+    meeting_id = params['p_meeting_id']
+    rows = [dict(row, meeting_id=meeting_id) for row in params.get('p_rows') or []]
+    before = {name: [dict(row) for row in standin.table(name)]
+              for name in ('speeches', 'meetings', 'speech_checkpoints', 'keyword_meetings')}
+    try:
+        standin.delete('speeches', [('meeting_id', f'eq.{meeting_id}')])
+        standin.insert('speeches', rows)
+        standin.update('meetings', {'is_processed': True}, [('id', f'eq.{meeting_id}')])
+        standin.delete('speech_checkpoints', [('meeting_id', f'eq.{meeting_id}')])
+        # mark_keyword_meetings_stale triggers (20261018000500_add_keyword_index.sql)
+        standin.update('keyword_meetings', {'stale': True}, [('meeting_id', f'eq.{meeting_id}')])
+    except PostgrestError:
+        standin.tables.update(before)  # the function runs in one transaction
+        raise
+    return len(rows)
+
+
+def _index_meeting_keywords(standin, params):
+    """supabase/migrations/20261018000500_add_keyword_index.sql"""
+    now = datetime.utcnow().isoformat()
+    terms = {row['term']: row for row in standin.table('keyword_terms')}
+    indexed = {row['meeting_id']: row for row in standin.table('keyword_meetings')}
+    touched = set()
+
+    for meeting in params['p_meetings']:
+        old = indexed.get(meeting['meeting_id'])
+        for term, count in (old['terms'] if old else {}).items():
+            if term in terms:
+                terms[term]['doc_count'] -= count
+        for term, count in meeting['terms'].items():
+            row = terms.setdefault(term, {'term': term, 'doc_count': 0})
+            row['doc_count'] += count
+            row['updated_at'] = now
+            touched.add(term)
+        indexed[meeting['meeting_id']] = {
+            'meeting_id': meeting['meeting_id'], 'documents': meeting['documents'],
+            'terms': meeting['terms'], 'stale': False, 'indexed_at': now,
+        }
+
+    standin.tables['keyword_terms'] = [row for row in terms.values() if row['doc_count'] > 0]
+    standin.tables['keyword_meetings'] = list(indexed.values())
+    standin.rows_written[('rpc', 'keyword_terms')] += len(touched)
+    return {
+        'documents': sum(row['documents'] for row in indexed.values()),
+        'terms': {term: terms[term]['doc_count'] for term in touched if terms[term]['doc_count'] > 0},
+    }
+
+
+def _set_speech_keywords(standin, params):
+    """supabase/migrations/20261018000500_add_keyword_index.sql"""
+    keywords = {row['id']: row['keywords'] for row in params['p_rows']}
+    updated = 0
+    for speech in standin.table('speeches'):
+        if speech.get('id') in keywords:
+            speech['keywords'] = keywords[speech['id']]
+            updated += 1
+    standin.rows_written[('rpc', 'speeches')] += updated
+    return updated
+
+
+# Foreign keys to councillors(id), in the order merge_councillors() re-points them
+COUNCILLOR_REFERENCES = (
+    ('bills', 'proposer_id'),
+    ('speeches', 'councillor_id'),
+    ('subscriptions', 'councillor_id'),
+    ('votes', 'councillor_id'),
+    ('bill_cosponsors', 'councillor_id'),
+    ('councillor_committees', 'councillor_id'),
+    ('investigation_councillors', 'councillor_id'),
+)
+
+
+def _merge_councillors(standin, params):
+    """supabase/migrations/20261018000900_add_merge_councillors.sql"""
+    merges = params['p_merges']
+    ids = {row['id'] for row in standin.table('councillors')}
+    if any(s in merges or s not in ids for s in merges.values()):
+        raise PostgrestError(400, 'P0001', 'merge_councillors: every survivor must be an existing '
+                                           'councillor that is not merged away')
+    result = {}
+    for table, column in COUNCILLOR_REFERENCES:
+        unique_with = next((tuple(c for c in cols if c != column)
+                            for cols in UNIQUE_KEYS.get(table, []) if column in cols), None)
+        rows = standin.table(table)
+        dropped = []
+        if unique_with:
+            # The survivor's own row keeps a link, else the duplicate's row with the lowest id
+            claimed = set()
+            for row in sorted(rows, key=lambda r: (r.get(column) in merges, str(r.get('id')))):
+                councillor = row.get(column)
+                link = (merges.get(councillor, councillor),) + tuple(str(row.get(c)) for c in unique_with)
+                if councillor in merges and link in claimed:
+                    dropped.append(row)
+                claimed.add(link)
+            dropped_rows = {id(r) for r in dropped}
+            standin.tables[table] = rows = [r for r in rows if id(r) not in dropped_rows]
+        moved = 0
+        for row in rows:
+            if row.get(column) in merges:
+                row[column] = merges[row[column]]
+                moved += 1
+        standin.rows_written[('rpc', table)] += moved + len(dropped)
+        result[table] = {'moved': moved, 'dropped': len(dropped)}
+
+    standin.tables['councillors'] = [r for r in standin.table('councillors') if r['id'] not in merges]
+    standin.rows_written[('rpc', 'councillors')] += len(merges)
+    result['councillors'] = {'deleted': len(merges)}
+    return result
+
+
+BUILTIN_FUNCTIONS = {
+    'merge_councillors': _merge_councillors,
+    'replace_meeting_speeches': _replace_meeting_speeches,
+    'index_meeting_keywords': _index_meeting_keywords,
+    'set_speech_keywords': _set_speech_keywords,
+}
+
+
+def _make_handler(standin, handshake_delay=0.0, latency=0.0):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body go out in separate writes; without this, Nagle plus
+        # delayed ACKs add ~40 ms to every keep-alive response
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            with standin.lock:
+                standin.connections += 1
+            # Emulated TCP+TLS setup cost of a remote Supabase project
+            time.sleep(handshake_delay)
+
+        def _parse(self):
+            parts = urlsplit(self.path)
+            segments = parts.path.strip('/').split('/')
+            if len(segments) < 3 or segments[:2] != ['rest', 'v1']:
+                raise PostgrestError(404, 'PGRST000', f"unknown path {parts.path}")
+            params, filters = {}, []
+            for key, value in parse_qsl(parts.query, keep_blank_values=True):
+                if key in RESERVED_PARAMS:
+                    params[key] = value
+                else:
+                    filters.append((key, value))
+            return segments[2:], params, filters
+
+        def _body(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            raw = self.rfile.read(length) if length else b''
+            return json.loads(raw) if raw else None
+
+        def _prefer(self):
+            prefer = {}
+            for item in (self.headers.get('Prefer') or '').split(','):
+                if '=' in item:
+                    k, v = item.strip().split('=', 1)
+                    prefer[k] = v
+            return prefer
+
+        def _send(self, status, payload=None, headers=None):
+            body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8') \
+                if payload is not None else b''
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def _handle(self, method):
+            try:
+                segments, params, filters = self._parse()
+                prefer = self._prefer()
+                with standin.lock:
+                    standin.requests[(method, segments[-1])] += 1
+                time.sleep(latency)
+
+                if segments[0] == 'rpc':
+                    result = standin.rpc(segments[1], self._body() or {})
+                    self._send(200, result)
+                    return
+
+                table = segments[0]
+                if method in ('GET', 'HEAD'):
+                    rows, total = standin.select(table, params, filters)
+                    headers = {}
+                    if 'count' in prefer:
+                        offset = int(params.get('offset', 0))
+                        end = offset + len(rows) - 1
+                        headers['Content-Range'] = f"{offset}-{end}/{total}" if rows else f"*/{total}"
+                    self._send(200, rows if method == 'GET' else None, headers)
+                    return
+
+                if method == 'POST':
+                    resolution = prefer.get('resolution', '')
+                    upsert = resolution.split('-')[0] if resolution else None
+                    rows = standin.insert(table, self._body(), upsert, params.get('on_conflict'))
+                    status = 201
+                elif method == 'PATCH':
+                    rows = standin.update(table, self._body() or {}, filters)
+                    status = 200
+                else:
+                    self._body()  # supabase-py sends "{}"; drain it to keep the connection in sync
+                    rows = standin.delete(table, filters)
+                    status = 200
+
+                headers = {}
+                if 'count' in prefer:
+                    headers['Content-Range'] = f"*/{len(rows)}"
+                if prefer.get('return') == 'representation':
+                    self._send(status, self._project_returning(rows, params), headers)
+                else:
+                    self._send(204 if status == 200 else status, None, headers)
+
+            except PostgrestError as e:
+                self._send(e.status, {'code': e.code, 'message': e.message, 'details': None, 'hint': None})
+            except Exception as e:
+                self._send(500, {'code': 'XX000', 'message': str(e), 'details': None, 'hint': None})
+
+        @staticmethod
+        def _project_returning(rows, params):
+            return PostgrestStandIn._project(rows, params.get('select'))
+
+        def do_GET(self):
+            self._handle('GET')
+
+        def do_HEAD(self):
+            self._handle('HEAD')
+
+        def do_POST(self):
+            self._handle('POST')
+
+        def do_PATCH(self):
+            self._handle('PATCH')
+
+        def do_DELETE(self):
+            self._handle('DELETE')
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class _StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Concurrent clients (asyncio.gather) open many connections at once
+    request_queue_size = 256
+
+
+def start_postgrest_standin(standin: PostgrestStandIn = None, port: int = 0,
+                            handshake_ms: float = 0.0, latency_ms: float = 0.0):
+    """
+    Serve a PostgrestStandIn on 127.0.0.1 in a background thread
+
+    Args:
+        standin: Storage to serve (default: a new, empty one)
+        port: Port to bind (default: any free port)
+        handshake_ms: Sleep once per accepted connection (connection setup cost)
+        latency_ms: Sleep once per request (round trip / query time)
+
+    Returns:
+        ThreadingHTTPServer with ``.standin`` and ``.url`` attributes
+    """
+    standin = standin or PostgrestStandIn()
+    server = _StandInServer(('127.0.0.1', port), _make_handler(standin, handshake_ms / 1000.0, latency_ms / 1000.0))
+    server.standin = standin
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
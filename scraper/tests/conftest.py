@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Offline tests for the scraper (python -m pytest tests from scraper/)
+
+Nothing here touches the network: pages come from the saved fixtures
+(*_page.html) and the database is the in-memory PostgREST stand-in.
+"""
+import os
+import sys
+
+import pytest
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRAPER_DIR)
+
+
+def fixture_html(name: str) -> str:
+    """Saved council page next to the scripts, e.g. fixture_html('meetings_page.html')"""
+    with open(os.path.join(SCRAPER_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.fixture
+def postgrest(monkeypatch):
+    """Fresh PostgREST stand-in that utils.db's shared client talks to"""
+    import utils.db as db
+    from standins.postgrest import start_postgrest_standin
+
+    server = start_postgrest_standin()
+    monkeypatch.setattr(db, 'SUPABASE_URL', server.url)
+    monkeypatch.setattr(db, 'SUPABASE_KEY', 'test-key')
+    monkeypatch.setattr(db, '_client', None)
+    yield server.standin
+    server.shutdown()
+
+
+@pytest.fixture
+def extract_speeches(postgrest, monkeypatch):
+    """extract_speeches module talking to the stand-in, with LLM cache lookups disabled"""
+    import utils.db as db
+
+    # The script checks its credentials at import time
+    for name in ('SUPABASE_URL', 'SUPABASE_KEY', 'ANTHROPIC_API_KEY'):
+        monkeypatch.setenv(name, os.environ.get(name) or 'test-key')
+    import extract_speeches as module
+
+    monkeypatch.setattr(module, 'supabase', db.get_supabase_client())
+    monkeypatch.setattr(module, 'cached_summaries', lambda speeches: {})
+    monkeypatch.setattr(module, 'cache_summaries', lambda speeches, results: None)
+    return module
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Page archive stays bounded: one index row per (url, content), a per-URL
+version limit and a total size cap
+"""
+import gzip
+import hashlib
+import os
+import sqlite3
+
+from utils.archive import PageArchive
+
+URL = 'https://council.yongin.go.kr/kr/minutes/view.do?uid=8413'
+
+
+def index_rows(directory):
+    with sqlite3.connect(os.path.join(directory, 'index.db')) as db:
+        return db.execute("SELECT url, sha256 FROM snapshots").fetchall()
+
+
+def object_files(directory):
+    return [name for _, _, names in os.walk(os.path.join(directory, 'objects')) for name in names]
+
+
+def test_refetching_unchanged_page_adds_no_rows(tmp_path):
+    archive = PageArchive(str(tmp_path))
+    for t in (100.0, 200.0, 300.0):
+        archive.store(URL, b'<html>same</html>', fetched_at=t)
+
+    assert len(index_rows(str(tmp_path))) == 1
+    assert archive.history(URL) == [(300.0, hashlib.sha256(b'<html>same</html>').hexdigest())]
+
+
+def test_old_versions_are_pruned_with_their_objects(tmp_path):
+    archive = PageArchive(str(tmp_path), keep_versions=2)
+    for i in range(5):
+        archive.store(URL, f'<html>v{i}</html>'.encode(), fetched_at=100.0 + i)
+
+    kept = [archive.load(sha) for _, sha in archive.history(URL)]
+    assert kept == [b'<html>v3</html>', b'<html>v4</html>']
+    assert len(object_files(str(tmp_path))) == 2
+
+
+def test_shared_object_survives_pruning_of_one_url(tmp_path):
+    archive = PageArchive(str(tmp_path), keep_versions=1)
+    archive.store(URL, b'<html>shared</html>', fetched_at=100.0)
+    archive.store(URL + '0', b'<html>shared</html>', fetched_at=101.0)
+    archive.store(URL, b'<html>new</html>', fetched_at=102.0)
+
+    (_, sha), = archive.history(URL + '0')
+    assert archive.load(sha) == b'<html>shared</html>'
+
+
+def test_size_cap_drops_superseded_versions_first(tmp_path):
+    bodies = [os.urandom(4000) for _ in range(4)]
+    archive = PageArchive(str(tmp_path), max_bytes=3 * 4200)
+    archive.store(URL, bodies[0], fetched_at=100.0)
+    archive.store(URL + '0', bodies[1], fetched_at=101.0)
+    archive.store(URL, bodies[2], fetched_at=102.0)
+    archive.store(URL + '1', bodies[3], fetched_at=103.0)
+
+    # The old version of URL goes, the only versions of the other pages stay
+    assert [archive.load(sha) for _, sha in archive.history(URL)] == [bodies[2]]
+    assert len(archive.history(URL + '0')) == 1
+    assert len(archive.history(URL + '1')) == 1
+    assert len(object_files(str(tmp_path))) == 3
+
+
+def test_legacy_fetch_log_is_collapsed(tmp_path):
+    directory = str(tmp_path)
+    body = b'<html>legacy</html>'
+    sha = hashlib.sha256(body).hexdigest()
+    os.makedirs(os.path.join(directory, 'objects', sha[:2]))
+    with gzip.open(os.path.join(directory, 'objects', sha[:2], f'{sha}.gz'), 'wb') as f:
+        f.write(body)
+    with sqlite3.connect(os.path.join(directory, 'index.db')) as db:
+        db.execute("CREATE TABLE fetches (url TEXT NOT NULL, fetched_at REAL NOT NULL, sha256 TEXT NOT NULL)")
+        db.executemany("INSERT INTO fetches VALUES (?, ?, ?)", [(URL, t, sha) for t in (1.0, 2.0, 3.0)])
+
+    archive = PageArchive(directory)
+
+    assert archive.history(URL) == [(3.0, sha)]
+    assert archive.latest() == [(URL, 3.0, sha)]
+    with sqlite3.connect(os.path.join(directory, 'index.db')) as db:
+        assert not db.execute("SELECT 1 FROM sqlite_master WHERE name = 'fetches'").fetchone()
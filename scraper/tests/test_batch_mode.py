@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""Batch mode of extract_speeches.py keeps llm_batches.context down to ids and speech orders"""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from standins.claude_api import summary_responder
+from utils.llmcache import LLMCache
+from utils.resolver import CouncillorResolver
+
+MEETING_ID = '00000000-0000-0000-0000-000000000002'
+TRANSCRIPT = '\n'.join(
+    f'○의원 유진선{i}\n{"예산 심사에 관한 발언 내용입니다. " * 4}' for i in range(1, 5)
+)
+
+
+@pytest.fixture
+def batches(extract_speeches, tmp_path, monkeypatch):
+    """Message Batches API stand-in: every submitted batch ends at once with the stand-in's replies"""
+    submitted = {}
+
+    def submit_batch(requests):
+        batch_id = f'msgbatch_{len(submitted) + 1}'
+        submitted[batch_id] = requests
+        return batch_id
+
+    monkeypatch.setattr(extract_speeches, 'submit_batch', submit_batch)
+    monkeypatch.setattr(extract_speeches, 'get_batch',
+                        lambda batch_id: SimpleNamespace(processing_status='ended'))
+    monkeypatch.setattr(extract_speeches, 'get_batch_results', lambda batch_id: {
+        custom_id: summary_responder(params) for custom_id, params in submitted[batch_id].items()
+    })
+    cache = LLMCache(str(tmp_path))
+    monkeypatch.setattr(extract_speeches, 'get_llm_cache', lambda: cache)
+    return submitted
+
+
+@pytest.fixture
+def meeting(postgrest):
+    row = {'id': MEETING_ID, 'title': '제1차 본회의', 'transcript_uid': 2, 'transcript_text': TRANSCRIPT}
+    postgrest.insert('meetings', row)
+    return {key: row[key] for key in ('id', 'title')}
+
+
+def open_contexts(postgrest):
+    return [row['context'] for row in postgrest.table('llm_batches') if row['status'] == 'submitted']
+
+
+def test_context_holds_no_transcript_or_speeches(postgrest, extract_speeches, batches, meeting):
+    resolver = CouncillorResolver([])
+
+    extract_speeches.submit_batch_jobs(iter([meeting]), resolver)
+    context, = open_contexts(postgrest)
+    assert context['meetings'] == {MEETING_ID: {'stage': 'extract', 'attempt': 0, 'parts': 1}}
+    assert all(set(request) == {'meeting_id', 'kind', 'part'} for request in context['requests'].values())
+
+    stats = extract_speeches.collect_batch_jobs(resolver)
+    assert stats['requeued'] == 1
+    context, = open_contexts(postgrest)
+    assert context['meetings'] == {MEETING_ID: {'stage': 'summarize', 'attempt': 0}}
+    orders = sorted(order for request in context['requests'].values() for order in request['orders'])
+    assert orders == [1, 2, 3, 4]
+    assert 'transcript' not in json.dumps(context) and '예산' not in json.dumps(context, ensure_ascii=False)
+    checkpoint, = postgrest.table('speech_checkpoints')
+    assert checkpoint['total'] == 4
+
+    stats = extract_speeches.collect_batch_jobs(resolver)
+    assert (stats['meetings'], stats['speeches']) == (1, 4)
+    assert open_contexts(postgrest) == []
+    assert all(row['summary'] for row in postgrest.table('speeches'))
+    assert postgrest.table('meetings')[0]['is_processed'] is True
+    assert postgrest.table('speech_checkpoints') == []
+
+
+def test_missing_summaries_are_requested_again_from_the_checkpoint(postgrest, extract_speeches, batches,
+                                                                     meeting, monkeypatch):
+    resolver = CouncillorResolver([])
+    extract_speeches.submit_batch_jobs(iter([meeting]), resolver)
+    extract_speeches.collect_batch_jobs(resolver)
+
+    # Drop speech #2 from every summary reply of this round
+    replies = extract_speeches.get_batch_results
+    def without_second(batch_id):
+        results = {}
+        for custom_id, text in replies(batch_id).items():
+            data = json.loads(text)
+            data['summaries'] = [s for s in data['summaries'] if s['speech_order'] != 2]
+            results[custom_id] = json.dumps(data, ensure_ascii=False)
+        return results
+    monkeypatch.setattr(extract_speeches, 'get_batch_results', without_second)
+
+    stats = extract_speeches.collect_batch_jobs(resolver)
+
+    assert stats['requeued'] == 1
+    context, = open_contexts(postgrest)
+    assert context['meetings'] == {MEETING_ID: {'stage': 'summarize', 'attempt': 1}}
+    assert [request['orders'] for request in context['requests'].values()] == [[2]]
+    checkpoint, = postgrest.table('speech_checkpoints')
+    assert sorted(checkpoint['summaries']) == ['1', '3', '4']
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""Tests for scrapers/councillors.py"""
+from conftest import fixture_html
+from scrapers import councillors
+
+
+class _Page:
+    def __init__(self, text, not_modified):
+        self.text = text
+        self.not_modified = not_modified
+
+
+def test_unchanged_first_page_does_not_hide_a_changed_second_page(monkeypatch):
+    html = fixture_html('councillor_page.html')
+    # Page 1 links to a next page; page 2 is the last one and changed since the last run
+    page1 = html.replace('</body>', '<a href="?page=2">다음</a></body>')
+    page2 = html.replace('유진선', '유진선2')
+    fetched = []
+
+    def fake_fetch(url, use_cache=False, **kwargs):
+        page = int(url.rsplit('page=', 1)[1])
+        fetched.append(page)
+        return _Page(page1, True) if page == 1 else _Page(page2, False)
+
+    monkeypatch.setattr(councillors, 'fetch', fake_fetch)
+    scraped = councillors.scrape_councillors(if_changed=True)
+
+    assert fetched == [1, 2]
+    names = [c['name'] for c in scraped]
+    # Only the changed page's councillors are returned
+    assert '유진선2' in names and len(names) == len(set(names))
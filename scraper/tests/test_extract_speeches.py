@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""Checkpointed speech summarization in extract_speeches.py"""
+import pytest
+
+MEETING_ID = '00000000-0000-0000-0000-000000000001'
+
+
+def speeches(n=4):
+    return [{'order': i, 'speaker': '유진선', 'role': '의원', 'text': f'발언 내용 {i} ' * 5, 'councillor_id': None}
+            for i in range(1, n + 1)]
+
+
+@pytest.fixture
+def meeting(postgrest, extract_speeches):
+    postgrest.insert('meetings', {'id': MEETING_ID, 'title': '제1차 본회의', 'transcript_uid': 1})
+    extract_speeches.save_speech_checkpoint(MEETING_ID, speeches())
+    return postgrest
+
+
+def summarizer(failing):
+    """summarize_batch stand-in that never returns a summary for the failing orders"""
+    calls = []
+
+    async def summarize_batch(batch, semaphore):
+        calls.append([s['order'] for s in batch])
+        return {s['order']: {'summary': f"요약 {s['order']}"} for s in batch if s['order'] not in failing}
+    return summarize_batch, calls
+
+
+def test_failed_summaries_are_not_checkpointed_or_saved(meeting, extract_speeches, monkeypatch):
+    summarize_batch, _ = summarizer(failing={3})
+    monkeypatch.setattr(extract_speeches, 'summarize_batch', summarize_batch)
+
+    saved = extract_speeches.save_speeches_to_db(speeches(), MEETING_ID)
+
+    assert saved == 0
+    assert meeting.table('speeches') == []
+    assert not meeting.table('meetings')[0].get('is_processed')
+    checkpoint, = meeting.table('speech_checkpoints')
+    assert sorted(checkpoint['summaries']) == ['1', '2', '4']
+
+
+def test_resumed_run_only_resummarizes_the_failures(meeting, extract_speeches, monkeypatch):
+    summarize_batch, _ = summarizer(failing={3})
+    monkeypatch.setattr(extract_speeches, 'summarize_batch', summarize_batch)
+    extract_speeches.save_speeches_to_db(speeches(), MEETING_ID)
+
+    summarize_batch, calls = summarizer(failing=set())
+    monkeypatch.setattr(extract_speeches, 'summarize_batch', summarize_batch)
+    checkpoint = extract_speeches.resume_checkpoint(MEETING_ID)
+    saved = extract_speeches.save_speeches_to_db(checkpoint['speeches'], MEETING_ID, checkpoint['summaries'])
+
+    assert calls == [[3]]
+    assert saved == 4
+    assert all(row['summary'] for row in meeting.table('speeches'))
+    assert meeting.table('meetings')[0]['is_processed'] is True
+    assert meeting.table('speech_checkpoints') == []
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""Scraped-record fingerprints (utils/fingerprint.py) and reparse writing only changes"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import fixture_html
+from scrapers.meetings import parse_meetings_page
+from utils.archive import PageArchive
+from utils.db import upsert_meetings
+from utils.fingerprint import FINGERPRINT_COLUMN, plan_changes, record_fingerprint
+
+KEYS = ('bill_number',)
+
+
+def bill(number, title='용인시 조례안', **fields):
+    return {'bill_number': number, 'title': title, **fields}
+
+
+def stored(*records):
+    return {(r['bill_number'],): record_fingerprint(r) for r in records}
+
+
+def test_blank_and_whitespace_differences_hash_alike():
+    assert record_fingerprint(bill('BILL-1', status='발의', district=None)) == \
+        record_fingerprint(bill('BILL-1', title=' 용인시  조례안\n', status='발의', district=''))
+    assert record_fingerprint(bill('BILL-1')) == record_fingerprint(dict(bill('BILL-1'), id='x', content_hash='y'))
+    assert record_fingerprint(bill('BILL-1')) != record_fingerprint(bill('BILL-1', title='용인시 예산안'))
+
+
+def test_records_are_split_into_inserts_updates_and_skips():
+    unchanged, changed = bill('BILL-1'), bill('BILL-2')
+    scraped = [unchanged, dict(changed, status='가결'), bill('BILL-3')]
+
+    inserts, updates, skipped = plan_changes(scraped, KEYS, stored(unchanged, changed))
+
+    assert [r['bill_number'] for r in inserts] == ['BILL-3']
+    assert [r['bill_number'] for r in updates] == ['BILL-2']
+    assert skipped == 1
+    assert all(r[FINGERPRINT_COLUMN] == record_fingerprint(r) for r in inserts + updates)
+
+
+def test_last_record_with_a_key_wins():
+    scraped = [bill('BILL-1', status='발의'), bill('BILL-1', status='가결')]
+
+    inserts, updates, skipped = plan_changes(scraped, KEYS, {})
+
+    assert [r['status'] for r in inserts] == ['가결']
+    assert (updates, skipped) == ([], 0)
+
+
+def test_scraped_records_are_not_modified():
+    scraped = [bill('BILL-1')]
+
+    plan_changes(scraped, KEYS, {})
+
+    assert FINGERPRINT_COLUMN not in scraped[0]
+
+
+@pytest.fixture
+def archived_meetings(postgrest, tmp_path, monkeypatch):
+    import reparse
+
+    archive = PageArchive(str(tmp_path))
+    monkeypatch.setattr(reparse, 'get_archive', lambda: archive)
+    prefix, _ = reparse.LISTINGS['meetings']
+
+    def store(html, fetched_at):
+        archive.store(f'{prefix}?page=1', html.encode('utf-8'), fetched_at=fetched_at)
+    return reparse, store
+
+
+def reparse_meetings(reparse):
+    with ThreadPoolExecutor() as pool:
+        return reparse.reparse_listing('meetings', pool)
+
+
+def test_reparsing_an_unchanged_archive_writes_nothing(postgrest, archived_meetings):
+    reparse, store = archived_meetings
+    html = fixture_html('meetings_page.html')
+    store(html, 100.0)
+    upsert_meetings(parse_meetings_page(html))
+    postgrest.reset_counters()
+
+    rebuilt = reparse_meetings(reparse)
+
+    assert rebuilt == 10
+    assert postgrest.counters()['rows_written'] == 0
+
+
+def test_reparse_writes_only_the_rows_that_changed(postgrest, archived_meetings):
+    reparse, store = archived_meetings
+    html = fixture_html('meetings_page.html')
+    upsert_meetings(parse_meetings_page(html))
+    store(html.replace('2025.10.13', '2025.10.14'), 100.0)
+    postgrest.reset_counters()
+
+    reparse_meetings(reparse)
+
+    assert postgrest.counters()['rows_written'] == 1
+    corrected, = [row for row in postgrest.table('meetings') if row['transcript_uid'] == 8413]
+    assert corrected['meeting_date'] == '2025-10-14'
+    assert len(postgrest.table('meetings')) == 10
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""Every HTML parser backend of utils/htmlparse.py yields the same records"""
+import pytest
+
+from conftest import fixture_html
+from scrapers import bills, councillors, meetings
+from utils.htmlparse import BACKENDS, parse_scoped
+
+EXTRACTORS = [
+    ('councillor_page.html', councillors.parse_councillors_page),
+    ('meetings_page.html', meetings.parse_meetings_page),
+    ('bills_page.html', bills.parse_bills_page),
+    ('transcript_page.html', meetings.parse_transcript_html),
+    ('transcript_page.html', meetings.parse_speaker_blocks),
+]
+
+
+@pytest.mark.parametrize('fixture, extract', EXTRACTORS, ids=lambda v: getattr(v, '__name__', v))
+def test_backends_extract_identical_records(fixture, extract):
+    html = fixture_html(fixture)
+    baseline = extract(html, backend='html.parser')
+
+    assert baseline
+    for backend in BACKENDS[1:]:
+        assert extract(html, backend=backend) == baseline, backend
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_class_matches_one_of_several_classes(backend):
+    html = '<div><table class="board_list bbs_bill"><tr><td>1</td></tr></table><table class="other"></table></div>'
+
+    soup = parse_scoped(html, 'table', class_='board_list', backend=backend)
+
+    table, = soup.find_all('table')
+    assert table.find('td').get_text() == '1'
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        parse_scoped('<p></p>', 'p', backend='regex')
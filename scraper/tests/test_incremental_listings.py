@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental listing crawls (scrapers/meetings.py, scrapers/bills.py)
+
+The council listings are sorted by date, not uid: the saved meetings page
+goes 8413, 8390, 8409, 8408, 8395, ... and the bills page 3025, 3024, 3027,
+3026, ... A row uploaded late has a lower uid than rows above it and can
+land on page 2 or later. Incremental crawls therefore stop on the listing's
+sort key: the first page whose rows are all dated at or before the stored
+high-water date.
+"""
+import re
+
+import pytest
+
+from conftest import fixture_html
+from scrapers import bills, meetings
+from utils.http import extract_uid
+
+MEETING_UIDS = [8413, 8390, 8409, 8408, 8395, 8399, 8403, 8407, 8394, 8398]
+
+
+class _Page:
+    def __init__(self, text):
+        self.text = text
+        self.not_modified = False
+
+
+def _shift_uids(html, offset):
+    """Same listing page with every uid moved by offset (another page's rows)"""
+    return re.sub(r'uid=(\d+)', lambda m: f"uid={int(m.group(1)) + offset}", html)
+
+
+def _serve(monkeypatch, module, pages):
+    """Answer listing requests from {page number: html}; later pages are empty"""
+    empty = re.sub(r'(<table[^>]*>.*?</tr>).*?(</table>)', r'\1\2',
+                   pages[1], count=1, flags=re.DOTALL)
+    fetched = []
+
+    def fake_fetch(url, use_cache=False, **kwargs):
+        page = int(url.rsplit('page=', 1)[1])
+        fetched.append(page)
+        return _Page(pages.get(page, empty))
+
+    monkeypatch.setattr(module, 'fetch', fake_fetch)
+    return fetched
+
+
+def test_fixture_listing_is_not_sorted_by_uid():
+    uids = [m['transcript_uid'] for m in meetings.parse_meetings_page(fixture_html('meetings_page.html'))]
+    assert uids == MEETING_UIDS
+    assert uids != sorted(uids, reverse=True)
+
+
+def test_late_meeting_below_newer_uids_is_scraped(postgrest, monkeypatch):
+    page1 = fixture_html('meetings_page.html')
+    fetched = _serve(monkeypatch, meetings, {1: page1, 2: _shift_uids(page1, -1000)})
+
+    # 8390 was uploaded late with a lower uid; page 1 is all at or before the mark
+    scraped = meetings.scrape_meetings(max_pages=10, high_water_date='2025-10-13')
+
+    assert 8390 in [m['transcript_uid'] for m in scraped]
+    assert fetched == [1]
+
+
+def test_crawl_goes_on_while_a_page_has_meetings_newer_than_the_mark(postgrest, monkeypatch):
+    page1 = fixture_html('meetings_page.html')
+    page2 = _shift_uids(page1, -1000).replace('2025.10.13', '2025.09.12')
+    fetched = _serve(monkeypatch, meetings, {1: page1, 2: page2, 3: _shift_uids(page1, -2000)})
+
+    scraped = meetings.scrape_meetings(max_pages=10, high_water_date='2025-09-30')
+
+    # Page 1 has the 2025-10-13 meeting; page 2 is all older and ends the crawl
+    assert fetched == [1, 2]
+    assert len(scraped) == 2 * len(MEETING_UIDS)
+
+
+def test_nightly_run_saves_late_meeting_and_keeps_date_mark(postgrest, monkeypatch):
+    page1 = fixture_html('meetings_page.html')
+    fetched = _serve(monkeypatch, meetings, {1: page1})
+    postgrest.insert('crawl_state', {'listing': 'meetings', 'high_water_date': '2025-10-13'})
+    postgrest.insert('meetings', [{'title': '회의', 'meeting_date': '2025-09-01', 'transcript_uid': uid}
+                                  for uid in MEETING_UIDS if uid != 8390])
+
+    meetings.run()
+
+    assert fetched == [1]
+    saved = {m['transcript_uid']: m for m in postgrest.table('meetings')}
+    assert saved[8390]['meeting_date'] == '2025-09-19'
+    assert postgrest.table('crawl_state')[0]['high_water_date'] == '2025-10-13'
+
+
+def test_nightly_run_advances_the_mark_after_saving(postgrest, monkeypatch):
+    page1 = fixture_html('meetings_page.html')
+    _serve(monkeypatch, meetings, {1: page1, 2: _shift_uids(page1, -1000).replace('2025.10.13', '2025.09.12')})
+    postgrest.insert('crawl_state', {'listing': 'meetings', 'high_water_date': '2025-09-30'})
+
+    meetings.run()
+
+    assert len(postgrest.table('meetings')) == 2 * len(MEETING_UIDS)
+    assert postgrest.table('crawl_state')[0]['high_water_date'] == '2025-10-13'
+
+
+def test_late_bill_with_lower_uid_is_scraped(postgrest, monkeypatch):
+    page1 = fixture_html('bills_page.html')
+    parsed = bills.parse_bills_page(page1)
+    assert [extract_uid(b['bill_url']) for b in parsed][:4] == [3025, 3024, 3027, 3026]
+
+    fetched = _serve(monkeypatch, bills, {1: page1})
+    # 3024 (BILL-165) sits below 3025 and above 3027
+    scraped = bills.scrape_bills(max_pages=10, high_water_date='2025-09-19')
+
+    assert 'BILL-165' in [b['bill_number'] for b in scraped]
+    assert fetched == [1]
+
+
+@pytest.mark.parametrize('module, scrape', [(meetings, meetings.scrape_meetings), (bills, bills.scrape_bills)])
+def test_unchanged_page_ends_an_incremental_crawl(postgrest, monkeypatch, module, scrape):
+    html = fixture_html('meetings_page.html' if module is meetings else 'bills_page.html')
+    fetched = []
+
+    def fake_fetch(url, use_cache=False, **kwargs):
+        page = int(url.rsplit('page=', 1)[1])
+        fetched.append(page)
+        response = _Page(_shift_uids(html, -1000 * page) if page < 3 else '<html></html>')
+        response.not_modified = page == 1
+        return response
+
+    monkeypatch.setattr(module, 'fetch', fake_fetch)
+
+    # The run that cached page 1 saved its rows and moved the mark past them
+    assert scrape(max_pages=10, high_water_date='2025-01-01', if_changed=True) == []
+    assert fetched == [1]
+
+    # A crawl without a mark skips the unchanged page and reads on
+    fetched.clear()
+    assert scrape(max_pages=10, if_changed=True)
+    assert fetched == [1, 2, 3]
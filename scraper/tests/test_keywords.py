@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""Tests for the noun heuristics of utils/keywords.py"""
+import pytest
+
+from conftest import fixture_html
+from scrapers.meetings import parse_transcript_html
+from utils.keywords import noun, noun_terms
+
+
+def test_transcript_terms_contain_no_verb_or_adverb_forms():
+    terms = set(noun_terms(parse_transcript_html(fixture_html('transcript_page.html'))))
+
+    for form in ('되었으므', '없으므', '나오셔서', '대하여', '등을', '많은', '그럼', '바로'):
+        assert not any(form in term.split() for term in terms), form
+    assert {'의사일정', '임시회', '협의', '추가경정예산'} <= terms
+
+
+@pytest.mark.parametrize('word, expected', [
+    ('검토하였으므로', '검토'),
+    ('대하여', None),
+    ('위하여', None),
+    ('없으므로', None),
+    ('나오셔서', None),
+    ('등을', None),
+    ('것이', None),
+    ('예산을', '예산'),
+    # One-syllable endings and particles only come off longer words
+    ('제한', '제한'),
+    ('역할', '역할'),
+    ('제도', '제도'),
+    ('건의', '건의'),
+])
+def test_noun(word, expected):
+    assert noun(word)[0] == expected
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Content-hash Claude reply cache (utils/llmcache.py)"""
+import pytest
+
+from utils import llmcache
+from utils.llmcache import LLMCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llmcache.time, 'time', clock)
+    return clock
+
+
+def cache(tmp_path, **kwargs):
+    kwargs.setdefault('max_bytes', 1024 * 1024)
+    kwargs.setdefault('max_age_days', 30)
+    return LLMCache(str(tmp_path), enabled=True, **kwargs)
+
+
+def test_reply_is_keyed_by_model_template_and_input(tmp_path, clock):
+    llm = cache(tmp_path)
+    llm.put('haiku', 'summary-v1', {'text': '발언'}, {'summary': '요약'})
+
+    assert llm.get('haiku', 'summary-v1', {'text': '발언'}) == {'summary': '요약'}
+    assert llm.get('sonnet', 'summary-v1', {'text': '발언'}) is None
+    assert llm.get('haiku', 'summary-v2', {'text': '발언'}) is None
+    assert llm.get('haiku', 'summary-v1', {'text': '다른 발언'}) is None
+    assert (llm.hits, llm.misses, llm.writes) == (1, 3, 1)
+    assert llm.stats()['hit_rate'] == 0.25
+
+
+def test_entries_survive_a_restart(tmp_path, clock):
+    cache(tmp_path).put('haiku', 'summary-v1', {'text': '발언'}, {'summary': '요약'})
+
+    assert cache(tmp_path).get('haiku', 'summary-v1', {'text': '발언'}) == {'summary': '요약'}
+
+
+def test_expired_entries_are_evicted(tmp_path, clock):
+    llm = cache(tmp_path, max_age_days=1)
+    llm.put('haiku', 'summary-v1', 'old', 'old reply')
+    clock.now += 86400 / 2
+    llm.put('haiku', 'summary-v1', 'new', 'new reply')
+    clock.now += 86400 / 2 + 1
+
+    llm.evict()
+
+    assert llm.get('haiku', 'summary-v1', 'old') is None
+    assert llm.get('haiku', 'summary-v1', 'new') == 'new reply'
+
+
+def test_least_recently_used_entries_go_first_over_the_size_limit(tmp_path, clock):
+    reply = 'x' * 100
+    llm = cache(tmp_path, max_bytes=350)
+    for name in ('a', 'b', 'c'):
+        llm.put('haiku', 'summary-v1', name, reply)
+        clock.now += 1
+    llm.get('haiku', 'summary-v1', 'a')
+    clock.now += 1
+    llm.put('haiku', 'summary-v1', 'd', reply)
+
+    llm.evict()
+
+    assert llm.stats()['entries'] == 3
+    assert llm.get('haiku', 'summary-v1', 'b') is None
+    assert all(llm.get('haiku', 'summary-v1', name) == reply for name in ('a', 'c', 'd'))
+
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    llm = LLMCache(str(tmp_path / 'llm'), enabled=False)
+    llm.put('haiku', 'summary-v1', 'text', 'reply')
+
+    assert llm.get('haiku', 'summary-v1', 'text') is None
+    assert not (tmp_path / 'llm').exists()
+    assert llm.stats()['entries'] == 0
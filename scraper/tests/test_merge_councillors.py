@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""merge_councillors.py against the duplicate shape the unique (name, term_number) key leaves"""
+from conftest import fixture_html
+from merge_councillors import merge_councillors
+from scrapers.councillors import parse_councillors_page
+from utils.db import upsert_councillors
+
+
+def seed(postgrest):
+    """Current councillors from the fixture, plus legacy rows of two of them without a term"""
+    scraped, _ = parse_councillors_page(fixture_html('councillor_page.html'))
+    upsert_councillors(scraped)
+    current = {row['name']: row['id'] for row in postgrest.table('councillors')}
+
+    names = list(current)[:2]
+    legacy = {}
+    for name in names:
+        row, = postgrest.insert('councillors', {'name': name, 'term_number': None,
+                                                'created_at': '2025-10-01T00:00:00'})
+        legacy[name] = row['id']
+
+    postgrest.insert('speeches', [{'meeting_id': 'm1', 'councillor_id': legacy[names[0]], 'speech_order': 1}])
+    postgrest.insert('votes', [
+        {'bill_id': 'b1', 'councillor_id': legacy[names[0]], 'vote': '찬성'},
+        {'bill_id': 'b1', 'councillor_id': current[names[0]], 'vote': '찬성'},
+        {'bill_id': 'b2', 'councillor_id': legacy[names[1]], 'vote': '반대'},
+    ])
+    return scraped, current, legacy
+
+
+def test_default_merges_legacy_rows_into_current_councillors(postgrest):
+    scraped, current, legacy = seed(postgrest)
+
+    counts = merge_councillors()
+
+    assert counts['councillors'] == {'deleted': 2}
+    assert counts['votes'] == {'moved': 1, 'dropped': 1}
+    assert {row['id'] for row in postgrest.table('councillors')} == set(current.values())
+    assert len(postgrest.table('councillors')) == len(scraped)
+    speech, = postgrest.table('speeches')
+    assert speech['councillor_id'] in current.values()
+    assert {row['councillor_id'] for row in postgrest.table('votes')} <= set(current.values())
+
+
+def test_dry_run_writes_nothing(postgrest):
+    scraped, _, _ = seed(postgrest)
+
+    counts = merge_councillors(dry_run=True)
+
+    assert counts['councillors'] == {'deleted': 2}
+    assert len(postgrest.table('councillors')) == len(scraped) + 2
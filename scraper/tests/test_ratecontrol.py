@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Tests for utils/ratecontrol.py"""
+import threading
+import time
+
+from utils.ratecontrol import RateController
+
+
+def test_concurrent_fast_responses_keep_request_spacing():
+    # Fast responses raise the rate, but slots already reserved by other
+    # threads must not be pulled back onto each other
+    controller = RateController(initial_rate=20, max_rate=40, increase=5, latency_target=1.0)
+    sent = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(6):
+            controller.wait('council')
+            with lock:
+                sent.append(time.monotonic())
+            controller.record('council', status=200, latency=0.001)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    sent.sort()
+    gaps = [b - a for a, b in zip(sent, sent[1:])]
+    # Never faster than max_rate; timestamps are taken after wait() returns, so
+    # allow for a thread being descheduled in between (the bug gave ~0 gaps)
+    assert min(gaps) >= 1.0 / 40 * 0.5
+    assert controller.stats()['council']['current_rate'] == 40
+
+
+def test_backoff_pushes_next_slot_back():
+    controller = RateController(initial_rate=10, min_rate=1, backoff=0.5)
+    controller.wait('council')
+    controller.record('council', status=503)
+    start = time.monotonic()
+    controller.wait('council')
+    assert time.monotonic() - start >= 1.0 / 5 * 0.8
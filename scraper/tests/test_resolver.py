@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""In-memory councillor name resolution (utils/resolver.py)"""
+import pytest
+
+from utils.resolver import CouncillorResolver, strip_role, to_jamo
+
+COUNCILLORS = [
+    {'id': 'c1', 'name': '홍길동', 'term_number': 9, 'is_active': True},
+    {'id': 'c2', 'name': '이윤미', 'term_number': 9, 'is_active': True},
+    {'id': 'c3', 'name': '김상수', 'term_number': 9, 'is_active': True},
+    {'id': 'old', 'name': '김상수', 'term_number': 8, 'is_active': False},
+    {'id': 'c4', 'name': '김상호', 'term_number': 9, 'is_active': True},
+]
+
+
+@pytest.fixture
+def resolver():
+    return CouncillorResolver(COUNCILLORS)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('홍길동 부의장', '홍길동'),
+    ('부의장 홍길동', '홍길동'),
+    ('○부의장홍길동', '홍길동'),
+    ('위원장 이윤미', '이윤미'),
+    ('홍길동 의원', '홍길동'),
+])
+def test_strip_role_removes_the_longest_title(text, expected):
+    assert strip_role(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('홍길동', 'c1'),
+    ('홍 길동', 'c1'),
+    ('위원장 이윤미', 'c2'),
+    ('홍길동 의원 외 10인', 'c1'),
+    ('홍길동(더불어민주당)', 'c1'),
+    ('도시정책실장 박철수', None),
+])
+def test_exact_and_normalized_names(resolver, text, expected):
+    assert resolver.resolve(text) == expected
+
+
+def test_current_member_wins_over_former_namesake(resolver):
+    assert resolver.resolve('김상수') == 'c3'
+
+
+def test_near_miss_is_matched_only_when_fuzzy(resolver):
+    # 홍길둥 differs from 홍길동 in one vowel jamo (ㅜ for ㅗ)
+    assert len(to_jamo('홍길둥')) == len(to_jamo('홍길동'))
+    assert resolver.resolve('홍길둥 의원') is None
+    assert resolver.resolve('홍길둥 의원', fuzzy=True) == 'c1'
+
+
+def test_ambiguous_near_miss_is_not_guessed(resolver):
+    # 김상후 is one jamo from both 김상수 and 김상호
+    assert resolver.resolve('김상후', fuzzy=True) is None
+
+
+def test_co_sponsor_is_never_a_fallback(resolver):
+    assert resolver.resolve('박철수, 홍길동 의원') is None
+
+
+def test_each_distinct_text_is_resolved_once(resolver):
+    resolved = resolver.resolve_many(['홍길동', '홍길동', '이윤미', None, '박철수'])
+
+    assert resolved == {'홍길동': 'c1', '이윤미': 'c2', '박철수': None}
+    assert (resolver.hits, resolver.misses) == (2, 1)
+
+
+def test_speeches_are_attributed_by_speaker_or_role_and_speaker(extract_speeches, resolver):
+    speeches = [
+        {'speaker': '이윤미', 'role': '위원장', 'is_member': True},
+        {'speaker': '홍길둥', 'role': '의원', 'is_member': True},
+        {'speaker': '홍길동', 'role': '부의장', 'is_member': False},
+        {'speaker': '박철수', 'role': '도시정책실장', 'is_member': False},
+    ]
+
+    extract_speeches.attribute_speeches(speeches, resolver)
+
+    assert [s['councillor_id'] for s in speeches] == ['c2', 'c1', 'c1', None]
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""Keyset-paged table reads (utils/scan.py) and the scripts built on them"""
+import logging
+from functools import partial
+
+import pytest
+
+from utils.scan import scan_table
+
+
+@pytest.fixture
+def councillors(postgrest):
+    def insert(count, **values):
+        for i in range(count):
+            postgrest.insert('councillors', {'name': f'의원{i:02d}', 'party': '무소속', **values})
+        return sorted(row['id'] for row in postgrest.table('councillors'))
+    return insert
+
+
+def selects(postgrest, table='councillors'):
+    return postgrest.counters()['by_request'].get(('GET', table), 0)
+
+
+@pytest.mark.parametrize('count, page_size, requests', [
+    (0, 5, 1),
+    (3, 5, 2),
+    (10, 5, 3),   # the last full page is followed by one empty page
+    (11, 5, 4),
+])
+def test_every_row_is_read_once_in_key_order(postgrest, councillors, count, page_size, requests):
+    ids = councillors(count)
+    postgrest.reset_counters()
+
+    rows = list(scan_table('councillors', ['name'], page_size=page_size))
+
+    assert [r.id for r in rows] == ids
+    assert selects(postgrest) == requests
+
+
+def test_scan_is_complete_under_a_server_row_cap(postgrest, councillors):
+    ids = councillors(7)
+    postgrest.max_rows = 2
+
+    assert [r.id for r in scan_table('councillors', ['name'], page_size=5)] == ids
+
+
+def test_only_the_requested_columns_are_fetched(postgrest, councillors):
+    councillors(2, district='처인구')
+
+    row = next(scan_table('councillors', 'name, district'))
+
+    assert row._fields == ('id', 'name', 'district')
+    assert type(row).__name__ == 'CouncillorsRow'
+    assert row.district == '처인구'
+    assert not hasattr(row, 'party')
+
+
+def test_filters_and_custom_key(postgrest):
+    for uid, processed in [(3, True), (1, False), (2, False)]:
+        postgrest.insert('meetings', {'title': f'회의 {uid}', 'transcript_uid': uid, 'is_processed': processed})
+
+    rows = scan_table('meetings', ['title'], key='transcript_uid', page_size=1,
+                      filters=lambda q: q.eq('is_processed', False))
+
+    assert [(r.transcript_uid, r.title) for r in rows] == [(1, '회의 1'), (2, '회의 2')]
+
+
+def test_unusable_column_names_are_rejected(postgrest):
+    with pytest.raises(ValueError):
+        next(scan_table('councillors', ['class']))
+
+
+def test_find_duplicates_reads_councillors_in_pages(postgrest, councillors, monkeypatch, caplog):
+    import find_duplicates
+
+    councillors(5)
+    for term, created_at in ((8, '2024-01-01T00:00:00'), (9, '2025-01-01T00:00:00')):
+        postgrest.insert('councillors', {'name': '홍길동', 'term_number': term, 'created_at': created_at})
+    older = next(r['id'] for r in postgrest.table('councillors') if r.get('term_number') == 8)
+    monkeypatch.setattr(find_duplicates, 'scan_table', partial(scan_table, page_size=3))
+    postgrest.reset_counters()
+
+    with caplog.at_level(logging.INFO, logger='find_duplicates'):
+        duplicates = find_duplicates.find_duplicates()
+
+    assert duplicates == {'홍길동': 2}
+    assert selects(postgrest) == 4
+    assert f'DELETE: {older} - 홍길동' in caplog.text
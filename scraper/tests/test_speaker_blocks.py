@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Speech segmentation from transcript markup (scrapers/meetings.parse_speaker_blocks)"""
+import pytest
+
+from conftest import fixture_html
+from scrapers.meetings import parse_speaker_blocks
+
+
+def page(*blocks):
+    return '<html><body><div id="minutes-body">' + ''.join(blocks) + '</div></body></html>'
+
+
+def block(header, text):
+    return f'<div class="contents-block speaker-block">{header}\n{text}</div>'
+
+
+def test_fixture_transcript_is_segmented_in_page_order():
+    speeches = parse_speaker_blocks(fixture_html('transcript_page.html'))
+
+    assert [(s['order'], s['speaker'], s['role']) for s in speeches] == [
+        (1, '이윤미', '위원장'), (2, '이윤미', '위원장'), (3, '기주옥', '의원'), (4, '이윤미', '위원장'),
+    ]
+    assert all(s['is_member'] and s['text'] for s in speeches)
+    assert speeches[0]['text'].startswith('의석을')
+
+
+@pytest.mark.parametrize('header, speaker, role, is_member', [
+    ('<strong>○부의장 <a class="member_profile">김상수</a></strong>', '김상수', '부의장', True),
+    ('<strong>○홍길동 의원</strong>', '홍길동', '의원', False),
+    ('<strong>○도시정책실장 박철수</strong>', '박철수', '도시정책실장', False),
+])
+def test_speaker_and_role_from_header(header, speaker, role, is_member):
+    speech, = parse_speaker_blocks(page(block(header, '발언 내용입니다.')))
+
+    assert (speech['speaker'], speech['role'], speech['is_member']) == (speaker, role, is_member)
+    assert speech['text'] == '발언 내용입니다.'
+
+
+def test_procedural_and_empty_blocks_are_skipped():
+    speeches = parse_speaker_blocks(page(
+        '<div class="contents-block speaker-block">(10시 02분 개의)</div>',
+        block('<strong>○위원장 <a class="member_profile">이윤미</a></strong>', ''),
+        block('<strong>○위원장 <a class="member_profile">이윤미</a></strong>', '개의를 선포합니다.'),
+    ))
+
+    assert [(s['order'], s['text']) for s in speeches] == [(1, '개의를 선포합니다.')]
+
+
+def test_long_transcript_is_not_truncated():
+    text = '예산 집행에 관한 질의입니다. ' * 200
+    speeches = parse_speaker_blocks(page(*(
+        block(f'<strong>○<a class="member_profile">의원{i}</a> 의원</strong>', text) for i in range(30)
+    )))
+
+    assert sum(len(s['text']) for s in speeches) > 50000
+    assert [s['order'] for s in speeches] == list(range(1, 31))
+
+
+def test_page_without_speaker_blocks_yields_no_speeches():
+    assert parse_speaker_blocks('<html><body><div id="minutes-body"><p>본문</p></div></body></html>') == []
+    assert parse_speaker_blocks('<html><body></body></html>') == []
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Packing speeches into multi-speech summary requests and splitting the replies"""
+import json
+
+import pytest
+
+
+def speech(order, chars):
+    return {'order': order, 'speaker': '유진선', 'role': '의원', 'text': '가' * chars}
+
+
+def orders(batches):
+    return [[s['order'] for s in batch] for batch in batches]
+
+
+def test_requests_fill_up_to_the_token_budget_in_order(extract_speeches):
+    speeches = [speech(i, 400) for i in range(1, 6)]
+
+    batches = extract_speeches.pack_speeches(speeches, token_budget=1000, max_speeches=10)
+
+    assert orders(batches) == [[1, 2], [3, 4], [5]]
+
+
+def test_requests_hold_at_most_max_speeches(extract_speeches):
+    speeches = [speech(i, 10) for i in range(1, 8)]
+
+    batches = extract_speeches.pack_speeches(speeches, token_budget=10000, max_speeches=3)
+
+    assert orders(batches) == [[1, 2, 3], [4, 5, 6], [7]]
+
+
+def test_speech_over_the_budget_is_sent_alone(extract_speeches):
+    speeches = [speech(1, 100), speech(2, 3000), speech(3, 100)]
+
+    batches = extract_speeches.pack_speeches(speeches, token_budget=1000, max_speeches=10)
+
+    assert orders(batches) == [[1], [2], [3]]
+
+
+def test_only_the_summarized_prefix_counts_against_the_budget(extract_speeches):
+    long = extract_speeches.SPEECH_SUMMARY_CHARS
+    speeches = [speech(1, long * 3), speech(2, 100)]
+
+    batches = extract_speeches.pack_speeches(speeches, token_budget=long + 100, max_speeches=10)
+
+    assert orders(batches) == [[1, 2]]
+
+
+def test_reply_is_split_per_speech(extract_speeches):
+    reply = '```json\n' + json.dumps({'summaries': [
+        {'speech_order': 2, 'summary': ' 요약 2 '},
+        {'speech_order': '3', 'summary': '요약 3'},
+    ]}, ensure_ascii=False) + '\n```'
+
+    assert extract_speeches.parse_summaries(reply, {2, 3}) == {2: {'summary': '요약 2'}, 3: {'summary': '요약 3'}}
+
+
+def test_unrequested_and_empty_items_are_dropped(extract_speeches):
+    reply = json.dumps({'summaries': [
+        {'speech_order': 1, 'summary': '요약 1'},
+        {'speech_order': 9, 'summary': '요청하지 않은 발언'},
+        {'speech_order': 2, 'summary': '  '},
+        {'speech_order': 'x', 'summary': '번호 오류'},
+        {'speech_order': 3},
+        '요약',
+    ]}, ensure_ascii=False)
+
+    assert extract_speeches.parse_summaries(reply, {1, 2, 3}) == {1: {'summary': '요약 1'}}
+
+
+def test_bare_list_reply_is_accepted(extract_speeches):
+    reply = json.dumps([{'speech_order': 1, 'summary': '요약 1'}], ensure_ascii=False)
+
+    assert extract_speeches.parse_summaries(reply, {1}) == {1: {'summary': '요약 1'}}
+
+
+@pytest.mark.parametrize('reply', ['요약할 수 없습니다.', '{"summaries": "없음"}', '42'])
+def test_malformed_reply_yields_no_summaries(extract_speeches, reply):
+    assert extract_speeches.parse_summaries(reply, {1}) == {}
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Chunked extraction of long transcripts (chunk_transcript / merge_chunk_speeches)"""
+import pytest
+
+from utils.llm import estimate_tokens
+
+SPEAKERS = ['위원장 이윤미', '기주옥 의원', '도시정책실장 박철수']
+
+
+def turn(i, chars=300):
+    body = f'{i}번째 발언입니다. ' + '예산 집행에 관한 질의' * (chars // 10)
+    return f'○{SPEAKERS[i % len(SPEAKERS)]}\n{body}'
+
+
+def transcript(*turns):
+    return '(10시 02분 개의)\n\n' + '\n\n'.join(turns)
+
+
+def extract(chunk):
+    """Model stand-in: one speech per speaker turn in the chunk, numbered within the chunk"""
+    speeches = []
+    for i, text in enumerate(chunk['text'].split('\n\n'), 1):
+        header, _, body = text.partition('\n')
+        if header.startswith('○'):
+            speeches.append({'order': i, 'speaker': header[1:], 'text': body})
+    return speeches
+
+
+def test_chunks_end_on_speaker_boundaries_within_the_budget(extract_speeches):
+    turns = [turn(i) for i in range(12)]
+
+    chunks = extract_speeches.chunk_transcript(transcript(*turns), token_budget=1000, overlap=1)
+
+    assert len(chunks) > 2
+    assert [c['part'] for c in chunks] == list(range(1, len(chunks) + 1))
+    assert all(c['parts'] == len(chunks) for c in chunks)
+    for chunk in chunks:
+        assert estimate_tokens(chunk['text']) <= 1000
+        assert chunk['text'].startswith(('○', '(10시'))
+        assert not chunk['continued']
+    assert all(t in ''.join(c['text'] for c in chunks) for t in turns)
+
+
+def test_next_chunk_repeats_the_previous_turn(extract_speeches):
+    chunks = extract_speeches.chunk_transcript(transcript(*(turn(i) for i in range(12))),
+                                               token_budget=1000, overlap=1)
+
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk['overlap'] == 1
+        assert chunk['text'].split('\n\n')[0] == previous['text'].split('\n\n')[-1]
+
+
+def test_short_transcript_is_one_chunk(extract_speeches):
+    text = transcript(turn(0), turn(1))
+
+    chunk, = extract_speeches.chunk_transcript(text, token_budget=5000)
+
+    assert chunk['text'] == text.strip()
+    assert (chunk['part'], chunk['parts'], chunk['overlap']) == (1, 1, 0)
+
+
+def test_long_turn_is_split_on_lines_with_its_speaker(extract_speeches):
+    long_turn = '○기주옥 의원\n' + '\n'.join(f'{i}번 질의입니다. ' + '가' * 100 for i in range(30))
+
+    chunks = extract_speeches.chunk_transcript(transcript(turn(0), long_turn, turn(2)),
+                                               token_budget=1000, overlap=1)
+
+    pieces = [c for c in chunks if '번 질의입니다' in c['text']]
+    assert len(pieces) > 2
+    assert all('○기주옥 의원\n' in c['text'] for c in pieces)
+    assert [c['continued'] for c in pieces] == [False] + [True] * (len(pieces) - 1)
+    assert all(c['overlap'] == 0 for c in pieces[1:])
+
+
+@pytest.mark.parametrize('overlap', [0, 1, 2])
+def test_merged_speeches_match_the_transcript_once_in_order(extract_speeches, overlap):
+    turns = [turn(i) for i in range(12)]
+    chunks = extract_speeches.chunk_transcript(transcript(*turns), token_budget=1000, overlap=overlap)
+
+    merged = extract_speeches.merge_chunk_speeches(chunks, [extract(c) for c in chunks])
+
+    assert [s['text'] for s in merged] == [t.partition('\n')[2] for t in turns]
+    assert [s['order'] for s in merged] == list(range(1, 13))
+
+
+def test_continued_piece_is_joined_to_the_split_speech(extract_speeches):
+    long_body = '\n'.join(f'{i}번 질의입니다. ' + '가' * 100 for i in range(30))
+    turns = [turn(0), '○기주옥 의원\n' + long_body, turn(2)]
+    chunks = extract_speeches.chunk_transcript(transcript(*turns), token_budget=1000, overlap=1)
+
+    merged = extract_speeches.merge_chunk_speeches(chunks, [extract(c) for c in chunks])
+
+    assert [s['speaker'] for s in merged] == ['위원장 이윤미', '기주옥 의원', '도시정책실장 박철수']
+    assert merged[1]['text'] == long_body
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""utils/db.upsert_changed writes every scraped row, matched by natural key where it has one"""
+from conftest import fixture_html
+from scrapers.meetings import parse_meetings_page
+from utils.db import upsert_meetings
+
+
+def test_meetings_without_transcript_uid_are_inserted(postgrest):
+    scraped = parse_meetings_page(fixture_html('meetings_page.html'))
+    keyless = {'title': '제1차 본회의', 'meeting_date': '2025-10-14', 'meeting_type': '본회의'}
+
+    stats = upsert_meetings(scraped + [keyless])
+
+    assert stats == {'inserted': len(scraped) + 1, 'updated': 0, 'skipped': 0}
+    rows = postgrest.table('meetings')
+    assert len(rows) == len(scraped) + 1
+    stored, = [row for row in rows if row.get('transcript_uid') is None]
+    assert stored['title'] == '제1차 본회의' and stored['content_hash']
+
+
+def test_rescraped_keyed_meetings_are_skipped(postgrest):
+    scraped = parse_meetings_page(fixture_html('meetings_page.html'))
+    upsert_meetings(scraped)
+
+    stats = upsert_meetings(scraped)
+
+    assert stats == {'inserted': 0, 'updated': 0, 'skipped': len(scraped)}
+    assert len(postgrest.table('meetings')) == len(scraped)
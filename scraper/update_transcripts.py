@@ -3,8 +3,9 @@
 Update existing meetings with full transcript text
 """
 from utils.db import get_supabase_client
-from scrapers.meetings import scrape_transcript_text
-import time
+from utils.fetcher import fetch_all
+from utils.ratecontrol import get_rate_controller
+from scrapers.meetings import parse_transcript_html
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -25,38 +26,33 @@ def update_meeting_transcripts(limit=5):
     meetings = response.data
     logger.info(f"Found {len(meetings)} meetings without transcript text")
 
-    updated_count = 0
     for meeting in meetings:
-        try:
-            logger.info(f"\nProcessing: {meeting['title']}")
+        if not meeting.get('transcript_url'):
+            logger.warning(f"No transcript URL for meeting: {meeting['title']}")
 
-            if not meeting.get('transcript_url'):
-                logger.warning(f"No transcript URL for meeting: {meeting['title']}")
-                continue
+    def save_transcript(meeting, transcript_text):
+        if not transcript_text:
+            logger.warning(f"No transcript text extracted for: {meeting['title']}")
+            return False
 
-            # Fetch transcript text
-            transcript_text = scrape_transcript_text(meeting['transcript_url'])
+        # Update in database
+        client.table('meetings').update({
+            'transcript_text': transcript_text
+        }).eq('id', meeting['id']).execute()
 
-            if transcript_text:
-                # Update in database
-                client.table('meetings').update({
-                    'transcript_text': transcript_text
-                }).eq('id', meeting['id']).execute()
+        logger.info(f"✓ Updated: {meeting['title']} ({len(transcript_text)} chars)")
+        return True
 
-                logger.info(f"✓ Updated: {meeting['title']} ({len(transcript_text)} chars)")
-                updated_count += 1
-            else:
-                logger.warning(f"No transcript text extracted for: {meeting['title']}")
-
-            # Delay between requests
-            time.sleep(2)
-
-        except Exception as e:
-            logger.error(f"Error updating meeting {meeting['title']}: {e}")
-            continue
+    stats = fetch_all(
+        meetings,
+        get_url=lambda m: m.get('transcript_url'),
+        parse=parse_transcript_html,
+        store=save_transcript,
+    )
 
     logger.info(f"\n=== Update complete ===")
-    logger.info(f"Updated {updated_count}/{len(meetings)} meetings")
+    logger.info(f"Updated {stats['success']}/{len(meetings)} meetings")
+    get_rate_controller().log_stats()
 
 if __name__ == "__main__":
     # Update all meetings without transcript text
@@ -0,0 +1,226 @@
+"""
+Content-addressed archive of every fetched council page
+
+Each successful fetch through utils/http.fetch() is recorded here so that
+changes to the parsers can be replayed over history (main.py --reparse)
+without crawling the site again.
+
+Layout:
+    ARCHIVE_DIR/objects/<sha256[:2]>/<sha256>.gz   gzip-compressed body, stored once per content
+    ARCHIVE_DIR/index.db                           sqlite index of (url, sha256) snapshots
+
+Refetching an unchanged page only moves its snapshot's last_fetched, so the
+index grows with distinct versions, not with fetches. Each URL keeps its
+ARCHIVE_KEEP_VERSIONS newest versions, and beyond ARCHIVE_MAX_MB the oldest
+superseded versions (then the oldest pages) are pruned with their objects,
+so the archive stays bounded when it is carried between CI runs.
+"""
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from config import ARCHIVE_DIR, ARCHIVE_KEEP_VERSIONS, ARCHIVE_MAX_MB
+
+logger = logging.getLogger(__name__)
+
+
+class PageArchive:
+    """Deduplicated, size-bounded page store with a URL / fetch-time index"""
+
+    def __init__(self, directory: str = ARCHIVE_DIR, keep_versions: int = ARCHIVE_KEEP_VERSIONS,
+                 max_bytes: int = ARCHIVE_MAX_MB * 1024 * 1024):
+        self.directory = directory
+        self.keep_versions = keep_versions
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, 'index.db'), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                url TEXT NOT NULL,
+                sha256 TEXT NOT NULL,
+                first_fetched REAL NOT NULL,
+                last_fetched REAL NOT NULL,
+                PRIMARY KEY (url, sha256)
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_url ON snapshots(url, last_fetched)")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS objects (
+                sha256 TEXT PRIMARY KEY,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._migrate_fetches()
+        self._db.commit()
+        self.prune()
+
+    def _migrate_fetches(self):
+        # Older archives logged one row per fetch; collapse them to one per (url, content)
+        legacy = self._db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'fetches'"
+        ).fetchone()
+        if not legacy:
+            return
+        self._db.execute("""
+            INSERT OR IGNORE INTO snapshots (url, sha256, first_fetched, last_fetched)
+            SELECT url, sha256, MIN(fetched_at), MAX(fetched_at) FROM fetches GROUP BY url, sha256
+        """)
+        for (sha256,) in self._db.execute("SELECT DISTINCT sha256 FROM fetches").fetchall():
+            path = self.object_path(sha256)
+            if os.path.exists(path):
+                self._db.execute("INSERT OR IGNORE INTO objects (sha256, size) VALUES (?, ?)",
+                                 (sha256, os.path.getsize(path)))
+        self._db.execute("DROP TABLE fetches")
+        logger.info("Collapsed the page archive index to one row per (url, content)")
+
+    def object_path(self, sha256: str) -> str:
+        return os.path.join(self.directory, 'objects', sha256[:2], f"{sha256}.gz")
+
+    def store(self, url: str, body: bytes, fetched_at: float = None) -> str:
+        """
+        Archive one fetched page
+
+        Args:
+            url: Final request URL
+            body: Raw response body
+            fetched_at: Unix timestamp (default: now)
+
+        Returns:
+            sha256 of the body
+        """
+        sha256 = hashlib.sha256(body).hexdigest()
+        path = self.object_path(sha256)
+        fetched_at = fetched_at or time.time()
+
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with gzip.open(tmp_path, 'wb') as f:
+                    f.write(body)
+                os.replace(tmp_path, path)
+
+            self._db.execute("INSERT OR IGNORE INTO objects (sha256, size) VALUES (?, ?)",
+                             (sha256, os.path.getsize(path)))
+            self._db.execute("""
+                INSERT INTO snapshots (url, sha256, first_fetched, last_fetched) VALUES (?, ?, ?, ?)
+                ON CONFLICT (url, sha256) DO UPDATE SET last_fetched = MAX(last_fetched, excluded.last_fetched)
+            """, (url, sha256, fetched_at, fetched_at))
+
+            # Versions beyond keep_versions of this URL
+            self._db.execute("""
+                DELETE FROM snapshots WHERE url = ? AND sha256 NOT IN (
+                    SELECT sha256 FROM snapshots WHERE url = ? ORDER BY last_fetched DESC LIMIT ?
+                )
+            """, (url, url, self.keep_versions))
+            if self._db.execute("SELECT changes()").fetchone()[0]:
+                self._drop_orphans()
+            self._db.commit()
+
+        self.prune()
+        return sha256
+
+    def _drop_object(self, sha256: str):
+        self._db.execute("DELETE FROM objects WHERE sha256 = ?", (sha256,))
+        if os.path.exists(self.object_path(sha256)):
+            os.remove(self.object_path(sha256))
+
+    def _drop_orphans(self):
+        """Delete objects no snapshot refers to (caller holds the lock)"""
+        for (sha256,) in self._db.execute(
+            "SELECT sha256 FROM objects WHERE sha256 NOT IN (SELECT sha256 FROM snapshots)"
+        ).fetchall():
+            self._drop_object(sha256)
+
+    def prune(self):
+        """Drop the oldest snapshots until the objects fit in max_bytes
+
+        Superseded versions go first; a URL's newest version only once none are left.
+        """
+        with self._lock:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            victims = self._db.execute("""
+                SELECT url, sha256 FROM snapshots s
+                ORDER BY last_fetched = (SELECT MAX(last_fetched) FROM snapshots WHERE url = s.url),
+                         last_fetched
+            """).fetchall()
+            dropped = 0
+            for url, sha256 in victims:
+                if total <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM snapshots WHERE url = ? AND sha256 = ?", (url, sha256))
+                dropped += 1
+                if not self._db.execute("SELECT 1 FROM snapshots WHERE sha256 = ?", (sha256,)).fetchone():
+                    total -= self._db.execute("SELECT size FROM objects WHERE sha256 = ?", (sha256,)).fetchone()[0]
+                    self._drop_object(sha256)
+            self._db.commit()
+
+        logger.debug(f"Pruned {dropped} archived pages to stay under {self.max_bytes} bytes")
+
+    def load(self, sha256: str) -> bytes:
+        """Read an archived body by its hash"""
+        with gzip.open(self.object_path(sha256), 'rb') as f:
+            return f.read()
+
+    def history(self, url: str) -> list:
+        """Distinct (fetched_at, sha256) versions of one URL, oldest first (fetched_at: last fetch)"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT last_fetched, sha256 FROM snapshots WHERE url = ? ORDER BY last_fetched", (url,)
+            ).fetchall()
+
+    def snapshots(self, url_prefix: str = '') -> list:
+        """
+        Every distinct (url, content) snapshot under url_prefix
+
+        Returns:
+            List of (url, fetched_at, sha256) tuples, oldest first; repeated fetches
+            of identical content are collapsed to the newest one
+        """
+        with self._lock:
+            return self._db.execute("""
+                SELECT url, last_fetched, sha256
+                FROM snapshots
+                WHERE substr(url, 1, ?) = ?
+                ORDER BY last_fetched
+            """, (len(url_prefix), url_prefix)).fetchall()
+
+    def latest(self, url_prefix: str = '') -> list:
+        """
+        Newest snapshot of every URL starting with url_prefix
+
+        Returns:
+            List of (url, fetched_at, sha256) tuples ordered by url
+        """
+        with self._lock:
+            return self._db.execute("""
+                SELECT url, MAX(last_fetched), sha256
+                FROM snapshots
+                WHERE substr(url, 1, ?) = ?
+                GROUP BY url
+                ORDER BY url
+            """, (len(url_prefix), url_prefix)).fetchall()
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> PageArchive:
+    """Return the process-wide page archive"""
+    global _archive
+
+    if _archive is None:
+        with _archive_lock:
+            if _archive is None:
+                _archive = PageArchive()
+    return _archive
@@ -1,32 +1,149 @@
 """
 Database utility functions for Supabase operations
+
+One Supabase client is shared by the whole process (and one async client per
+event loop), so every query reuses the same pooled HTTP/2 connections instead
+of building a client and opening a connection per call.
 """
-from supabase import create_client, Client
+from supabase import create_client, acreate_client, Client, AsyncClient
 from config import SUPABASE_URL, SUPABASE_KEY
+from utils.fingerprint import FINGERPRINT_COLUMN, plan_changes, record_fingerprint
+import asyncio
 import logging
+import os
+import threading
+import weakref
+from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
-def get_supabase_client() -> Client:
-    """Create and return Supabase client"""
+_client = None
+_client_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> Task resolving to AsyncClient
+
+def _check_credentials():
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise ValueError("Supabase credentials not found in environment variables")
 
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
+def get_supabase_client() -> Client:
+    """Return the process-wide Supabase client (created on first use, thread-safe)"""
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _check_credentials()
+                _client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    return _client
+
+async def get_async_supabase_client() -> AsyncClient:
+    """
+    Return the async Supabase client of the running event loop
+
+    Use with asyncio.gather() to issue independent DB writes concurrently:
+        client = await get_async_supabase_client()
+        await asyncio.gather(*(client.table('meetings').update(...).eq('id', i).execute() for i in ids))
+    """
+    loop = asyncio.get_running_loop()
+    task = _async_clients.get(loop)
+    if task is None:
+        _check_credentials()
+        # Concurrent first callers await the same construction
+        task = loop.create_task(acreate_client(SUPABASE_URL, SUPABASE_KEY))
+        _async_clients[loop] = task
+    return await task
+
+def _reset_after_fork():
+    # A forked worker must not share the parent's connection pool
+    global _client, _client_lock
+    _client = None
+    _client_lock = threading.Lock()
+    _async_clients.clear()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+# Natural key of each scraped table: UNIQUE in the schema, used as upsert on_conflict
+NATURAL_KEYS = {
+    'councillors': ('name', 'term_number'),
+    'meetings': ('transcript_uid',),
+    'bills': ('bill_number',),
+}
+KEY_LOOKUP_CHUNK = 50  # natural keys per in.() filter (bounds the URL length)
+
+def stored_fingerprints(table: str, keys: tuple, records: list) -> dict:
+    """
+    Content hashes of the stored rows sharing a natural key with some records
+
+    Returns:
+        {natural key tuple: content_hash}
+    """
+    client = get_supabase_client()
+    values = list(dict.fromkeys(r[keys[0]] for r in records))
+    columns = ', '.join(tuple(keys) + (FINGERPRINT_COLUMN,))
+
+    stored = {}
+    for start in range(0, len(values), KEY_LOOKUP_CHUNK):
+        response = client.table(table).select(columns)\
+            .in_(keys[0], values[start:start + KEY_LOOKUP_CHUNK])\
+            .execute()
+        for row in response.data:
+            stored[tuple(row[k] for k in keys)] = row[FINGERPRINT_COLUMN]
+    return stored
+
+def upsert_changed(table: str, records: list) -> dict:
+    """
+    Write only the records that are new or differ from their stored row
+
+    Records are fingerprinted and matched to stored rows by the table's
+    natural key. New and changed ones are written with upsert ON CONFLICT
+    on that key, so a rerun (or a concurrent one) never duplicates a row;
+    unchanged ones are skipped (no write, no updated_at bump). Records
+    without a natural key (e.g. a meeting whose title has no transcript
+    link) cannot be matched to a stored row, so they are inserted as-is
+    with a warning; scraping them again inserts them again.
+
+    Args:
+        table: 'councillors', 'meetings' or 'bills'
+        records: Scraped rows (without ids)
+
+    Returns:
+        {"inserted", "updated", "skipped"} row counts
+    """
+    client = get_supabase_client()
+    keys = NATURAL_KEYS[table]
+    keyed = [r for r in records if r.get(keys[0]) is not None]
+    keyless = [dict(r, **{FINGERPRINT_COLUMN: record_fingerprint(r)}) for r in records if r.get(keys[0]) is None]
+
+    inserts, updates, skipped = plan_changes(keyed, keys, stored_fingerprints(table, keys, keyed))
+
+    # One request per column set, so columns a row lacks keep their stored values
+    changed = inserts + updates
+    for columns in dict.fromkeys(tuple(sorted(r)) for r in changed):
+        client.table(table)\
+            .upsert([r for r in changed if tuple(sorted(r)) == columns], on_conflict=','.join(keys))\
+            .execute()
+
+    if keyless:
+        logger.warning(f"{table}: inserting {len(keyless)} rows without {keys[0]} (no natural key to match)")
+        for columns in dict.fromkeys(tuple(sorted(r)) for r in keyless):
+            client.table(table).insert([r for r in keyless if tuple(sorted(r)) == columns]).execute()
+
+    stats = {'inserted': len(inserts) + len(keyless), 'updated': len(updates), 'skipped': skipped}
+    logger.info(f"{table}: {stats['inserted']} inserted, {stats['updated']} updated, {stats['skipped']} unchanged")
+    return stats
 
 def upsert_councillors(councillors_data: list) -> dict:
     """
-    Insert or update councillor data in database
+    Insert new and update changed councillors (unchanged ones are skipped)
 
     Args:
         councillors_data: List of councillor dictionaries
 
     Returns:
-        Supabase response
+        {"inserted", "updated", "skipped"} row counts
     """
     try:
-        client = get_supabase_client()
-
         # Filter out fields that don't exist in the database schema
         allowed_fields = {'name', 'name_en', 'party', 'district', 'photo_url',
                          'term_number', 'is_active', 'email', 'phone',
@@ -42,68 +159,243 @@ def upsert_councillors(councillors_data: list) -> dict:
             if 'position' in councillor:
                 logger.debug(f"{councillor.get('name')}: position={councillor['position']}")
 
-        response = client.table('councillors').upsert(cleaned_data).execute()
-        logger.info(f"Upserted {len(cleaned_data)} councillors")
-        return response
+        return upsert_changed('councillors', cleaned_data)
     except Exception as e:
         logger.error(f"Error upserting councillors: {e}")
         raise
 
 def upsert_meetings(meetings_data: list) -> dict:
     """
-    Insert or update meeting data in database
+    Insert new and update changed meetings (unchanged ones are skipped)
 
     Args:
         meetings_data: List of meeting dictionaries
 
     Returns:
-        Supabase response
+        {"inserted", "updated", "skipped"} row counts
     """
     try:
-        client = get_supabase_client()
-        response = client.table('meetings').upsert(meetings_data).execute()
-        logger.info(f"Upserted {len(meetings_data)} meetings")
-        return response
+        return upsert_changed('meetings', meetings_data)
     except Exception as e:
         logger.error(f"Error upserting meetings: {e}")
         raise
 
 def upsert_bills(bills_data: list) -> dict:
     """
-    Insert or update bill data in database
+    Insert new and update changed bills (unchanged ones are skipped)
 
     Args:
         bills_data: List of bill dictionaries
 
+    Returns:
+        {"inserted", "updated", "skipped"} row counts
+    """
+    try:
+        return upsert_changed('bills', bills_data)
+    except Exception as e:
+        logger.error(f"Error upserting bills: {e}")
+        raise
+
+def get_councillors(columns: str = 'id, name, term_number, is_active') -> list:
+    """
+    Load every councillor in one request
+
+    Args:
+        columns: Columns to select
+
+    Returns:
+        List of councillor dictionaries
+    """
+    try:
+        client = get_supabase_client()
+        response = client.table('councillors').select(columns).execute()
+        return response.data
+    except Exception as e:
+        logger.error(f"Error loading councillors: {e}")
+        raise
+
+def get_high_water_mark(listing: str):
+    """
+    Get the newest listing date stored for an incremental listing crawl
+
+    The listings are sorted by date, so the mark uses that sort key; it only
+    tells whether the listing was crawled before (see scrapers.meetings.run).
+
+    Args:
+        listing: Listing name ('meetings', 'bills')
+
+    Returns:
+        high_water_date (ISO date string) or None if the listing was never crawled
+    """
+    try:
+        client = get_supabase_client()
+        response = client.table('crawl_state').select('high_water_date').eq('listing', listing).execute()
+
+        if response.data:
+            return response.data[0]['high_water_date']
+        return None
+    except Exception as e:
+        logger.error(f"Error getting high-water mark for {listing}: {e}")
+        raise
+
+def set_high_water_mark(listing: str, date: str) -> dict:
+    """
+    Store the newest listing date seen for an incremental listing crawl
+
+    Args:
+        listing: Listing name ('meetings', 'bills')
+        date: Newest meeting_date / proposal_date seen (ISO date)
+
     Returns:
         Supabase response
     """
     try:
         client = get_supabase_client()
-        response = client.table('bills').upsert(bills_data).execute()
-        logger.info(f"Upserted {len(bills_data)} bills")
+        response = client.table('crawl_state').upsert({
+            'listing': listing,
+            'high_water_date': date,
+            'updated_at': datetime.utcnow().isoformat()
+        }).execute()
+        logger.info(f"High-water mark for {listing}: {date}")
         return response
     except Exception as e:
-        logger.error(f"Error upserting bills: {e}")
+        logger.error(f"Error setting high-water mark for {listing}: {e}")
         raise
 
-def get_councillor_by_name(name: str) -> dict:
+def save_llm_batch(batch_id: str, request_count: int, context: dict) -> dict:
     """
-    Get councillor by name
+    Record a submitted message batch so a later run can collect it
 
     Args:
-        name: Councillor name
+        batch_id: Message Batches API id
+        request_count: Number of requests in the batch
+        context: Work needed to ingest the results (see llm_batches.context)
 
     Returns:
-        Councillor data or None
+        Supabase response
     """
     try:
         client = get_supabase_client()
-        response = client.table('councillors').select('*').eq('name', name).execute()
+        response = client.table('llm_batches').insert({
+            'id': batch_id,
+            'status': 'submitted',
+            'request_count': request_count,
+            'context': context,
+            'submitted_at': datetime.utcnow().isoformat()
+        }).execute()
+        logger.info(f"Recorded message batch {batch_id} ({request_count} requests)")
+        return response
+    except Exception as e:
+        logger.error(f"Error recording message batch {batch_id}: {e}")
+        raise
 
-        if response.data and len(response.data) > 0:
-            return response.data[0]
-        return None
+def get_open_llm_batches() -> list:
+    """
+    Get message batches that were submitted but not collected yet
+
+    Returns:
+        List of llm_batches rows, oldest first
+    """
+    try:
+        client = get_supabase_client()
+        response = client.table('llm_batches')\
+            .select('id, request_count, context, submitted_at')\
+            .eq('status', 'submitted')\
+            .order('submitted_at')\
+            .execute()
+        return response.data
+    except Exception as e:
+        logger.error(f"Error loading open message batches: {e}")
+        raise
+
+def close_llm_batch(batch_id: str, status: str = 'collected') -> dict:
+    """
+    Mark a message batch as collected (or failed)
+
+    Args:
+        batch_id: Message Batches API id
+        status: 'collected' or 'failed'
+
+    Returns:
+        Supabase response
+    """
+    try:
+        client = get_supabase_client()
+        response = client.table('llm_batches').update({
+            'status': status,
+            'collected_at': datetime.utcnow().isoformat()
+        }).eq('id', batch_id).execute()
+        logger.info(f"Message batch {batch_id}: {status}")
+        return response
+    except Exception as e:
+        logger.error(f"Error closing message batch {batch_id}: {e}")
+        raise
+
+def get_speech_checkpoint(meeting_id: str) -> dict:
+    """
+    Get the saved progress of a meeting's speech extraction
+
+    Returns:
+        speech_checkpoints row (stage, speeches, summaries, summarized, total), or None
+    """
+    try:
+        client = get_supabase_client()
+        response = client.table('speech_checkpoints')\
+            .select('stage, speeches, summaries, summarized, total')\
+            .eq('meeting_id', meeting_id)\
+            .execute()
+        return response.data[0] if response.data else None
+    except Exception as e:
+        logger.error(f"Error loading checkpoint of meeting {meeting_id}: {e}")
+        raise
+
+def save_speech_checkpoint(meeting_id: str, speeches: list, summaries: dict = None) -> dict:
+    """
+    Checkpoint a meeting's segmented speeches and the summaries finished so far
+
+    Args:
+        meeting_id: Meeting UUID
+        speeches: Segmented, attributed speeches
+        summaries: {speech_order: {"summary"}} finished so far
+
+    Returns:
+        Supabase response
+    """
+    summaries = summaries or {}
+    try:
+        client = get_supabase_client()
+        return client.table('speech_checkpoints').upsert({
+            'meeting_id': meeting_id,
+            'stage': 'summarizing' if summaries else 'segmented',
+            'speeches': speeches,
+            'summaries': {str(order): data for order, data in summaries.items()},
+            'summarized': len(summaries),
+            'total': len(speeches),
+            'updated_at': datetime.utcnow().isoformat()
+        }, on_conflict='meeting_id').execute()
+    except Exception as e:
+        logger.error(f"Error saving checkpoint of meeting {meeting_id}: {e}")
+        raise
+
+def update_speech_checkpoint(meeting_id: str, summaries: dict) -> dict:
+    """
+    Record the summaries finished so far (stage 'summarizing', summarized k/N)
+
+    Args:
+        meeting_id: Meeting UUID
+        summaries: {speech_order: {"summary"}}
+
+    Returns:
+        Supabase response
+    """
+    try:
+        client = get_supabase_client()
+        return client.table('speech_checkpoints').update({
+            'stage': 'summarizing',
+            'summaries': {str(order): data for order, data in summaries.items()},
+            'summarized': len(summaries),
+            'updated_at': datetime.utcnow().isoformat()
+        }).eq('meeting_id', meeting_id).execute()
     except Exception as e:
-        logger.error(f"Error getting councillor: {e}")
+        logger.error(f"Error updating checkpoint of meeting {meeting_id}: {e}")
         raise
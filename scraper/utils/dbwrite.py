@@ -0,0 +1,88 @@
+"""
+Retried writes to Supabase
+
+with_retries() re-sends a request that failed on a transient error
+(connection reset, timeout, serialization failure) with backoff; anything
+the database rejects is raised at once. replace_meeting_speeches() writes
+all speeches of a meeting in one transactional RPC call, which is why
+speeches are no longer buffered into insert batches: the whole meeting is
+already one request, and a rejected row fails the call instead of leaving
+a partly saved meeting behind.
+"""
+import logging
+import time
+
+import httpx
+from postgrest.exceptions import APIError
+
+from config import DB_WRITE_RETRIES
+from utils.db import get_supabase_client
+
+logger = logging.getLogger(__name__)
+
+# Postgres / PostgREST error codes worth retrying unchanged
+TRANSIENT_CODES = {
+    '40001',    # serialization_failure
+    '40P01',    # deadlock_detected
+    '53300',    # too_many_connections
+    '57014',    # query_canceled (statement timeout)
+    'PGRST000', 'PGRST001', 'PGRST002',  # PostgREST cannot reach the database
+}
+RETRY_BACKOFF = 0.5  # seconds, doubled per attempt
+
+
+def is_transient(error: Exception) -> bool:
+    """True if the same request may succeed when simply sent again"""
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, APIError):
+        # Gateway errors (502/503/504) carry no Postgres error code
+        return not error.code or error.code in TRANSIENT_CODES
+    return False
+
+
+def with_retries(operation, retries: int = DB_WRITE_RETRIES):
+    """
+    Run operation(), retrying transient errors with exponential backoff
+
+    Raises:
+        The last error, or the first non-transient one
+    """
+    for attempt in range(retries + 1):
+        try:
+            return operation()
+        except Exception as e:
+            if attempt == retries or not is_transient(e):
+                raise
+            delay = RETRY_BACKOFF * 2 ** attempt
+            logger.warning(f"Transient DB error ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def replace_meeting_speeches(meeting_id: str, rows: list, retries: int = DB_WRITE_RETRIES,
+                             client=None) -> int:
+    """
+    Replace all speeches of a meeting in one transaction
+
+    Calls the replace_meeting_speeches() database function, which deletes the
+    meeting's speeches and inserts ``rows`` atomically: if anything fails the
+    old speeches stay. The call is idempotent, so it is safe to retry.
+
+    Args:
+        meeting_id: Meeting UUID
+        rows: Speech rows (meeting_id is taken from the argument)
+        retries: Retries on transient errors
+
+    Returns:
+        Number of speeches inserted
+    """
+    client = client or get_supabase_client()
+    payload = [{k: v for k, v in row.items() if k != 'meeting_id'} for row in rows]
+    response = with_retries(
+        lambda: client.rpc('replace_meeting_speeches', {
+            'p_meeting_id': meeting_id,
+            'p_rows': payload,
+        }).execute(),
+        retries
+    )
+    return response.data if isinstance(response.data, int) else len(payload)
@@ -0,0 +1,101 @@
+"""
+Concurrent fetch engine for transcript backfills
+
+Fetches many pages with bounded concurrency. HTTP calls go through the
+shared transport (utils/http.py) on worker threads, where the adaptive (AIMD)
+rate controller paces each host: it is the only per-host limit, so
+RATE_MAX caps backfills as well. HTML parsing runs in a process pool and
+results are handed to a store callback as soon as each page completes.
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from config import FETCH_CONCURRENCY
+from utils.http import fetch, discard_cached
+
+logger = logging.getLogger(__name__)
+
+
+async def _fetch_parse_store(item, get_url, parse, store, semaphore,
+                             io_pool, parse_pool, stats, use_cache):
+    loop = asyncio.get_running_loop()
+    url = get_url(item)
+
+    if not url:
+        stats['skipped'] += 1
+        return
+
+    async with semaphore:
+        try:
+            response = await loop.run_in_executor(io_pool, partial(fetch, url, use_cache=use_cache))
+        except Exception as e:
+            logger.error(f"  ❌ Fetch failed {url}: {e}")
+            stats['errors'] += 1
+            return
+
+    if response.not_modified:
+        stats['unchanged'] += 1
+        return
+
+    try:
+        result = await loop.run_in_executor(parse_pool, parse, response.text)
+        stored = await loop.run_in_executor(io_pool, store, item, result)
+    except Exception as e:
+        logger.error(f"  ❌ Error processing {url}: {e}")
+        stored = None
+        stats['errors'] += 1
+
+    if stored:
+        stats['success'] += 1
+        return
+
+    if stored is not None:
+        stats['empty'] += 1
+    if use_cache:
+        # Not saved downstream, so it must not count as unchanged next time
+        discard_cached(url)
+
+
+async def run_fetch_jobs(items, get_url, parse, store, concurrency: int = None,
+                         use_cache: bool = False) -> dict:
+    """
+    Fetch, parse and store every item concurrently
+
+    Args:
+        items: Work items (e.g. meeting rows)
+        get_url: item -> URL to fetch (falsy URL skips the item)
+        parse: html -> result; must be a picklable top-level function (runs in a process pool)
+        store: (item, result) -> bool; called on a worker thread as soon as a page is parsed
+        concurrency: Max in-flight requests (default: config.FETCH_CONCURRENCY);
+            requests to one host are still paced by utils/ratecontrol.py
+        use_cache: Revalidate against the response cache; unchanged pages skip parse and store
+
+    Returns:
+        Stats dict with success / empty / unchanged / skipped / errors counts and elapsed seconds
+    """
+    concurrency = concurrency or FETCH_CONCURRENCY
+
+    stats = {'success': 0, 'empty': 0, 'unchanged': 0, 'skipped': 0, 'errors': 0}
+    semaphore = asyncio.Semaphore(concurrency)
+    start = time.monotonic()
+
+    logger.info(f"Fetching {len(items)} pages (concurrency={concurrency})")
+
+    with ThreadPoolExecutor(max_workers=concurrency * 2) as io_pool, \
+            ProcessPoolExecutor() as parse_pool:
+        await asyncio.gather(*(
+            _fetch_parse_store(item, get_url, parse, store, semaphore,
+                               io_pool, parse_pool, stats, use_cache)
+            for item in items
+        ))
+
+    stats['seconds'] = time.monotonic() - start
+    return stats
+
+
+def fetch_all(items, get_url, parse, store, **kwargs) -> dict:
+    """Synchronous wrapper around run_fetch_jobs for command-line scripts"""
+    return asyncio.run(run_fetch_jobs(items, get_url, parse, store, **kwargs))
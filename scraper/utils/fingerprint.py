@@ -0,0 +1,90 @@
+"""
+Change-detecting upserts for scraped records
+
+Every scraped row gets a fingerprint: the SHA-256 of its normalized fields
+(strings trimmed and whitespace-collapsed, empty values dropped, keys
+sorted). The fingerprint is stored in the row's content_hash column, so a
+later run can compare what it scraped against what is stored and send only
+rows that are new or whose fields changed. Unchanged rows cost no write and
+keep their updated_at.
+
+Stored rows are matched to scraped ones by the table's natural key (e.g.
+bill_number), which is UNIQUE in the schema: new and changed rows are
+written together in one upsert ON CONFLICT on that key. The lookups and
+writes are in utils/db.upsert_changed().
+"""
+import hashlib
+import json
+import re
+from datetime import date, datetime
+
+FINGERPRINT_COLUMN = 'content_hash'
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        value = _WHITESPACE.sub(' ', value).strip()
+        return value or None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    return value
+
+
+def record_fingerprint(record: dict, ignore=('id', FINGERPRINT_COLUMN)) -> str:
+    """
+    SHA-256 hex digest of a record's normalized fields
+
+    Fields that are missing, None or blank hash alike, so a scrape that
+    returns "" where the stored row has NULL counts as unchanged.
+    """
+    fields = {}
+    for name, value in record.items():
+        if name in ignore:
+            continue
+        value = _normalize(value)
+        if value is not None:
+            fields[name] = value
+    encoded = json.dumps(fields, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def natural_key(record, keys: tuple) -> tuple:
+    return tuple(record.get(k) for k in keys)
+
+
+def plan_changes(records: list, keys: tuple, stored: dict):
+    """
+    Split scraped records into new, changed and unchanged ones
+
+    Records get their content_hash set. Of several scraped records with the
+    same natural key, the last one wins (one upsert statement cannot touch a
+    row twice).
+
+    Args:
+        records: Scraped rows with a natural key
+        keys: Natural key columns
+        stored: {natural key tuple: content_hash} of the stored rows
+
+    Returns:
+        (inserts, updates, skipped count)
+    """
+    latest = {}
+    for record in records:
+        latest[natural_key(record, keys)] = record
+
+    inserts, updates, skipped = [], [], 0
+    for key, record in latest.items():
+        record = dict(record, **{FINGERPRINT_COLUMN: record_fingerprint(record)})
+        if key not in stored:
+            inserts.append(record)
+        elif stored[key] == record[FINGERPRINT_COLUMN]:
+            skipped += 1
+        else:
+            updates.append(record)
+    return inserts, updates, skipped
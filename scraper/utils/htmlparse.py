@@ -0,0 +1,192 @@
+"""
+Scoped HTML parsing with pluggable backends
+
+The scrapers only need one part of each page (table.normal_list,
+table.board_list, div.profile, div#minutes-body), so instead of building a
+tree of the whole document they ask parse_scoped() for that subtree. The
+returned object supports the small BeautifulSoup API the extractors use
+(find, find_all, get_text, get, [], .string), so extraction code is the same
+for every backend:
+
+    html.parser  BeautifulSoup + SoupStrainer, pure Python (original behaviour)
+    lxml         BeautifulSoup + SoupStrainer on the lxml tree builder
+    selectolax   Lexbor C parser with a thin adapter; optional dependency,
+                 falls back to lxml when not installed
+
+The backend is chosen with HTML_PARSER (config.py) or per call.
+"""
+import logging
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from config import HTML_PARSER
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('html.parser', 'lxml', 'selectolax')
+
+
+def _matches(node, name, class_=None, id=None, href=None, string=None):
+    """bs4-style filter over LexborNode wrappers (the subset the scrapers use)"""
+    if name is not None and node.name != name:
+        return False
+    if class_ is not None and class_ not in node.get('class', []):
+        return False
+    if id is not None and node.get('id') != id:
+        return False
+    if href is True and node.get('href') is None:
+        return False
+    if string is not None:
+        text = node.string
+        if callable(string) and not string(text):
+            return False
+        if isinstance(string, str) and text != string:
+            return False
+    return True
+
+
+class LexborNode:
+    """Read-only BeautifulSoup-like view of a selectolax node"""
+
+    __slots__ = ('_node',)
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def name(self):
+        return self._node.tag
+
+    def get(self, key, default=None):
+        value = self._node.attributes.get(key, default)
+        if key == 'class' and value is not default:
+            # bs4 treats class as a multi-valued attribute
+            return (value or '').split()
+        return value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def _descendants(self):
+        nodes = self._node.traverse(include_text=False)
+        next(nodes)  # the node itself
+        for node in nodes:
+            if node.is_element_node:
+                yield LexborNode(node)
+
+    def find_all(self, name=None, class_=None, id=None, href=None, string=None):
+        return [n for n in self._descendants() if _matches(n, name, class_, id, href, string)]
+
+    def find(self, name=None, class_=None, id=None, href=None, string=None):
+        for n in self._descendants():
+            if _matches(n, name, class_, id, href, string):
+                return n
+        return None
+
+    def _strings(self):
+        for node in self._node.traverse(include_text=True):
+            if node.tag == '-text':
+                yield node.text_content
+
+    def get_text(self, separator='', strip=False):
+        strings = self._strings()
+        if strip:
+            strings = (s.strip() for s in strings)
+            strings = (s for s in strings if s)
+        return separator.join(strings)
+
+    @property
+    def string(self):
+        # Same rule as bs4: follow single-child chains down to one text node
+        node = self._node
+        while True:
+            children = list(node.iter(include_text=True))
+            if len(children) != 1:
+                return None
+            node = children[0]
+            if node.tag == '-text':
+                return node.text_content
+
+
+class LexborScope:
+    """The matched subtrees of one document, searchable like a scoped soup"""
+
+    def __init__(self, roots):
+        self._roots = roots
+
+    def find_all(self, name=None, **kwargs):
+        found = []
+        for root in self._roots:
+            if _matches(root, name, **kwargs):
+                found.append(root)
+            found.extend(root.find_all(name, **kwargs))
+        return found
+
+    def find(self, name=None, **kwargs):
+        found = self.find_all(name, **kwargs)
+        return found[0] if found else None
+
+
+def _css(name, class_=None, id=None):
+    selector = name
+    if class_:
+        selector += f".{class_}"
+    if id:
+        selector += f"#{id}"
+    return selector
+
+
+def _selectolax_parser():
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError:
+        return None
+    return LexborHTMLParser
+
+
+_warned_fallback = False
+
+
+def parse_scoped(html: str, name: str, class_: str = None, id: str = None, backend: str = None):
+    """
+    Parse only the elements of html matching name/class_/id
+
+    Args:
+        html: Page HTML
+        name: Tag name of the target subtree (e.g. 'table')
+        class_: Required CSS class of the target
+        id: Required id of the target
+        backend: 'html.parser', 'lxml' or 'selectolax' (default: config.HTML_PARSER)
+
+    Returns:
+        Scoped document supporting find()/find_all() over the matched subtrees
+    """
+    global _warned_fallback
+    backend = backend or HTML_PARSER
+
+    if backend == 'selectolax':
+        parser = _selectolax_parser()
+        if parser is not None:
+            tree = parser(html)
+            return LexborScope([LexborNode(n) for n in tree.css(_css(name, class_, id))])
+        if not _warned_fallback:
+            logger.warning("selectolax not installed (pip install selectolax), using lxml")
+            _warned_fallback = True
+        backend = 'lxml'
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {backend}")
+
+    attrs = {}
+    if class_:
+        # Match one class of a multi-valued attribute ("board_list bbs_bill"), which
+        # SoupStrainer does not do for plain strings while the tree is being built
+        attrs['class'] = lambda value: value is not None and class_ in (
+            value.split() if isinstance(value, str) else value
+        )
+    if id:
+        attrs['id'] = id
+    return BeautifulSoup(html, backend, parse_only=SoupStrainer(name, attrs=attrs))
@@ -0,0 +1,203 @@
+"""
+Shared HTTP transport for all council scrapers
+
+Every scraper goes through one keep-alive ``requests.Session`` so pages on
+council.yongin.go.kr reuse pooled TCP/TLS connections instead of paying a new
+handshake per request.
+"""
+import logging
+import threading
+import time
+from urllib.parse import urlsplit, parse_qs
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+
+from config import (
+    USER_AGENT, REQUEST_TIMEOUT, CONNECT_TIMEOUT,
+    HTTP_POOL_HOSTS, HTTP_POOL_MAXSIZE, HTTP_MAX_RETRIES, ARCHIVE_ENABLED
+)
+from utils.archive import get_archive
+from utils.ratecontrol import get_rate_controller, parse_retry_after, THROTTLE_STATUSES
+from utils.httpcache import get_response_cache, content_hash
+
+logger = logging.getLogger(__name__)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    """Create a pooled session with the scraper's default headers"""
+    session = requests.Session()
+
+    # urllib3 only advertises "br" / "zstd" when a decoder is installed,
+    # so the server is never offered an encoding we cannot read back.
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept-Encoding': ACCEPT_ENCODING,
+        'Connection': 'keep-alive',
+    })
+
+    # pool_block=True makes HTTP_POOL_MAXSIZE a hard per-host limit:
+    # extra callers wait for a free connection instead of opening new ones.
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_HOSTS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        pool_block=True,
+        max_retries=Retry(total=HTTP_MAX_RETRIES, connect=HTTP_MAX_RETRIES,
+                          read=0, status=0, backoff_factor=0.5),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    logger.debug(f"Created HTTP session (pool_maxsize={HTTP_POOL_MAXSIZE}, encodings={ACCEPT_ENCODING})")
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide HTTP session, creating it on first use"""
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def close_session():
+    """Close pooled connections (the next fetch opens a fresh session)"""
+    global _session
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get_timeout(read_timeout=None) -> tuple:
+    """
+    Build the (connect, read) timeout tuple used for every request
+
+    Args:
+        read_timeout: Override for the read timeout in seconds
+
+    Returns:
+        (connect_timeout, read_timeout) tuple
+    """
+    return (CONNECT_TIMEOUT, read_timeout if read_timeout is not None else REQUEST_TIMEOUT)
+
+
+def fetch(url: str, params: dict = None, timeout=None, encoding: str = 'utf-8',
+          use_cache: bool = False) -> requests.Response:
+    """
+    GET a page through the shared session
+
+    Each attempt waits for a send slot from the adaptive rate controller and
+    reports its status and latency back to it. 429/5xx responses are retried
+    up to HTTP_MAX_RETRIES times (after any Retry-After delay). Every 200
+    body is recorded in the page archive when ARCHIVE_ENABLED.
+
+    With use_cache, the request is made conditional on the cached ETag /
+    Last-Modified. A 304 is answered from the on-disk cache, and a 200 whose
+    body hashes to the cached one counts as unchanged too. Either way
+    ``response.not_modified`` is True so callers can skip parsing and writes.
+
+    Args:
+        url: Page URL
+        params: Optional query parameters
+        timeout: Optional read timeout override in seconds
+        encoding: Encoding forced onto the response text (council pages are UTF-8)
+        use_cache: Revalidate against and update the on-disk response cache
+
+    Returns:
+        requests.Response (already checked with raise_for_status), with a
+        ``not_modified`` attribute
+
+    Raises:
+        requests.RequestException: On connection errors or HTTP error status
+    """
+    controller = get_rate_controller()
+    host = urlsplit(url).netloc
+
+    cache = get_response_cache() if use_cache else None
+    cache_key = requests.Request('GET', url, params=params).prepare().url
+    entry = cache.get(cache_key) if cache else None
+
+    headers = {}
+    if entry:
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        controller.wait(host)
+        start = time.monotonic()
+        try:
+            response = get_session().get(url, params=params, headers=headers, timeout=get_timeout(timeout))
+        except (requests.Timeout, requests.ConnectionError):
+            controller.record(host, status=None)
+            raise
+
+        controller.record(
+            host,
+            status=response.status_code,
+            latency=time.monotonic() - start,
+            retry_after=parse_retry_after(response.headers.get('Retry-After')),
+        )
+
+        if response.status_code not in THROTTLE_STATUSES or attempt == HTTP_MAX_RETRIES:
+            break
+        logger.warning(f"HTTP {response.status_code} from {url}, retrying ({attempt + 1}/{HTTP_MAX_RETRIES})")
+
+    response.raise_for_status()
+    response.not_modified = False
+
+    if ARCHIVE_ENABLED and response.status_code == 200:
+        get_archive().store(cache_key, response.content)
+
+    if cache:
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+
+        if response.status_code == 304 and entry:
+            response._content = entry.read_body()
+            response.not_modified = True
+            cache.touch(cache_key, etag, last_modified)
+            logger.debug(f"Not modified (304): {url}")
+        else:
+            body_hash = content_hash(response.content)
+            if entry and entry.body_hash == body_hash:
+                response.not_modified = True
+                logger.debug(f"Not modified (same content hash): {url}")
+            cache.put(cache_key, response.content, etag, last_modified, body_hash)
+
+    if encoding:
+        response.encoding = encoding
+    return response
+
+
+def discard_cached(url: str, params: dict = None):
+    """Drop a URL from the response cache so the next fetch counts as changed"""
+    get_response_cache().discard(requests.Request('GET', url, params=params).prepare().url)
+
+
+def extract_uid(url: str):
+    """
+    Extract the numeric ``uid`` query parameter from a council URL
+
+    e.g. /viewer/minutes.do?uid=8413 or /kr/billview.do?uid=3025&page=1 -> 8413 / 3025
+
+    Returns:
+        uid as int, or None if missing
+    """
+    if not url:
+        return None
+    values = parse_qs(urlsplit(url).query).get('uid')
+    if values and values[0].isdigit():
+        return int(values[0])
+    return None
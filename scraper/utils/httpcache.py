@@ -0,0 +1,195 @@
+"""
+Persistent on-disk HTTP response cache with revalidation
+
+Stores the last body of every cached URL together with its ETag,
+Last-Modified and a SHA-256 content hash. utils/http.fetch() uses the
+validators for conditional GETs and falls back to comparing the hash when the
+server sends none, so callers can skip parsing and DB writes for pages that
+did not change.
+
+Layout:
+    HTTP_CACHE_DIR/index.db        sqlite index (url -> validators, size, timestamps)
+    HTTP_CACHE_DIR/<sha1(url)>.gz  gzip-compressed body
+"""
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from config import HTTP_CACHE_DIR, HTTP_CACHE_MAX_MB, HTTP_CACHE_MAX_AGE_DAYS
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(body: bytes) -> str:
+    """SHA-256 hex digest of a response body"""
+    return hashlib.sha256(body).hexdigest()
+
+
+class CacheEntry:
+    def __init__(self, url, etag, last_modified, body_hash, path):
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body_hash = body_hash
+        self.path = path
+
+    def read_body(self) -> bytes:
+        with gzip.open(self.path, 'rb') as f:
+            return f.read()
+
+
+class ResponseCache:
+    """Size- and age-bounded LRU cache of response bodies and validators"""
+
+    def __init__(self, directory: str = HTTP_CACHE_DIR, max_bytes: int = HTTP_CACHE_MAX_MB * 1024 * 1024,
+                 max_age_days: float = HTTP_CACHE_MAX_AGE_DAYS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, 'index.db'), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+        self.evict()
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.gz')
+
+    def get(self, url: str):
+        """
+        Look up a cached response
+
+        Returns:
+            CacheEntry or None
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, body_hash FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None or not os.path.exists(self._path(url)):
+                self.misses += 1
+                return None
+
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+            self.hits += 1
+            return CacheEntry(url, row[0], row[1], row[2], self._path(url))
+
+    def put(self, url: str, body: bytes, etag: str = None, last_modified: str = None,
+            body_hash: str = None):
+        """Store (or replace) a response body and its validators"""
+        body_hash = body_hash or content_hash(body)
+        path = self._path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+
+        with gzip.open(tmp_path, 'wb') as f:
+            f.write(body)
+        size = os.path.getsize(tmp_path)
+
+        with self._lock:
+            os.replace(tmp_path, path)
+            now = time.time()
+            self._db.execute("""
+                INSERT OR REPLACE INTO entries (url, etag, last_modified, body_hash, size, stored_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (url, etag, last_modified, body_hash, size, now, now))
+            self._db.commit()
+
+        self.evict()
+
+    def touch(self, url: str, etag: str = None, last_modified: str = None):
+        """Refresh timestamps (and validators, if the server sent new ones) after a 304"""
+        with self._lock:
+            now = time.time()
+            self._db.execute("""
+                UPDATE entries
+                SET etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified),
+                    stored_at = ?, accessed_at = ?
+                WHERE url = ?
+            """, (etag, last_modified, now, now, url))
+            self._db.commit()
+
+    def discard(self, url: str):
+        """Forget one URL (e.g. its downstream DB write failed)"""
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._db.commit()
+            if os.path.exists(self._path(url)):
+                os.remove(self._path(url))
+
+    def discard_prefix(self, prefix: str):
+        """Forget every URL starting with prefix"""
+        with self._lock:
+            urls = [r[0] for r in self._db.execute(
+                "SELECT url FROM entries WHERE substr(url, 1, ?) = ?", (len(prefix), prefix)
+            )]
+        for url in urls:
+            self.discard(url)
+
+    def evict(self):
+        """Drop entries older than max_age, then least recently used ones until under max_bytes"""
+        with self._lock:
+            expired = [r[0] for r in self._db.execute(
+                "SELECT url FROM entries WHERE stored_at < ?", (time.time() - self.max_age,)
+            )]
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+            lru = []
+            if total > self.max_bytes:
+                for url, size in self._db.execute(
+                    "SELECT url, size FROM entries ORDER BY accessed_at"
+                ):
+                    if total <= self.max_bytes:
+                        break
+                    lru.append(url)
+                    total -= size
+
+            victims = set(expired) | set(lru)
+            for url in victims:
+                self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+                if os.path.exists(self._path(url)):
+                    os.remove(self._path(url))
+            self._db.commit()
+
+        if victims:
+            logger.debug(f"Evicted {len(victims)} cached responses")
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, total = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {'entries': count, 'bytes': total, 'hits': self.hits, 'misses': self.misses}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache"""
+    global _cache
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
@@ -0,0 +1,217 @@
+"""
+Local keyword extraction for council speeches (no LLM calls)
+
+Keywords are Hangul noun n-grams ranked by TF-IDF over the speech corpus.
+There is no morphological analyzer: each eojeol (space-separated word) is
+reduced to a noun by stripping a 하다/되다 ending ("검토하겠습니다" -> "검토")
+or a particle ("예산을" -> "예산"); other predicates are dropped, as are
+bound nouns with a particle ("등을") and verbs whose stem is a single
+syllable ("대하여"). Adjacent
+nouns form n-grams when the leading ones carry no particle ("예산 집행").
+
+Counting and scoring are vectorized with pandas over all speeches at once;
+only the per-text noun split runs in Python. Document frequencies come from
+the caller, so they can be kept up to date incrementally (see
+extract_keywords.py and the keyword_terms table).
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from config import KEYWORD_COUNT, KEYWORD_MAX_NGRAM
+
+# noun + 하다/되다/시키다 conjugations; the stem before them is the noun
+VERB_ENDINGS = sorted([
+    '하겠습니다', '하였습니다', '했습니다', '합니다', '하십니까', '하겠다', '하였고', '하였다', '하였으며',
+    '하였으므로', '했으므로', '하므로', '하겠으며', '하고자', '하면서', '하도록', '하는데', '하지만', '하기에',
+    '하여서', '하기', '하여', '해서', '해야', '하고', '하는', '하면', '하며', '하게', '한다', '했다', '했고', '했던',
+    '할', '한', '해',
+    '되었습니다', '되겠습니다', '되었으므로', '되므로', '되었다', '되었고', '되어서', '되어', '됩니다', '된다',
+    '되는', '되고', '되면', '되며', '될', '된', '시키는', '시켜',
+], key=len, reverse=True)
+
+# Particles stripped from the end of a noun. Most come in pairs chosen by
+# whether the noun ends in a final consonant (예산을 / 도로를), which keeps
+# nouns like "전문가" from losing their last syllable.
+PARTICLES_AFTER_CONSONANT = (
+    '으로부터', '이라는', '이라고', '으로는', '으로도', '이나', '이며', '이고', '이랑', '으로', '과는',
+    '은', '이', '을', '과',
+)
+PARTICLES_AFTER_VOWEL = ('로부터', '라는', '라고', '로는', '로도', '와는', '랑', '로', '는', '가', '를', '와')
+PARTICLES = (
+    '에서부터', '에게서', '께서는', '에서는', '에서도', '에게는', '까지는', '부터는', '에서', '에게', '께서',
+    '까지', '부터', '처럼', '보다', '마저', '조차', '에는', '에도', '의', '에', '도', '만', '께',
+)
+
+# Nouns whose last syllable reads like a particle
+PARTICLE_LIKE_NOUNS = frozenset({
+    '경기도', '강원도', '충청도', '전라도', '경상도', '제주도', '어린이', '수도', '건의', '안도', '중도', '분만',
+})
+
+# One-syllable bound nouns: with a particle they are never keywords ("등을", "것이")
+BOUND_NOUNS = frozenset('등 것 수 때 중 점 데 바 분 건 측 곳 쪽 뿐 듯 걸 일 안 줄'.split())
+
+# Endings of words that are not nouns (predicates, connectives, honorific requests)
+PREDICATE_ENDINGS = (
+    '다', '요', '까', '죠', '는데', '지만', '면서', '도록', '려고', '어서', '아서', '여서', '셔서', '워서', '져서',
+    '와서', '봐서', '줘서', '므로', '으며', '고자', '코자', '토록', '시기', '시고', '시면', '십시오', '드리고', '드리며',
+)
+
+# Procedural and generic words of council minutes
+STOPWORDS = frozenset("""
+그리고 그러나 그래서 그런데 그러면 그러니까 하지만 또한 또는 그냥 아까 다시 계속 먼저 많이 정말 이제
+이번 지금 현재 오늘 다음 지난 올해 작년 이후 이전 그동안 여기 거기 이것 그것 저것 우리 저희 여러분
+그런 이런 저런 어떤 모든 각종 정도 부분 경우 관련 대해 대한 통해 위해 때문 해당 관계 가지 자리 내용
+사항 문제 필요 말씀 생각 질의 답변 의원 위원 위원장 의장 부의장 국장 과장 시장 감사 수고 이상
+안건 회의 상정 의석 정돈 진행 동의 의견 확인 설명 부탁 요청 질문 그럼 그러면 바로 우선 일단 특히 물론
+역시 혹시 아주 매우 모두 같이 만큼 바와 이어 많은 적은 좋은 같은 다른 새로운 있는 없는 있음 없음 관한
+대하여 위하여 통하여 드린
+""".split())
+
+_SEGMENT = re.compile(r'[가-힣]+(?:\s+[가-힣]+)*')
+
+
+def noun(word: str):
+    """
+    Reduce an eojeol to its noun
+
+    Returns:
+        (noun, bare) where bare is True if nothing was stripped,
+        or (None, False) if the word is not a noun
+    """
+    for ending in VERB_ENDINGS:
+        if not word.endswith(ending):
+            continue
+        if len(word) - len(ending) >= 2:
+            return _clean(word[:-len(ending)]), False
+        # A longer ending marks a verb even after a one-syllable stem (대하여, 하는);
+        # a single syllable may end a noun (제한, 역할, 피해)
+        if len(ending) >= 2:
+            return None, False
+    if word.endswith(PREDICATE_ENDINGS):
+        return None, False
+
+    if word in PARTICLE_LIKE_NOUNS:
+        return word, True
+    for particle in _particles(word):
+        stem = word[:-len(particle)]
+        if len(stem) >= 2:
+            return _clean(stem), False
+        if stem in BOUND_NOUNS:
+            return None, False
+    return _clean(word), True
+
+
+def _final_consonant(syllable: str) -> int:
+    """Index of the final consonant of a Hangul syllable (0: none, 8: ㄹ)"""
+    return (ord(syllable) - 0xAC00) % 28
+
+
+def _particles(word: str):
+    """Particles the word may end in, longest first"""
+    candidates = [p for p in PARTICLES if word.endswith(p)]
+    for particle in PARTICLES_AFTER_CONSONANT + PARTICLES_AFTER_VOWEL:
+        if word.endswith(particle) and len(word) > len(particle):
+            final = _final_consonant(word[-len(particle) - 1])
+            # 로 also follows a final ㄹ (서울로)
+            if bool(final) == (particle in PARTICLES_AFTER_CONSONANT) or (particle.startswith('로') and final == 8):
+                candidates.append(particle)
+    return sorted(candidates, key=len, reverse=True)
+
+
+def _clean(word: str):
+    if len(word) > 2 and word.endswith(('들', '님')):
+        word = word[:-1]
+    if len(word) < 2 or word in STOPWORDS:
+        return None
+    return word
+
+
+def noun_terms(text: str, max_n: int = KEYWORD_MAX_NGRAM) -> list:
+    """
+    Noun n-grams of a text, in order and with repeats
+
+    Only Hangul words count; digits, Latin letters and punctuation end a
+    phrase, so n-grams never span them.
+    """
+    terms = []
+    for segment in _SEGMENT.findall(text or ''):
+        words = [noun(word) for word in segment.split()]
+        for i, (term, _) in enumerate(words):
+            if term is None:
+                continue
+            terms.append(term)
+            for n in range(2, max_n + 1):
+                window = words[i:i + n]
+                if (len(window) < n or any(w is None for w, _ in window)
+                        or not all(bare for _, bare in window[:-1])):
+                    break
+                terms.append(' '.join(w for w, _ in window))
+    return terms
+
+
+def term_frequencies(texts: pd.Series, max_n: int = KEYWORD_MAX_NGRAM) -> pd.DataFrame:
+    """
+    Term counts per document
+
+    Args:
+        texts: Speech texts indexed by document id
+
+    Returns:
+        DataFrame with columns doc, term, tf (one row per term of a document)
+    """
+    terms = texts.fillna('').map(lambda text: noun_terms(text, max_n)).explode().dropna()
+    if terms.empty:
+        return pd.DataFrame({'doc': pd.Series(dtype=texts.index.dtype), 'term': pd.Series(dtype=object),
+                             'tf': pd.Series(dtype='int64')})
+    frame = pd.DataFrame({'doc': terms.index, 'term': terms.values})
+    return frame.groupby(['doc', 'term'], sort=False).size().rename('tf').reset_index()
+
+
+def document_frequencies(tf: pd.DataFrame) -> pd.Series:
+    """Number of documents containing each term (term_frequencies() rows are unique per document)"""
+    return tf['term'].value_counts()
+
+
+def inverse_document_frequencies(doc_freq: pd.Series, documents: int) -> pd.Series:
+    """Smoothed IDF: log((1 + N) / (1 + df)) + 1"""
+    return np.log((1 + documents) / (1 + doc_freq.astype(float))) + 1
+
+
+def top_keywords(tf: pd.DataFrame, idf: pd.Series, documents: int, k: int = KEYWORD_COUNT) -> pd.Series:
+    """
+    The k best keywords of each document by TF-IDF
+
+    Terms are scored (1 + log tf) * idf. A term sharing a word with a better
+    one is skipped, so "예산" is not listed next to "예산 집행".
+
+    Args:
+        tf: term_frequencies() result
+        idf: IDF per term (terms missing from it count as unseen)
+        documents: Corpus size the IDF was computed over
+
+    Returns:
+        Keyword lists indexed by document id (documents without terms are absent)
+    """
+    if tf.empty:
+        return pd.Series(dtype=object)
+
+    unseen = np.log(1 + documents) + 1
+    scored = tf.assign(score=(1 + np.log(tf['tf'])) * tf['term'].map(idf).fillna(unseen))
+    candidates = scored.sort_values(['doc', 'score', 'term'], ascending=[True, False, True])\
+        .groupby('doc', sort=False).head(k * 4)
+
+    keywords = {}
+    for doc, terms in candidates.groupby('doc', sort=False)['term']:
+        chosen, words = [], set()
+        for term in terms:
+            parts = term.split()
+            if words.intersection(parts):
+                continue
+            chosen.append(term)
+            words.update(parts)
+            if len(chosen) == k:
+                break
+        keywords[doc] = chosen
+    return pd.Series(keywords, dtype=object)
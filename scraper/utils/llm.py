@@ -0,0 +1,242 @@
+"""
+Claude API access for the AI processing scripts
+
+Async Messages API calls share one client per event loop and one
+process-wide rate limiter. The limiter keeps the request rate and the input
+token rate under the account's per-minute limits (LLM_RPM, LLM_INPUT_TPM),
+while callers bound the number of requests in flight with a semaphore, so
+many calls can run in parallel without tripping 429s.
+
+Work that does not need an answer within the run goes through the Message
+Batches API instead (submit_batch / get_batch / get_batch_results): results
+arrive within 24 hours at half the price, and nothing waits on them.
+"""
+import asyncio
+import inspect
+import json
+import logging
+import math
+import threading
+import time
+import weakref
+
+import anthropic
+
+from config import ANTHROPIC_API_KEY, LLM_RPM, LLM_INPUT_TPM
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_client_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> AsyncAnthropic
+
+# Pace a little under the configured limits: the API's bucket is refilled on
+# its own clock, so a reservation that is due exactly on time may still get a 429
+RATE_SAFETY_MARGIN = 0.9
+
+# Whether messages.create() takes temperature as an argument; some SDK builds
+# (e.g. the anthropic 1.13.0 wheel installed here) leave it out of the signature,
+# and then the same field is sent in the request body
+_CREATE_TAKES_TEMPERATURE = 'temperature' in inspect.signature(
+    anthropic.resources.messages.AsyncMessages.create).parameters
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough input token count without a tokenizer call
+
+    Hangul syllables are counted as one token each and other characters as a
+    quarter token, which overestimates slightly for Korean council text.
+    """
+    hangul = sum(1 for char in text if '가' <= char <= '힣')
+    return hangul + math.ceil((len(text) - hangul) / 4)
+
+
+class _Bucket:
+    """Token bucket that may go into debt; the debt is the caller's wait"""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def take(self, amount: float) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= min(amount, self.capacity)
+        return max(0.0, -self.tokens / self.rate)
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and input-tokens-per-minute limiter
+
+    Each call reserves its share up front and sleeps until the reservation
+    is due. Reservations are made under a thread lock, so one limiter can be
+    shared by every event loop and thread of the process.
+    """
+
+    def __init__(self, rpm: float = LLM_RPM, input_tpm: float = LLM_INPUT_TPM):
+        if rpm <= 0 or input_tpm <= 0:
+            raise ValueError("rate limits must be positive")
+        self.requests = _Bucket(rpm * RATE_SAFETY_MARGIN)
+        self.tokens = _Bucket(input_tpm * RATE_SAFETY_MARGIN)
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int) -> float:
+        """Reserve one request and ``tokens`` input tokens; returns seconds to wait"""
+        with self._lock:
+            delay = max(self.requests.take(1), self.tokens.take(tokens))
+            self.waited += delay
+            return delay
+
+    async def acquire(self, tokens: int):
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def settle(self, estimated: int, actual: int):
+        """Correct a reservation with the usage the API reported"""
+        with self._lock:
+            self.tokens.tokens += estimated - actual
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide Claude API rate limiter"""
+    global _limiter
+
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter()
+    return _limiter
+
+
+def get_claude_client() -> anthropic.Anthropic:
+    """Return the process-wide synchronous Claude client"""
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    return _client
+
+
+def get_async_claude_client() -> anthropic.AsyncAnthropic:
+    """Return the AsyncAnthropic client of the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        # The SDK retries 429/5xx itself and honours Retry-After
+        client = _async_clients[loop] = anthropic.AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
+    return client
+
+
+def message_params(prompt: str, model: str, max_tokens: int) -> dict:
+    """Messages API request body of a single-turn, deterministic call"""
+    return {
+        "model": model,
+        "max_tokens": max_tokens,
+        "temperature": 0,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+
+
+class _NoLimit:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+async def complete(prompt: str, model: str, max_tokens: int,
+                   semaphore: asyncio.Semaphore = None) -> str:
+    """
+    One single-turn Messages API call under the shared rate limiter
+
+    Args:
+        prompt: User message
+        model: Model name
+        max_tokens: Output token cap
+        semaphore: Bounds the number of requests in flight (optional)
+
+    Returns:
+        Text of the first content block
+    """
+    estimated = estimate_tokens(prompt)
+    limiter = get_rate_limiter()
+    client = get_async_claude_client()
+    params = message_params(prompt, model, max_tokens)
+
+    async with semaphore or _NoLimit():
+        await limiter.acquire(estimated)
+        sampling = ({"temperature": params["temperature"]} if _CREATE_TAKES_TEMPERATURE
+                    else {"extra_body": {"temperature": params["temperature"]}})
+        message = await client.messages.create(
+            model=params["model"],
+            max_tokens=params["max_tokens"],
+            messages=params["messages"],
+            **sampling
+        )
+
+    if message.usage is not None:
+        limiter.settle(estimated, message.usage.input_tokens)
+    return message.content[0].text
+
+
+def parse_json_response(text: str):
+    """Parse a JSON reply, unwrapping a ```json ... ``` fence if present"""
+    if "```json" in text:
+        text = text.split("```json")[1].split("```")[0].strip()
+    elif "```" in text:
+        text = text.split("```")[1].split("```")[0].strip()
+    return json.loads(text)
+
+
+def submit_batch(requests: dict) -> str:
+    """
+    Submit requests to the Message Batches API
+
+    Args:
+        requests: {custom_id: message_params(...)}; custom_id is 1-64 characters
+            of letters, digits, '-' and '_'
+
+    Returns:
+        Batch id
+    """
+    batch = get_claude_client().messages.batches.create(requests=[
+        {"custom_id": custom_id, "params": params} for custom_id, params in requests.items()
+    ])
+    logger.info(f"Submitted message batch {batch.id} ({len(requests)} requests)")
+    return batch.id
+
+
+def get_batch(batch_id: str):
+    """Current state of a message batch (processing_status, request_counts, ...)"""
+    return get_claude_client().messages.batches.retrieve(batch_id)
+
+
+def get_batch_results(batch_id: str) -> dict:
+    """
+    Results of an ended message batch
+
+    Returns:
+        {custom_id: reply text, or None if the request errored, expired or was canceled}
+    """
+    results = {}
+    for item in get_claude_client().messages.batches.results(batch_id):
+        if item.result.type == "succeeded":
+            results[item.custom_id] = item.result.message.content[0].text
+        else:
+            logger.warning(f"Batch request {item.custom_id}: {item.result.type}")
+            results[item.custom_id] = None
+    return results
@@ -0,0 +1,165 @@
+"""
+Persistent Claude response cache keyed by content hash
+
+A reply is stored under (model, prompt template version, SHA-256 of the
+input), so re-running extraction or summarization over unchanged text is
+answered locally, while a new model or a changed prompt template (bump its
+version) misses the cache. Entries are evicted by age and, least recently
+used first, by total size, like the HTTP response cache.
+
+Layout:
+    LLM_CACHE_DIR/index.db   sqlite (key -> model, template, reply JSON, size, timestamps)
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from config import LLM_CACHE_ENABLED, LLM_CACHE_DIR, LLM_CACHE_MAX_MB, LLM_CACHE_MAX_AGE_DAYS
+
+logger = logging.getLogger(__name__)
+
+
+def input_hash(payload) -> str:
+    """SHA-256 hex digest of a JSON-serializable input"""
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """Size- and age-bounded LRU cache of parsed Claude replies"""
+
+    def __init__(self, directory: str = LLM_CACHE_DIR, max_bytes: int = LLM_CACHE_MAX_MB * 1024 * 1024,
+                 max_age_days: float = LLM_CACHE_MAX_AGE_DAYS, enabled: bool = LLM_CACHE_ENABLED):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._lock = threading.Lock()
+        self._db = None
+
+        if not enabled:
+            return
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, 'index.db'), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                template TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+        self.evict()
+
+    @staticmethod
+    def key(model: str, template: str, payload) -> str:
+        return hashlib.sha256(f"{model}\n{template}\n{input_hash(payload)}".encode('utf-8')).hexdigest()
+
+    def get(self, model: str, template: str, payload):
+        """
+        Look up a cached reply
+
+        Args:
+            model: Model name
+            template: Prompt template version
+            payload: The input the prompt was rendered from
+
+        Returns:
+            The stored value, or None
+        """
+        if not self.enabled:
+            return None
+
+        key = self.key(model, template, payload)
+        with self._lock:
+            row = self._db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, model: str, template: str, payload, value):
+        """Store (or replace) the reply to an input; value must be JSON-serializable"""
+        if not self.enabled:
+            return
+
+        encoded = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            now = time.time()
+            self._db.execute("""
+                INSERT OR REPLACE INTO entries (key, model, template, value, size, stored_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (self.key(model, template, payload), model, template, encoded,
+                  len(encoded.encode('utf-8')), now, now))
+            self._db.commit()
+            self.writes += 1
+
+        if self.writes % 100 == 0:
+            self.evict()
+
+    def evict(self):
+        """Drop entries older than max_age, then least recently used ones until under max_bytes"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            expired = self._db.execute(
+                "DELETE FROM entries WHERE stored_at < ?", (time.time() - self.max_age,)
+            ).rowcount
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+            lru = []
+            if total > self.max_bytes:
+                for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+                    if total <= self.max_bytes:
+                        break
+                    lru.append((key,))
+                    total -= size
+                self._db.executemany("DELETE FROM entries WHERE key = ?", lru)
+            self._db.commit()
+
+        if expired or lru:
+            logger.debug(f"Evicted {expired + len(lru)} cached LLM replies")
+
+    def stats(self) -> dict:
+        count, total = 0, 0
+        if self.enabled:
+            with self._lock:
+                count, total = self._db.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+                ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'entries': count, 'bytes': total, 'hits': self.hits, 'misses': self.misses,
+            'writes': self.writes, 'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """Return the process-wide LLM response cache"""
+    global _cache
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMCache()
+    return _cache
@@ -0,0 +1,127 @@
+"""
+Set-based merge of duplicate councillors
+
+The whole survivor map ({duplicate id: survivor id}) is computed in memory
+from one scan of the councillors table, then applied by the
+merge_councillors() database function in a single transaction: one
+statement per referencing table re-points duplicates to their survivor,
+and the duplicates are deleted. A failure leaves every table untouched.
+
+plan_merge() predicts the same per-table effect from the referencing rows
+without writing anything (the dry-run diff of merge_councillors.py).
+"""
+import logging
+
+from utils.db import get_supabase_client, KEY_LOOKUP_CHUNK
+from utils.scan import scan_table
+
+logger = logging.getLogger(__name__)
+
+# Every foreign key to councillors(id): (table, column, columns it is unique with)
+COUNCILLOR_REFERENCES = (
+    ('bills', 'proposer_id', None),
+    ('speeches', 'councillor_id', None),
+    ('subscriptions', 'councillor_id', None),
+    ('votes', 'councillor_id', ('bill_id',)),
+    ('bill_cosponsors', 'councillor_id', ('bill_id',)),
+    ('councillor_committees', 'councillor_id', ('committee_id', 'start_date')),
+    ('investigation_councillors', 'councillor_id', ('investigation_id',)),
+)
+
+
+def survivor_map(keys=('name',)):
+    """
+    Group councillors by keys and map each duplicate to its group's survivor
+
+    The most recently created row of a group survives (ties: lowest id).
+
+    Args:
+        keys: Columns identifying one councillor
+
+    Returns:
+        ({duplicate id: survivor id}, {survivor id: [councillor records of the group, survivor first]})
+    """
+    groups = {}
+    for c in scan_table('councillors', list(keys) + ['created_at']):
+        groups.setdefault(tuple(getattr(c, k) for k in keys), []).append(c)
+
+    merges, members = {}, {}
+    for group in groups.values():
+        if len(group) < 2:
+            continue
+        group.sort(key=lambda c: c.id)
+        group.sort(key=lambda c: c.created_at or '', reverse=True)
+        survivor = group[0].id
+        members[survivor] = group
+        for c in group[1:]:
+            merges[c.id] = survivor
+    return merges, members
+
+
+def _chunks(values):
+    values = list(values)
+    for start in range(0, len(values), KEY_LOOKUP_CHUNK):
+        yield values[start:start + KEY_LOOKUP_CHUNK]
+
+
+def plan_merge(merges: dict) -> dict:
+    """
+    Predict what applying a survivor map would change, without writing
+
+    Args:
+        merges: {duplicate id: survivor id}
+
+    Returns:
+        {table: {"moved", "dropped"}, "councillors": {"deleted"}}, the shape
+        merge_councillors() returns
+    """
+    client = get_supabase_client()
+    plan = {}
+    for table, column, unique_with in COUNCILLOR_REFERENCES:
+        if not unique_with:
+            moved = 0
+            for chunk in _chunks(merges):
+                moved += client.table(table).select('id', count='exact', head=True)\
+                    .in_(column, chunk).execute().count or 0
+            plan[table] = {'moved': moved, 'dropped': 0}
+            continue
+
+        # Links of the survivors are needed too: a duplicate's link they already have is dropped
+        rows = []
+        for chunk in _chunks(set(merges) | set(merges.values())):
+            rows.extend(scan_table(table, [column, *unique_with],
+                                   filters=lambda q, chunk=chunk: q.in_(column, chunk)))
+
+        # Survivors' own rows claim a link first, then duplicates' rows by id
+        rows.sort(key=lambda r: (getattr(r, column) in merges, str(r.id)))
+        claimed = set()
+        moved = dropped = 0
+        for row in rows:
+            councillor = getattr(row, column)
+            link = (merges.get(councillor, councillor),) + tuple(getattr(row, c) for c in unique_with)
+            if councillor in merges:
+                if link in claimed:
+                    dropped += 1
+                else:
+                    moved += 1
+            claimed.add(link)
+        plan[table] = {'moved': moved, 'dropped': dropped}
+
+    plan['councillors'] = {'deleted': len(merges)}
+    return plan
+
+
+def apply_merge(merges: dict) -> dict:
+    """
+    Merge duplicates into their survivors in one transaction
+
+    Args:
+        merges: {duplicate id: survivor id}
+
+    Returns:
+        {table: {"moved", "dropped"}, "councillors": {"deleted"}} row counts
+    """
+    if not merges:
+        return {}
+    client = get_supabase_client()
+    return client.rpc('merge_councillors', {'p_merges': merges}).execute().data
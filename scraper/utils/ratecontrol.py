@@ -0,0 +1,194 @@
+"""
+Adaptive (AIMD) crawl rate controller
+
+Every request made through utils/http.fetch() asks the controller for a
+send slot first and reports the outcome afterwards:
+
+- healthy and fast responses raise the per-host rate additively,
+- 429 / 5xx / timeouts cut it multiplicatively,
+- a Retry-After header blocks the host until the given time.
+
+The starting rate is 1 / REQUEST_DELAY, so the first requests of a run are
+exactly as polite as the old fixed sleep.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from config import (
+    REQUEST_DELAY, RATE_MIN, RATE_MAX, RATE_INCREASE, RATE_BACKOFF,
+    RATE_LATENCY_TARGET
+)
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value) -> float:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date)
+
+    Returns:
+        Seconds to wait (0 if missing or unparseable)
+    """
+    if not value:
+        return 0.0
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class _HostState:
+    def __init__(self, rate):
+        self.rate = rate
+        self.next_slot = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self.first_request = None
+        self.last_request = None
+        self.min_rate = rate
+        self.max_rate = rate
+
+
+class RateController:
+    """Thread-safe per-host AIMD pacing"""
+
+    def __init__(self, initial_rate: float = None, min_rate: float = RATE_MIN,
+                 max_rate: float = RATE_MAX, increase: float = RATE_INCREASE,
+                 backoff: float = RATE_BACKOFF, latency_target: float = RATE_LATENCY_TARGET):
+        if initial_rate is None:
+            initial_rate = 1.0 / REQUEST_DELAY if REQUEST_DELAY > 0 else max_rate
+        self.initial_rate = min(max(initial_rate, min_rate), max_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.backoff = backoff
+        self.latency_target = latency_target
+        self.hosts = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host) -> _HostState:
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = _HostState(self.initial_rate)
+        return state
+
+    def wait(self, host: str):
+        """Block until this host's next send slot, then reserve the following one"""
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+            slot = max(now, state.next_slot)
+            state.next_slot = slot + 1.0 / state.rate
+            state.wait_seconds += slot - now
+
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        with self._lock:
+            now = time.monotonic()
+            if state.first_request is None:
+                state.first_request = now
+            state.last_request = now
+            state.requests += 1
+
+    def record(self, host: str, status: int = None, latency: float = None,
+               retry_after: float = 0.0):
+        """
+        Feed back the outcome of one request
+
+        Args:
+            host: Request host
+            status: HTTP status code (None for timeouts / connection errors)
+            latency: Response time in seconds
+            retry_after: Seconds from a Retry-After header
+        """
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+
+            # Re-pace the already reserved slot at the new rate
+            if status is None or status in THROTTLE_STATUSES:
+                state.rate = max(self.min_rate, state.rate * self.backoff)
+                state.throttled += 1
+                state.next_slot = max(state.next_slot, now + 1.0 / state.rate)
+                logger.warning(f"Backing off {host}: status={status}, rate -> {state.rate:.2f} req/s")
+            elif status < 400 and latency is not None and latency <= self.latency_target:
+                # Only later reservations use the higher rate: next_slot never moves
+                # back, or slots concurrent threads already hold would overlap
+                state.rate = min(self.max_rate, state.rate + self.increase)
+            # Other 4xx and slow-but-successful responses hold the current rate
+
+            if retry_after:
+                state.next_slot = max(state.next_slot, now + retry_after)
+                logger.warning(f"{host} asked to retry after {retry_after:.1f}s")
+
+            state.min_rate = min(state.min_rate, state.rate)
+            state.max_rate = max(state.max_rate, state.rate)
+
+    def stats(self) -> dict:
+        """
+        Per-host run statistics
+
+        Returns:
+            {host: {"requests", "throttled", "current_rate", "min_rate",
+                    "max_rate", "effective_rate", "wait_seconds"}}
+        """
+        with self._lock:
+            result = {}
+            for host, state in self.hosts.items():
+                span = 0.0
+                if state.first_request is not None:
+                    span = state.last_request - state.first_request
+                # n requests span n-1 intervals
+                effective = (state.requests - 1) / span if span > 0 else 0.0
+                result[host] = {
+                    'requests': state.requests,
+                    'throttled': state.throttled,
+                    'current_rate': state.rate,
+                    'min_rate': state.min_rate,
+                    'max_rate': state.max_rate,
+                    'effective_rate': effective,
+                    'wait_seconds': state.wait_seconds,
+                }
+            return result
+
+    def log_stats(self):
+        """Log the per-host stats of this run"""
+        for host, s in self.stats().items():
+            logger.info(
+                f"Rate stats {host}: {s['requests']} requests, {s['throttled']} throttled, "
+                f"effective {s['effective_rate']:.2f} req/s "
+                f"(rate {s['min_rate']:.2f}-{s['max_rate']:.2f}, now {s['current_rate']:.2f}), "
+                f"waited {s['wait_seconds']:.1f}s"
+            )
+
+
+_controller = None
+_controller_lock = threading.Lock()
+
+
+def get_rate_controller() -> RateController:
+    """Return the process-wide rate controller"""
+    global _controller
+
+    if _controller is None:
+        with _controller_lock:
+            if _controller is None:
+                _controller = RateController()
+    return _controller
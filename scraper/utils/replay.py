@@ -0,0 +1,97 @@
+"""
+Record/replay transport for offline runs
+
+Mounting a ReplayAdapter on the shared session (utils/http.py) makes every
+scraper read recorded responses instead of the council site: first by path
+from a route table (the checked-in *_page.html captures), then by exact URL
+from the page archive (utils/archive.py), which is the recording side.
+Unknown URLs get a 404 so missing recordings show up as scraper warnings.
+"""
+import os
+import threading
+from collections import Counter
+from urllib.parse import urlsplit
+
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from utils.http import get_session
+
+FIXTURE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Path -> checked-in capture
+FIXTURE_ROUTES = {
+    '/kr/member/name.do': 'councillor_page.html',
+    '/kr/minutes/late.do': 'meetings_page.html',
+    '/kr/bill.do': 'bills_page.html',
+    '/viewer/minutes.do': 'transcript_page.html',
+}
+
+
+class ReplayAdapter(BaseAdapter):
+    """requests transport adapter that answers from recordings"""
+
+    def __init__(self, routes: dict = None, archive=None):
+        super().__init__()
+        self.routes = {}
+        for path, filename in (routes if routes is not None else FIXTURE_ROUTES).items():
+            with open(os.path.join(FIXTURE_DIR, filename), 'rb') as f:
+                self.routes[path] = f.read()
+        self.archive = archive
+        self.requests = Counter()  # path -> count
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _lookup(self, url):
+        if self.archive is not None:
+            snapshots = self.archive.history(url)
+            if snapshots:
+                return self.archive.load(snapshots[-1][1])
+        return self.routes.get(urlsplit(url).path)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        body = self._lookup(request.url)
+        with self._lock:
+            self.requests[urlsplit(request.url).path] += 1
+            if body is None:
+                self.misses += 1
+
+        response = Response()
+        response.request = request
+        response.url = request.url
+        response.connection = self
+        response.status_code = 200 if body is not None else 404
+        response.reason = 'OK' if body is not None else 'Not Found'
+        response.headers = CaseInsensitiveDict({
+            'Content-Type': 'text/html; charset=utf-8',
+            'Content-Length': str(len(body or b'')),
+        })
+        response._content = body or b''
+        response.encoding = 'utf-8'
+        return response
+
+    def close(self):
+        pass
+
+    def request_count(self) -> int:
+        with self._lock:
+            return sum(self.requests.values())
+
+
+def install_replay(routes: dict = None, archive=None) -> ReplayAdapter:
+    """
+    Route all scraper HTTP traffic to recordings
+
+    Args:
+        routes: Path -> fixture filename map (default: FIXTURE_ROUTES)
+        archive: Optional PageArchive to replay exact URLs from first
+
+    Returns:
+        The mounted ReplayAdapter (for request counters)
+    """
+    adapter = ReplayAdapter(routes, archive)
+    session = get_session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return adapter
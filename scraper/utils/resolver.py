@@ -0,0 +1,232 @@
+"""
+In-memory councillor name resolution
+
+Scraped pages name councillors in several forms ("홍길동", "홍길동 의원",
+"홍길동 의원 외 10인", "위원장 홍길동", "홍길동(더불어민주당)"). Instead of one
+database lookup per row, CouncillorResolver loads the councillors table once
+per run and resolves names against an exact map, then Hangul-normalized keys,
+then near misses ("홍길둥") within a small jamo-level edit distance, found
+through a deletion index rather than a scan of every councillor.
+"""
+import logging
+import re
+import unicodedata
+
+from utils.db import get_councillors
+
+logger = logging.getLogger(__name__)
+
+# Titles written before or after a name; longest first so "부의장" is not cut to "부"
+ROLE_TITLES = tuple(sorted(
+    ('의원', '의장', '부의장', '위원장', '부위원장', '위원', '간사', '대표의원'),
+    key=len, reverse=True
+))
+
+# "외 10인", "외 3명", "등 5인", "대표발의" — co-sponsor notes after the representative proposer
+CO_SPONSOR_SUFFIX = re.compile(r'\s*((외|등)\s*\d*\s*(인|명)?|(대표|공동)?발의)\s*$')
+PARENTHESES = re.compile(r'\([^)]*\)|\[[^\]]*\]')
+NAME_SEPARATORS = re.compile(r'[,·ㆍ/]')
+NON_NAME = re.compile(r'[^가-힣A-Za-z]')
+
+# Near misses: at most this many jamo edits, and only for names of 2+ syllables
+MAX_JAMO_DISTANCE = 1
+HANGUL_BASE, HANGUL_LAST = 0xAC00, 0xD7A3
+
+
+def normalize_name(name: str) -> str:
+    """NFC-normalize and keep only Hangul syllables and Latin letters ("홍 길동 " -> "홍길동")"""
+    return NON_NAME.sub('', unicodedata.normalize('NFC', name or ''))
+
+
+def strip_role(name: str) -> str:
+    """
+    Remove role titles around a name
+
+    "홍길동 부의장" -> "홍길동", "위원장 이윤미" -> "이윤미", "○부의장홍길동" -> "홍길동"
+    """
+    tokens = name.replace('○', ' ').split()
+    if len(tokens) > 1:
+        tokens = [t for t in tokens if t not in ROLE_TITLES] or tokens
+    name = ''.join(tokens)
+
+    for title in ROLE_TITLES:
+        if len(name) - len(title) < 2:
+            continue
+        if name.endswith(title):
+            return name[:-len(title)]
+        if name.startswith(title):
+            return name[len(title):]
+    return name
+
+
+def to_jamo(text: str) -> str:
+    """Decompose Hangul syllables into conjoining initial/medial/final jamo (U+1100 block)"""
+    jamo = []
+    for char in text:
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            code -= HANGUL_BASE
+            jamo.append(chr(0x1100 + code // 588))
+            jamo.append(chr(0x1161 + (code % 588) // 28))
+            if code % 28:
+                jamo.append(chr(0x11A7 + code % 28))
+        else:
+            jamo.append(char)
+    return ''.join(jamo)
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def _deletions(jamo: str, depth: int = MAX_JAMO_DISTANCE) -> set:
+    """Every string reachable by deleting up to depth characters (SymSpell-style keys)"""
+    keys = {jamo}
+    frontier = {jamo}
+    for _ in range(depth):
+        frontier = {s[:i] + s[i + 1:] for s in frontier for i in range(len(s))}
+        keys |= frontier
+    return keys
+
+
+def candidate_names(text: str) -> list:
+    """
+    Names mentioned in a proposer / speaker string, representative first
+
+    "홍길동 의원 외 10인" -> ["홍길동"], "홍길동 의원 대표발의" -> ["홍길동"],
+    "홍길동, 김철수 의원" -> ["홍길동", "김철수"]
+    """
+    text = unicodedata.normalize('NFC', text or '')
+    text = PARENTHESES.sub(' ', text)
+    text = CO_SPONSOR_SUFFIX.sub('', text)
+
+    names = []
+    for part in NAME_SEPARATORS.split(text):
+        name = strip_role(part)
+        if name:
+            names.append(name)
+    return names
+
+
+class CouncillorResolver:
+    """Name -> councillor id lookups against a preloaded councillors table"""
+
+    def __init__(self, councillors: list, aliases: dict = None):
+        """
+        Args:
+            councillors: Rows with at least id and name (term_number, is_active optional)
+            aliases: Extra {alias: councillor name} spellings to accept
+        """
+        self.exact = {}
+        self.normalized = {}
+        self.fuzzy_index = {}  # deletion key -> {normalized name}
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self._memo = {}
+
+        # Current members win over former ones with the same name
+        ranked = sorted(
+            councillors,
+            key=lambda c: (bool(c.get('is_active')), c.get('term_number') or 0)
+        )
+        for councillor in ranked:
+            name = (councillor.get('name') or '').strip()
+            if not name:
+                continue
+            self.exact[name] = councillor['id']
+            self.normalized[normalize_name(name)] = councillor['id']
+
+        for alias, name in (aliases or {}).items():
+            councillor_id = self.lookup(name)
+            if councillor_id:
+                self.exact[alias] = councillor_id
+                self.normalized[normalize_name(alias)] = councillor_id
+
+        for key in self.normalized:
+            if len(key) >= 2:
+                for deletion in _deletions(to_jamo(key)):
+                    self.fuzzy_index.setdefault(deletion, set()).add(key)
+
+    @classmethod
+    def load(cls, aliases: dict = None) -> 'CouncillorResolver':
+        """Build a resolver from the councillors table (one request)"""
+        resolver = cls(get_councillors(), aliases)
+        logger.info(f"Loaded {len(resolver.exact)} councillor names for resolution")
+        return resolver
+
+    def lookup(self, name: str):
+        """Exact, then normalized match of a bare name; returns id or None"""
+        if name in self.exact:
+            return self.exact[name]
+        return self.normalized.get(normalize_name(name))
+
+    def lookup_fuzzy(self, name: str):
+        """
+        Nearest councillor within MAX_JAMO_DISTANCE jamo edits ("홍길둥" -> 홍길동)
+
+        Returns:
+            Councillor id, or None if nothing is close enough or two names tie
+        """
+        key = normalize_name(name)
+        if len(key) < 2:
+            return None
+
+        jamo = to_jamo(key)
+        candidates = set()
+        for deletion in _deletions(jamo):
+            candidates |= self.fuzzy_index.get(deletion, set())
+
+        scored = sorted((edit_distance(jamo, to_jamo(c)), c) for c in candidates)
+        scored = [(d, c) for d, c in scored if d <= MAX_JAMO_DISTANCE]
+        if not scored or (len(scored) > 1 and scored[0][0] == scored[1][0]
+                          and self.normalized[scored[0][1]] != self.normalized[scored[1][1]]):
+            return None
+        return self.normalized[scored[0][1]]
+
+    def resolve(self, text: str, fuzzy: bool = False):
+        """
+        Resolve a proposer / speaker string to a councillor id
+
+        Args:
+            text: Raw text such as "홍길동 의원 외 10인" or "위원장 이윤미"
+            fuzzy: Also accept near-miss spellings (lookup_fuzzy)
+
+        Returns:
+            Councillor id of the first (representative) name, or None
+        """
+        if not text:
+            return None
+        if (text, fuzzy) in self._memo:
+            return self._memo[(text, fuzzy)]
+
+        councillor_id = self.lookup(text.strip())
+        if councillor_id is None:
+            # Only the representative counts; a co-sponsor is never a fallback
+            names = candidate_names(text)
+            councillor_id = self.lookup(names[0]) if names else None
+            if councillor_id is None and fuzzy and names:
+                councillor_id = self.lookup_fuzzy(names[0])
+                if councillor_id is not None:
+                    self.fuzzy_hits += 1
+                    logger.debug(f"Fuzzy-matched councillor name: {text}")
+
+        if councillor_id is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self._memo[(text, fuzzy)] = councillor_id
+        return councillor_id
+
+    def resolve_many(self, texts, fuzzy: bool = False) -> dict:
+        """Resolve many strings at once; returns {text: id or None}, each distinct text resolved once"""
+        return {text: self.resolve(text, fuzzy) for text in dict.fromkeys(texts) if text}
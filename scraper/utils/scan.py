@@ -0,0 +1,79 @@
+"""
+Streaming full-table reads for maintenance scripts
+
+A plain ``.select('*').execute()`` returns at most PostgREST's max-rows
+(1000 by default) without any error, and pulls every column. scan_table()
+instead selects only the columns asked for and pages by a unique key:
+each request continues after the last key seen (``key > last ORDER BY key
+LIMIT n``), so pages are index range scans, rows deleted or updated
+mid-scan never shift a page, and only one page is held in memory.
+
+    for c in scan_table('councillors', ['name', 'created_at']):
+        print(c.id, c.name)
+"""
+import keyword
+import logging
+from collections import namedtuple
+from functools import lru_cache
+
+from config import DB_SCAN_PAGE_SIZE
+from utils.dbwrite import with_retries
+from utils.db import get_supabase_client
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def record_type(table: str, fields: tuple):
+    """namedtuple class for rows of a table with the given columns (e.g. CouncillorsRow)"""
+    name = ''.join(part.title() for part in table.split('_')) + 'Row'
+    invalid = [f for f in fields if not f.isidentifier() or keyword.iskeyword(f)]
+    if invalid:
+        raise ValueError(f"Cannot use {invalid} as record fields of {table}")
+    return namedtuple(name, fields)
+
+
+def scan_table(table: str, columns, key: str = 'id', filters=None, page_size: int = DB_SCAN_PAGE_SIZE):
+    """
+    Yield every row of a table in key order, one keyset page at a time
+
+    The scan ends on the first empty page, so it stays complete even if the
+    server caps pages below page_size.
+
+    Args:
+        table: Table name
+        columns: Column names to select (the key column is always included, first)
+        key: Unique, non-null column to page by
+        filters: Optional callable adding filters to the query, e.g.
+            ``lambda q: q.eq('is_active', True)``
+        page_size: Rows per request
+
+    Yields:
+        Records (namedtuples) with one field per column
+    """
+    if isinstance(columns, str):
+        columns = [c.strip() for c in columns.split(',') if c.strip()]
+    fields = tuple([key] + [c for c in columns if c != key])
+    record = record_type(table, fields)
+    client = get_supabase_client()
+
+    last = None
+    pages = rows = 0
+    while True:
+        query = client.table(table).select(', '.join(fields))
+        if filters:
+            query = filters(query)
+        if last is not None:
+            query = query.gt(key, last)
+        query = query.order(key).limit(page_size)
+
+        page = with_retries(lambda: query.execute()).data
+        pages += 1
+        if not page:
+            break
+        for row in page:
+            yield record(*(row.get(f) for f in fields))
+        rows += len(page)
+        last = page[-1][key]
+
+    logger.debug(f"Scanned {rows} {table} rows in {pages} requests")
@@ -0,0 +1,21 @@
+-- Add crawl_state table for incremental listing crawls
+-- Stores the newest listing date saved per listing (late.do / bill.do are sorted
+-- by date, not uid). Incremental crawls stop on the first page whose rows are
+-- all dated at or before the mark; the mark advances only after the rows are saved.
+
+CREATE TABLE IF NOT EXISTS crawl_state (
+    listing VARCHAR(50) PRIMARY KEY, -- 'meetings', 'bills'
+    high_water_date DATE NOT NULL, -- 가장 최근에 수집한 목록 일자 (회의일 / 제출일)
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- RLS: scraper state is internal, only the service role may touch it
+ALTER TABLE crawl_state ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow service role to manage crawl_state"
+    ON crawl_state
+    FOR ALL
+    USING (auth.role() = 'service_role')
+    WITH CHECK (auth.role() = 'service_role');
+
+COMMENT ON TABLE crawl_state IS 'High-water marks for incremental scraping of council listings';
@@ -0,0 +1,44 @@
+-- Atomic per-meeting speech replacement for extract_speeches.py --force
+-- Deletes a meeting's speeches and inserts the new set in one transaction, so a
+-- failed re-extraction never leaves the meeting with no (or half of its) speeches.
+-- 사용 예: SELECT replace_meeting_speeches('<meeting uuid>', '[{"speech_order": 1, "speech_text": "..."}]');
+
+CREATE OR REPLACE FUNCTION replace_meeting_speeches(p_meeting_id UUID, p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    inserted INTEGER;
+BEGIN
+    DELETE FROM speeches WHERE meeting_id = p_meeting_id;
+
+    INSERT INTO speeches (
+        meeting_id, councillor_id, speech_order, speech_text, summary, keywords, created_at, updated_at
+    )
+    SELECT
+        p_meeting_id,
+        r.councillor_id,
+        r.speech_order,
+        r.speech_text,
+        r.summary,
+        r.keywords,
+        COALESCE(r.created_at, NOW()),
+        COALESCE(r.updated_at, NOW())
+    FROM jsonb_to_recordset(p_rows) AS r(
+        councillor_id UUID,
+        speech_order INTEGER,
+        speech_text TEXT,
+        summary TEXT,
+        keywords TEXT[],
+        created_at TIMESTAMPTZ,
+        updated_at TIMESTAMPTZ
+    );
+
+    GET DIAGNOSTICS inserted = ROW_COUNT;
+    RETURN inserted;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Only the scraper (service role) rewrites speeches
+REVOKE EXECUTE ON FUNCTION replace_meeting_speeches(UUID, JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION replace_meeting_speeches(UUID, JSONB) TO service_role;
+
+COMMENT ON FUNCTION replace_meeting_speeches(UUID, JSONB) IS 'Replace all speeches of one meeting in a single transaction';
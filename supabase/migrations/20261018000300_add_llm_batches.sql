@@ -0,0 +1,29 @@
+-- Add llm_batches table for offline (Message Batches API) speech extraction
+-- extract_speeches.py --batch submit queues the extraction/summarization requests of
+-- all pending meetings as one message batch and records it here; a later
+-- --batch collect run ingests the results, so no runner waits on the API.
+
+CREATE TABLE IF NOT EXISTS llm_batches (
+    id VARCHAR(100) PRIMARY KEY, -- Message Batches API id (msgbatch_...)
+    status VARCHAR(20) NOT NULL DEFAULT 'submitted', -- submitted, collected, failed
+    request_count INTEGER NOT NULL,
+    context JSONB NOT NULL, -- 회의별 단계와 요청(custom_id)별 조각 번호/speech_order (회의록·발언은 담지 않음)
+    -- context 예시: {"meetings": {"<uuid>": {"stage": "summarize", "attempt": 0}},
+    --               "requests": {"<uuid>-0-s1": {"meeting_id": "<uuid>", "kind": "summarize", "orders": [1, 2]}}}
+    -- 회의록은 meetings에서, 분리한 발언과 모인 요약은 speech_checkpoints에서 다시 불러옴
+    submitted_at TIMESTAMPTZ DEFAULT NOW(),
+    collected_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_batches_status ON llm_batches(status);
+
+-- RLS: scraper state is internal, only the service role may touch it
+ALTER TABLE llm_batches ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow service role to manage llm_batches"
+    ON llm_batches
+    FOR ALL
+    USING (auth.role() = 'service_role')
+    WITH CHECK (auth.role() = 'service_role');
+
+COMMENT ON TABLE llm_batches IS 'Submitted Claude message batches awaiting collection by extract_speeches.py';
@@ -0,0 +1,77 @@
+-- Resumable speech extraction for extract_speeches.py
+-- Progress of a meeting is checkpointed per stage:
+--   segmented    발언 분리·의원 매칭 완료 (speeches)
+--   summarizing  요약 k/N 완료 (summaries, summarized/total)
+--   saved        meetings.is_processed = true (체크포인트 행은 삭제)
+-- so an interrupted run resumes where it stopped instead of re-extracting, and a
+-- meeting with only part of its speeches saved is never treated as done.
+
+CREATE TABLE IF NOT EXISTS speech_checkpoints (
+    meeting_id UUID PRIMARY KEY REFERENCES meetings(id) ON DELETE CASCADE,
+    stage VARCHAR(20) NOT NULL, -- segmented, summarizing
+    speeches JSONB NOT NULL, -- [{"order", "speaker", "role", "text", "councillor_id"}]
+    summaries JSONB NOT NULL DEFAULT '{}', -- {"<order>": {"summary", "keywords"}}
+    summarized INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- RLS: scraper state is internal, only the service role may touch it
+ALTER TABLE speech_checkpoints ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow service role to manage speech_checkpoints"
+    ON speech_checkpoints
+    FOR ALL
+    USING (auth.role() = 'service_role')
+    WITH CHECK (auth.role() = 'service_role');
+
+COMMENT ON TABLE speech_checkpoints IS 'Per-meeting progress of extract_speeches.py runs that have not saved yet';
+
+-- Saving the speeches, marking the meeting processed and dropping its checkpoint
+-- happen in one transaction, so "saved" can never be half done
+CREATE OR REPLACE FUNCTION replace_meeting_speeches(p_meeting_id UUID, p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    inserted INTEGER;
+BEGIN
+    DELETE FROM speeches WHERE meeting_id = p_meeting_id;
+
+    INSERT INTO speeches (
+        meeting_id, councillor_id, speech_order, speech_text, summary, keywords, created_at, updated_at
+    )
+    SELECT
+        p_meeting_id,
+        r.councillor_id,
+        r.speech_order,
+        r.speech_text,
+        r.summary,
+        r.keywords,
+        COALESCE(r.created_at, NOW()),
+        COALESCE(r.updated_at, NOW())
+    FROM jsonb_to_recordset(p_rows) AS r(
+        councillor_id UUID,
+        speech_order INTEGER,
+        speech_text TEXT,
+        summary TEXT,
+        keywords TEXT[],
+        created_at TIMESTAMPTZ,
+        updated_at TIMESTAMPTZ
+    );
+
+    GET DIAGNOSTICS inserted = ROW_COUNT;
+
+    UPDATE meetings SET is_processed = true, updated_at = NOW() WHERE id = p_meeting_id;
+    DELETE FROM speech_checkpoints WHERE meeting_id = p_meeting_id;
+
+    RETURN inserted;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Meetings extracted before checkpoints existed have no other record than their
+-- saved speeches; mark them processed so the nightly run does not re-summarize the
+-- whole history (python extract_speeches.py --meeting-id <uuid> --force redoes one)
+UPDATE meetings SET is_processed = true
+WHERE is_processed IS NOT TRUE
+  AND EXISTS (SELECT 1 FROM speeches WHERE speeches.meeting_id = meetings.id);
+
+CREATE INDEX IF NOT EXISTS idx_meetings_unprocessed ON meetings(created_at DESC) WHERE is_processed IS NOT TRUE;
@@ -0,0 +1,133 @@
+-- Local keyword extraction for speeches (scraper/extract_keywords.py)
+-- speeches.keywords are the top TF-IDF noun n-grams of each speech. The document
+-- frequencies behind the IDF are kept here and updated per meeting, so a nightly
+-- run only tokenizes newly saved meetings. Each meeting's own counts are stored
+-- too, so a re-extracted meeting (marked stale by the triggers below) replaces
+-- its old contribution exactly.
+
+CREATE TABLE IF NOT EXISTS keyword_terms (
+    term TEXT PRIMARY KEY, -- 명사 n-gram ("예산", "예산 집행")
+    doc_count INTEGER NOT NULL, -- 이 용어가 나오는 발언 수
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS keyword_meetings (
+    meeting_id UUID PRIMARY KEY REFERENCES meetings(id) ON DELETE CASCADE,
+    documents INTEGER NOT NULL, -- 색인한 발언 수
+    terms JSONB NOT NULL, -- 이 회의가 keyword_terms에 더한 발언 수 {"<term>": n}
+    stale BOOLEAN NOT NULL DEFAULT false, -- 색인 후 발언이 바뀜 (다시 색인 필요)
+    indexed_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_keyword_meetings_stale ON keyword_meetings(meeting_id) WHERE stale;
+
+-- RLS: scraper state is internal, only the service role may touch it
+ALTER TABLE keyword_terms ENABLE ROW LEVEL SECURITY;
+ALTER TABLE keyword_meetings ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow service role to manage keyword_terms"
+    ON keyword_terms
+    FOR ALL
+    USING (auth.role() = 'service_role')
+    WITH CHECK (auth.role() = 'service_role');
+
+CREATE POLICY "Allow service role to manage keyword_meetings"
+    ON keyword_meetings
+    FOR ALL
+    USING (auth.role() = 'service_role')
+    WITH CHECK (auth.role() = 'service_role');
+
+-- Add (or replace) the term counts of meetings and return the corpus size and
+-- the updated document frequencies of every term passed in
+-- 사용 예: SELECT index_meeting_keywords('[{"meeting_id": "<uuid>", "documents": 120, "terms": {"예산": 14}}]');
+CREATE OR REPLACE FUNCTION index_meeting_keywords(p_meetings JSONB)
+RETURNS JSONB AS $$
+DECLARE
+    m JSONB;
+    old_terms JSONB;
+BEGIN
+    FOR m IN SELECT value FROM jsonb_array_elements(p_meetings) LOOP
+        SELECT terms INTO old_terms
+        FROM keyword_meetings
+        WHERE meeting_id = (m->>'meeting_id')::UUID
+        FOR UPDATE;
+
+        IF old_terms IS NOT NULL THEN
+            UPDATE keyword_terms k
+            SET doc_count = k.doc_count - o.value::INTEGER, updated_at = NOW()
+            FROM jsonb_each_text(old_terms) AS o
+            WHERE k.term = o.key;
+        END IF;
+
+        INSERT INTO keyword_terms (term, doc_count)
+        SELECT key, value::INTEGER FROM jsonb_each_text(m->'terms')
+        ON CONFLICT (term) DO UPDATE
+        SET doc_count = keyword_terms.doc_count + EXCLUDED.doc_count, updated_at = NOW();
+
+        INSERT INTO keyword_meetings (meeting_id, documents, terms, indexed_at)
+        VALUES ((m->>'meeting_id')::UUID, (m->>'documents')::INTEGER, m->'terms', NOW())
+        ON CONFLICT (meeting_id) DO UPDATE
+        SET documents = EXCLUDED.documents, terms = EXCLUDED.terms, stale = false, indexed_at = NOW();
+    END LOOP;
+
+    DELETE FROM keyword_terms WHERE doc_count <= 0;
+
+    RETURN jsonb_build_object(
+        'documents', (SELECT COALESCE(SUM(documents), 0) FROM keyword_meetings),
+        'terms', (
+            SELECT COALESCE(jsonb_object_agg(k.term, k.doc_count), '{}'::JSONB)
+            FROM keyword_terms k
+            WHERE k.term IN (
+                SELECT jsonb_object_keys(value->'terms') FROM jsonb_array_elements(p_meetings)
+            )
+        )
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Bulk keyword update: one statement for many speeches
+-- 사용 예: SELECT set_speech_keywords('[{"id": "<speech uuid>", "keywords": ["예산 집행", "도로"]}]');
+CREATE OR REPLACE FUNCTION set_speech_keywords(p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated INTEGER;
+BEGIN
+    UPDATE speeches s
+    SET keywords = r.keywords
+    FROM jsonb_to_recordset(p_rows) AS r(id UUID, keywords TEXT[])
+    WHERE s.id = r.id;
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Any change to a meeting's speeches (replace_meeting_speeches, manual fixes)
+-- marks its index entry stale; statement-level, so a bulk replace costs one update
+CREATE OR REPLACE FUNCTION mark_keyword_meetings_stale()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE keyword_meetings SET stale = true
+    WHERE NOT stale AND meeting_id IN (SELECT DISTINCT meeting_id FROM changed_speeches);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE TRIGGER mark_keywords_stale_on_speech_insert AFTER INSERT ON speeches
+    REFERENCING NEW TABLE AS changed_speeches
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_keyword_meetings_stale();
+
+CREATE TRIGGER mark_keywords_stale_on_speech_delete AFTER DELETE ON speeches
+    REFERENCING OLD TABLE AS changed_speeches
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_keyword_meetings_stale();
+
+-- Only the scraper (service role) maintains the keyword index
+REVOKE EXECUTE ON FUNCTION index_meeting_keywords(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION index_meeting_keywords(JSONB) TO service_role;
+REVOKE EXECUTE ON FUNCTION set_speech_keywords(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION set_speech_keywords(JSONB) TO service_role;
+
+COMMENT ON TABLE keyword_terms IS 'Document frequency of each speech keyword term (IDF table)';
+COMMENT ON TABLE keyword_meetings IS 'Per-meeting contribution to keyword_terms, for incremental re-indexing';
+COMMENT ON FUNCTION index_meeting_keywords(JSONB) IS 'Add or replace the keyword term counts of meetings';
+COMMENT ON FUNCTION set_speech_keywords(JSONB) IS 'Set keywords of many speeches in one statement';
@@ -0,0 +1,19 @@
+-- Keyset pagination of pending meetings for extract_speeches.py
+-- Pages are read newest first by (created_at, id) without transcript_text, e.g.
+--   WHERE is_processed IS NOT TRUE AND transcript_text IS NOT NULL
+--     AND (created_at, id) < (:last_created_at, :last_id)
+--   ORDER BY created_at DESC, id DESC LIMIT 100
+-- so every page is an index range scan no matter how many meetings precede it.
+-- Runs after 20261018000400_add_speech_checkpoints.sql: the keyset index replaces
+-- the idx_meetings_unprocessed index created there.
+
+DROP INDEX IF EXISTS idx_meetings_unprocessed;
+
+CREATE INDEX IF NOT EXISTS idx_meetings_pending_keyset
+    ON meetings(created_at DESC, id DESC)
+    WHERE is_processed IS NOT TRUE AND transcript_text IS NOT NULL;
+
+-- --force walks every meeting with a transcript in the same order
+CREATE INDEX IF NOT EXISTS idx_meetings_transcript_keyset
+    ON meetings(created_at DESC, id DESC)
+    WHERE transcript_text IS NOT NULL;
@@ -0,0 +1,13 @@
+-- Change-detecting upserts (scraper/utils/fingerprint.py)
+-- Each scraped row stores the SHA-256 of its normalized scraped fields. The
+-- scrapers look up the stored hashes by natural key and write only rows that
+-- are new or whose hash changed, so unchanged rows keep their updated_at.
+-- Existing rows start without a hash and are rewritten once on their next scrape.
+
+ALTER TABLE councillors ADD COLUMN IF NOT EXISTS content_hash CHAR(64);
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS content_hash CHAR(64);
+ALTER TABLE bills ADD COLUMN IF NOT EXISTS content_hash CHAR(64);
+
+COMMENT ON COLUMN councillors.content_hash IS '스크레이핑 필드 지문 (SHA-256, 변경 감지용)';
+COMMENT ON COLUMN meetings.content_hash IS '스크레이핑 필드 지문 (SHA-256, 변경 감지용)';
+COMMENT ON COLUMN bills.content_hash IS '스크레이핑 필드 지문 (SHA-256, 변경 감지용)';
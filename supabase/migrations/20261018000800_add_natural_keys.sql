@@ -0,0 +1,132 @@
+-- Natural keys for idempotent ingest (scraper/utils/db.py upsert_changed)
+-- Scraped rows are upserted with ON CONFLICT on a stable key instead of being
+-- inserted without an id:
+--   meetings     transcript_uid (uid= of the 회의록 URL)
+--   councillors  (name, term_number)
+--   committees   name
+--   bills        bill_number (already UNIQUE)
+-- Rows duplicated by earlier runs are merged into one survivor first; the
+-- references of the other copies are moved to it.
+
+-- ---------------------------------------------------------------------------
+-- meetings.transcript_uid
+-- ---------------------------------------------------------------------------
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS transcript_uid BIGINT;
+COMMENT ON COLUMN meetings.transcript_uid IS '회의록 원문 URL의 uid (회의 자연 키)';
+
+UPDATE meetings
+SET transcript_uid = (regexp_match(transcript_url, '[?&]uid=([0-9]+)(?:[&#]|$)'))[1]::BIGINT
+WHERE transcript_uid IS NULL AND transcript_url IS NOT NULL;
+
+-- Survivor: the processed copy (it owns the speeches), then the oldest
+CREATE TEMP TABLE meeting_survivors AS
+SELECT id, survivor_id FROM (
+    SELECT id, first_value(id) OVER (
+        PARTITION BY transcript_uid ORDER BY is_processed IS TRUE DESC, created_at, id
+    ) AS survivor_id
+    FROM meetings
+    WHERE transcript_uid IS NOT NULL
+) ranked
+WHERE id <> survivor_id;
+
+-- A copy's transcript and committee link fill gaps in its survivor
+UPDATE meetings m
+SET transcript_text = COALESCE(m.transcript_text, d.transcript_text),
+    committee_id = COALESCE(m.committee_id, d.committee_id)
+FROM meeting_survivors s
+JOIN meetings d ON d.id = s.id
+WHERE m.id = s.survivor_id;
+
+UPDATE votes v SET source_meeting_id = s.survivor_id
+FROM meeting_survivors s WHERE v.source_meeting_id = s.id;
+
+-- speeches, speech_checkpoints and keyword_meetings of the copies cascade
+DELETE FROM meetings WHERE id IN (SELECT id FROM meeting_survivors);
+DROP TABLE meeting_survivors;
+
+ALTER TABLE meetings ADD CONSTRAINT meetings_transcript_uid_key UNIQUE (transcript_uid);
+
+-- ---------------------------------------------------------------------------
+-- councillors (name, term_number)
+-- ---------------------------------------------------------------------------
+-- Survivor: the most recently scraped copy
+CREATE TEMP TABLE councillor_survivors AS
+SELECT id, survivor_id FROM (
+    SELECT id, first_value(id) OVER (
+        PARTITION BY name, term_number ORDER BY created_at DESC, id
+    ) AS survivor_id
+    FROM councillors
+) ranked
+WHERE id <> survivor_id;
+
+UPDATE bills t SET proposer_id = s.survivor_id FROM councillor_survivors s WHERE t.proposer_id = s.id;
+UPDATE speeches t SET councillor_id = s.survivor_id FROM councillor_survivors s WHERE t.councillor_id = s.id;
+UPDATE subscriptions t SET councillor_id = s.survivor_id FROM councillor_survivors s WHERE t.councillor_id = s.id;
+
+-- Per-councillor link tables are unique per councillor: a copy's row is dropped
+-- when the survivor (or another copy, lower id first) already has the same link
+DELETE FROM votes t USING councillor_survivors s
+WHERE t.councillor_id = s.id AND EXISTS (
+    SELECT 1 FROM votes o LEFT JOIN councillor_survivors os ON os.id = o.councillor_id
+    WHERE o.bill_id = t.bill_id AND COALESCE(os.survivor_id, o.councillor_id) = s.survivor_id
+      AND (os.id IS NULL OR o.id < t.id)
+);
+UPDATE votes t SET councillor_id = s.survivor_id FROM councillor_survivors s WHERE t.councillor_id = s.id;
+
+DELETE FROM bill_cosponsors t USING councillor_survivors s
+WHERE t.councillor_id = s.id AND EXISTS (
+    SELECT 1 FROM bill_cosponsors o LEFT JOIN councillor_survivors os ON os.id = o.councillor_id
+    WHERE o.bill_id = t.bill_id AND COALESCE(os.survivor_id, o.councillor_id) = s.survivor_id
+      AND (os.id IS NULL OR o.id < t.id)
+);
+UPDATE bill_cosponsors t SET councillor_id = s.survivor_id FROM councillor_survivors s WHERE t.councillor_id = s.id;
+
+DELETE FROM councillor_committees t USING councillor_survivors s
+WHERE t.councillor_id = s.id AND EXISTS (
+    SELECT 1 FROM councillor_committees o LEFT JOIN councillor_survivors os ON os.id = o.councillor_id
+    WHERE o.committee_id = t.committee_id AND o.start_date IS NOT DISTINCT FROM t.start_date
+      AND COALESCE(os.survivor_id, o.councillor_id) = s.survivor_id
+      AND (os.id IS NULL OR o.id < t.id)
+);
+UPDATE councillor_committees t SET councillor_id = s.survivor_id FROM councillor_survivors s WHERE t.councillor_id = s.id;
+
+DELETE FROM investigation_councillors t USING councillor_survivors s
+WHERE t.councillor_id = s.id AND EXISTS (
+    SELECT 1 FROM investigation_councillors o LEFT JOIN councillor_survivors os ON os.id = o.councillor_id
+    WHERE o.investigation_id = t.investigation_id AND COALESCE(os.survivor_id, o.councillor_id) = s.survivor_id
+      AND (os.id IS NULL OR o.id < t.id)
+);
+UPDATE investigation_councillors t SET councillor_id = s.survivor_id FROM councillor_survivors s WHERE t.councillor_id = s.id;
+
+DELETE FROM councillors WHERE id IN (SELECT id FROM councillor_survivors);
+DROP TABLE councillor_survivors;
+
+-- NULLS NOT DISTINCT: a councillor without a term is still one row per name
+ALTER TABLE councillors ADD CONSTRAINT councillors_name_term_number_key
+    UNIQUE NULLS NOT DISTINCT (name, term_number);
+
+-- ---------------------------------------------------------------------------
+-- committees.name
+-- ---------------------------------------------------------------------------
+CREATE TEMP TABLE committee_survivors AS
+SELECT id, survivor_id FROM (
+    SELECT id, first_value(id) OVER (PARTITION BY name ORDER BY created_at, id) AS survivor_id
+    FROM committees
+) ranked
+WHERE id <> survivor_id;
+
+UPDATE meetings t SET committee_id = s.survivor_id FROM committee_survivors s WHERE t.committee_id = s.id;
+
+DELETE FROM councillor_committees t USING committee_survivors s
+WHERE t.committee_id = s.id AND EXISTS (
+    SELECT 1 FROM councillor_committees o LEFT JOIN committee_survivors os ON os.id = o.committee_id
+    WHERE o.councillor_id = t.councillor_id AND o.start_date IS NOT DISTINCT FROM t.start_date
+      AND COALESCE(os.survivor_id, o.committee_id) = s.survivor_id
+      AND (os.id IS NULL OR o.id < t.id)
+);
+UPDATE councillor_committees t SET committee_id = s.survivor_id FROM committee_survivors s WHERE t.committee_id = s.id;
+
+DELETE FROM committees WHERE id IN (SELECT id FROM committee_survivors);
+DROP TABLE committee_survivors;
+
+ALTER TABLE committees ADD CONSTRAINT committees_name_key UNIQUE (name);
@@ -0,0 +1,75 @@
+-- Set-based merge of duplicate councillors for scraper/merge_councillors.py
+-- Takes the whole survivor map ({"<duplicate id>": "<survivor id>", ...}) and, in one
+-- transaction, re-points every table referencing councillors(id) to the survivors
+-- and deletes the duplicates: one statement per table instead of a round trip
+-- per duplicate and table.
+-- Tables that are unique per councillor (votes, bill_cosponsors,
+-- councillor_committees, investigation_councillors) keep the survivor's own row
+-- when both have the same link; otherwise the duplicate's row with the lowest id.
+-- 사용 예: SELECT merge_councillors('{"<중복 의원 uuid>": "<남길 의원 uuid>"}');
+
+CREATE OR REPLACE FUNCTION merge_councillors(p_merges JSONB)
+RETURNS JSONB AS $$
+DECLARE
+    ref RECORD;
+    moved INTEGER;
+    dropped INTEGER;
+    result JSONB := '{}'::JSONB;
+BEGIN
+    DROP TABLE IF EXISTS pg_temp.councillor_merges;
+    CREATE TEMP TABLE councillor_merges ON COMMIT DROP AS
+    SELECT key::UUID AS id, value::UUID AS survivor_id FROM jsonb_each_text(p_merges);
+
+    IF EXISTS (
+        SELECT 1 FROM councillor_merges m
+        WHERE m.survivor_id IN (SELECT id FROM councillor_merges)
+           OR NOT EXISTS (SELECT 1 FROM councillors c WHERE c.id = m.survivor_id)
+    ) THEN
+        RAISE EXCEPTION 'merge_councillors: every survivor must be an existing councillor that is not merged away';
+    END IF;
+
+    -- Every foreign key to councillors(id), with the columns it is unique with
+    FOR ref IN SELECT * FROM (VALUES
+        ('bills', 'proposer_id', NULL::TEXT[]),
+        ('speeches', 'councillor_id', NULL),
+        ('subscriptions', 'councillor_id', NULL),
+        ('votes', 'councillor_id', ARRAY['bill_id']),
+        ('bill_cosponsors', 'councillor_id', ARRAY['bill_id']),
+        ('councillor_committees', 'councillor_id', ARRAY['committee_id', 'start_date']),
+        ('investigation_councillors', 'councillor_id', ARRAY['investigation_id'])
+    ) AS r(tbl, col, unique_with)
+    LOOP
+        dropped := 0;
+        IF ref.unique_with IS NOT NULL THEN
+            EXECUTE format(
+                'DELETE FROM %1$I t USING councillor_merges m
+                 WHERE t.%2$I = m.id AND EXISTS (
+                     SELECT 1 FROM %1$I o LEFT JOIN councillor_merges om ON om.id = o.%2$I
+                     WHERE %3$s AND COALESCE(om.survivor_id, o.%2$I) = m.survivor_id
+                       AND (om.id IS NULL OR o.id < t.id))',
+                ref.tbl, ref.col,
+                (SELECT string_agg(format('o.%1$I IS NOT DISTINCT FROM t.%1$I', c), ' AND ')
+                 FROM unnest(ref.unique_with) AS c)
+            );
+            GET DIAGNOSTICS dropped = ROW_COUNT;
+        END IF;
+
+        EXECUTE format(
+            'UPDATE %1$I t SET %2$I = m.survivor_id FROM councillor_merges m WHERE t.%2$I = m.id',
+            ref.tbl, ref.col
+        );
+        GET DIAGNOSTICS moved = ROW_COUNT;
+        result := result || jsonb_build_object(ref.tbl, jsonb_build_object('moved', moved, 'dropped', dropped));
+    END LOOP;
+
+    DELETE FROM councillors WHERE id IN (SELECT id FROM councillor_merges);
+    GET DIAGNOSTICS moved = ROW_COUNT;
+    RETURN result || jsonb_build_object('councillors', jsonb_build_object('deleted', moved));
+END;
+$$ LANGUAGE plpgsql;
+
+-- Only maintenance scripts (service role) merge councillors
+REVOKE EXECUTE ON FUNCTION merge_councillors(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION merge_councillors(JSONB) TO service_role;
+
+COMMENT ON FUNCTION merge_councillors(JSONB) IS 'Merge duplicate councillors into survivors across every referencing table in one transaction';
@@ -25,14 +25,16 @@ CREATE TABLE councillors (
     phone VARCHAR(50),
     office_location VARCHAR(200),
     profile_url TEXT, -- 공식 웹사이트 프로필 링크
+    content_hash CHAR(64), -- 스크레이핑 필드 지문 (SHA-256, 변경 감지용)
     created_at TIMESTAMPTZ DEFAULT NOW(),
-    updated_at TIMESTAMPTZ DEFAULT NOW()
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    UNIQUE NULLS NOT DISTINCT (name, term_number) -- 자연 키 (스크레이퍼 upsert on_conflict)
 );
 
 -- 위원회 정보 (Committees)
 CREATE TABLE committees (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    name VARCHAR(200) NOT NULL,
+    name VARCHAR(200) NOT NULL UNIQUE,
     name_en VARCHAR(200),
     type VARCHAR(50), -- 상임위원회, 특별위원회 등
     description TEXT,
@@ -61,9 +63,11 @@ CREATE TABLE meetings (
     session_number INTEGER, -- 회기
     meeting_number INTEGER, -- 차수
     transcript_url TEXT, -- 회의록 원문 URL
+    transcript_uid BIGINT UNIQUE, -- 회의록 원문 URL의 uid (자연 키, 스크레이퍼 upsert on_conflict)
     video_url TEXT, -- 영상회의록 URL
     transcript_text TEXT, -- 전체 회의록 텍스트
     is_processed BOOLEAN DEFAULT false, -- AI 처리 완료 여부
+    content_hash CHAR(64), -- 스크레이핑 필드 지문 (SHA-256, 변경 감지용)
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
@@ -81,6 +85,7 @@ CREATE TABLE bills (
     summary TEXT,
     full_text TEXT,
     bill_url TEXT, -- 공식 사이트 의안 상세 페이지
+    content_hash CHAR(64), -- 스크레이핑 필드 지문 (SHA-256, 변경 감지용)
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
@@ -193,6 +198,54 @@ CREATE TABLE speech_embeddings (
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- =============================================
+-- SCRAPER STATE TABLES (service role only)
+-- =============================================
+
+-- 목록 증분 수집 기준 (Crawl State) - 목록은 uid가 아니라 일자순
+CREATE TABLE crawl_state (
+    listing VARCHAR(50) PRIMARY KEY, -- 'meetings', 'bills'
+    high_water_date DATE NOT NULL, -- 가장 최근에 수집한 목록 일자 (회의일 / 제출일)
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- 제출한 Claude 메시지 배치 (LLM Batches) - extract_speeches.py --batch
+CREATE TABLE llm_batches (
+    id VARCHAR(100) PRIMARY KEY, -- Message Batches API id (msgbatch_...)
+    status VARCHAR(20) NOT NULL DEFAULT 'submitted', -- submitted, collected, failed
+    request_count INTEGER NOT NULL,
+    context JSONB NOT NULL, -- 회의별 단계와 요청(custom_id)별 조각 번호/speech_order (회의록·발언은 담지 않음)
+    submitted_at TIMESTAMPTZ DEFAULT NOW(),
+    collected_at TIMESTAMPTZ
+);
+
+-- 발언 추출 체크포인트 (Speech Checkpoints) - 저장 전 회의별 진행 단계
+CREATE TABLE speech_checkpoints (
+    meeting_id UUID PRIMARY KEY REFERENCES meetings(id) ON DELETE CASCADE,
+    stage VARCHAR(20) NOT NULL, -- segmented, summarizing
+    speeches JSONB NOT NULL, -- [{"order", "speaker", "role", "text", "councillor_id"}]
+    summaries JSONB NOT NULL DEFAULT '{}', -- {"<order>": {"summary", "keywords"}}
+    summarized INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- 키워드 문서 빈도 (Keyword Terms) - 발언 키워드 TF-IDF의 IDF
+CREATE TABLE keyword_terms (
+    term TEXT PRIMARY KEY, -- 명사 n-gram ("예산", "예산 집행")
+    doc_count INTEGER NOT NULL, -- 이 용어가 나오는 발언 수
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- 회의별 키워드 색인 (Keyword Meetings) - 재색인 시 기존 기여분 교체
+CREATE TABLE keyword_meetings (
+    meeting_id UUID PRIMARY KEY REFERENCES meetings(id) ON DELETE CASCADE,
+    documents INTEGER NOT NULL, -- 색인한 발언 수
+    terms JSONB NOT NULL, -- 이 회의가 keyword_terms에 더한 발언 수 {"<term>": n}
+    stale BOOLEAN NOT NULL DEFAULT false, -- 색인 후 발언이 바뀜 (다시 색인 필요)
+    indexed_at TIMESTAMPTZ DEFAULT NOW()
+);
+
 -- =============================================
 -- INDEXES FOR PERFORMANCE
 -- =============================================
@@ -210,6 +263,11 @@ CREATE INDEX idx_meetings_type ON meetings(meeting_type);
 CREATE INDEX idx_meetings_committee ON meetings(committee_id);
 CREATE INDEX idx_meetings_title_search ON meetings USING gin(title gin_trgm_ops);
 CREATE INDEX idx_meetings_transcript_search ON meetings USING gin(transcript_text gin_trgm_ops);
+-- extract_speeches.py가 (created_at, id) 키셋으로 읽는 처리 대기 회의 / --force 시 회의록이 있는 전체 회의
+CREATE INDEX idx_meetings_pending_keyset ON meetings(created_at DESC, id DESC)
+    WHERE is_processed IS NOT TRUE AND transcript_text IS NOT NULL;
+CREATE INDEX idx_meetings_transcript_keyset ON meetings(created_at DESC, id DESC)
+    WHERE transcript_text IS NOT NULL;
 
 -- Bills
 CREATE INDEX idx_bills_status ON bills(status);
@@ -235,6 +293,12 @@ CREATE INDEX idx_subscriptions_user ON subscriptions(user_id);
 CREATE INDEX idx_subscriptions_type ON subscriptions(alert_type);
 CREATE INDEX idx_subscriptions_active ON subscriptions(is_active);
 
+-- LLM batches
+CREATE INDEX idx_llm_batches_status ON llm_batches(status);
+
+-- Keyword index
+CREATE INDEX idx_keyword_meetings_stale ON keyword_meetings(meeting_id) WHERE stale;
+
 -- Vector similarity search (Phase 3)
 CREATE INDEX idx_speech_embeddings_vector ON speech_embeddings
     USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
@@ -296,6 +360,222 @@ CREATE TRIGGER update_bills_updated_at BEFORE UPDATE ON bills
 CREATE TRIGGER update_speeches_updated_at BEFORE UPDATE ON speeches
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- 회의 발언 일괄 교체 (extract_speeches.py)
+-- 발언 삭제·삽입, is_processed 설정, 체크포인트 삭제를 한 트랜잭션으로 처리
+-- 사용 예: SELECT replace_meeting_speeches('<meeting uuid>', '[{"speech_order": 1, "speech_text": "..."}]');
+CREATE OR REPLACE FUNCTION replace_meeting_speeches(p_meeting_id UUID, p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    inserted INTEGER;
+BEGIN
+    DELETE FROM speeches WHERE meeting_id = p_meeting_id;
+
+    INSERT INTO speeches (
+        meeting_id, councillor_id, speech_order, speech_text, summary, keywords, created_at, updated_at
+    )
+    SELECT
+        p_meeting_id,
+        r.councillor_id,
+        r.speech_order,
+        r.speech_text,
+        r.summary,
+        r.keywords,
+        COALESCE(r.created_at, NOW()),
+        COALESCE(r.updated_at, NOW())
+    FROM jsonb_to_recordset(p_rows) AS r(
+        councillor_id UUID,
+        speech_order INTEGER,
+        speech_text TEXT,
+        summary TEXT,
+        keywords TEXT[],
+        created_at TIMESTAMPTZ,
+        updated_at TIMESTAMPTZ
+    );
+
+    GET DIAGNOSTICS inserted = ROW_COUNT;
+
+    UPDATE meetings SET is_processed = true, updated_at = NOW() WHERE id = p_meeting_id;
+    DELETE FROM speech_checkpoints WHERE meeting_id = p_meeting_id;
+
+    RETURN inserted;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Only the scraper (service role) rewrites speeches
+REVOKE EXECUTE ON FUNCTION replace_meeting_speeches(UUID, JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION replace_meeting_speeches(UUID, JSONB) TO service_role;
+
+COMMENT ON FUNCTION replace_meeting_speeches(UUID, JSONB) IS 'Replace all speeches of one meeting in a single transaction';
+
+-- 발언 키워드 색인 (extract_keywords.py)
+-- Add (or replace) the term counts of meetings and return the corpus size and
+-- the updated document frequencies of every term passed in
+-- 사용 예: SELECT index_meeting_keywords('[{"meeting_id": "<uuid>", "documents": 120, "terms": {"예산": 14}}]');
+CREATE OR REPLACE FUNCTION index_meeting_keywords(p_meetings JSONB)
+RETURNS JSONB AS $$
+DECLARE
+    m JSONB;
+    old_terms JSONB;
+BEGIN
+    FOR m IN SELECT value FROM jsonb_array_elements(p_meetings) LOOP
+        SELECT terms INTO old_terms
+        FROM keyword_meetings
+        WHERE meeting_id = (m->>'meeting_id')::UUID
+        FOR UPDATE;
+
+        IF old_terms IS NOT NULL THEN
+            UPDATE keyword_terms k
+            SET doc_count = k.doc_count - o.value::INTEGER, updated_at = NOW()
+            FROM jsonb_each_text(old_terms) AS o
+            WHERE k.term = o.key;
+        END IF;
+
+        INSERT INTO keyword_terms (term, doc_count)
+        SELECT key, value::INTEGER FROM jsonb_each_text(m->'terms')
+        ON CONFLICT (term) DO UPDATE
+        SET doc_count = keyword_terms.doc_count + EXCLUDED.doc_count, updated_at = NOW();
+
+        INSERT INTO keyword_meetings (meeting_id, documents, terms, indexed_at)
+        VALUES ((m->>'meeting_id')::UUID, (m->>'documents')::INTEGER, m->'terms', NOW())
+        ON CONFLICT (meeting_id) DO UPDATE
+        SET documents = EXCLUDED.documents, terms = EXCLUDED.terms, stale = false, indexed_at = NOW();
+    END LOOP;
+
+    DELETE FROM keyword_terms WHERE doc_count <= 0;
+
+    RETURN jsonb_build_object(
+        'documents', (SELECT COALESCE(SUM(documents), 0) FROM keyword_meetings),
+        'terms', (
+            SELECT COALESCE(jsonb_object_agg(k.term, k.doc_count), '{}'::JSONB)
+            FROM keyword_terms k
+            WHERE k.term IN (
+                SELECT jsonb_object_keys(value->'terms') FROM jsonb_array_elements(p_meetings)
+            )
+        )
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Bulk keyword update: one statement for many speeches
+-- 사용 예: SELECT set_speech_keywords('[{"id": "<speech uuid>", "keywords": ["예산 집행", "도로"]}]');
+CREATE OR REPLACE FUNCTION set_speech_keywords(p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated INTEGER;
+BEGIN
+    UPDATE speeches s
+    SET keywords = r.keywords
+    FROM jsonb_to_recordset(p_rows) AS r(id UUID, keywords TEXT[])
+    WHERE s.id = r.id;
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Any change to a meeting's speeches (replace_meeting_speeches, manual fixes)
+-- marks its index entry stale; statement-level, so a bulk replace costs one update
+CREATE OR REPLACE FUNCTION mark_keyword_meetings_stale()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE keyword_meetings SET stale = true
+    WHERE NOT stale AND meeting_id IN (SELECT DISTINCT meeting_id FROM changed_speeches);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE TRIGGER mark_keywords_stale_on_speech_insert AFTER INSERT ON speeches
+    REFERENCING NEW TABLE AS changed_speeches
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_keyword_meetings_stale();
+
+CREATE TRIGGER mark_keywords_stale_on_speech_delete AFTER DELETE ON speeches
+    REFERENCING OLD TABLE AS changed_speeches
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_keyword_meetings_stale();
+
+-- Only the scraper (service role) maintains the keyword index
+REVOKE EXECUTE ON FUNCTION index_meeting_keywords(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION index_meeting_keywords(JSONB) TO service_role;
+REVOKE EXECUTE ON FUNCTION set_speech_keywords(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION set_speech_keywords(JSONB) TO service_role;
+
+COMMENT ON FUNCTION index_meeting_keywords(JSONB) IS 'Add or replace the keyword term counts of meetings';
+COMMENT ON FUNCTION set_speech_keywords(JSONB) IS 'Set keywords of many speeches in one statement';
+
+-- 중복 의원 병합 (merge_councillors.py)
+-- Takes the whole survivor map ({"<duplicate id>": "<survivor id>", ...}) and, in one
+-- transaction, re-points every table referencing councillors(id) to the survivors
+-- and deletes the duplicates: one statement per table instead of a round trip
+-- per duplicate and table.
+-- Tables that are unique per councillor (votes, bill_cosponsors,
+-- councillor_committees, investigation_councillors) keep the survivor's own row
+-- when both have the same link; otherwise the duplicate's row with the lowest id.
+-- 사용 예: SELECT merge_councillors('{"<중복 의원 uuid>": "<남길 의원 uuid>"}');
+CREATE OR REPLACE FUNCTION merge_councillors(p_merges JSONB)
+RETURNS JSONB AS $$
+DECLARE
+    ref RECORD;
+    moved INTEGER;
+    dropped INTEGER;
+    result JSONB := '{}'::JSONB;
+BEGIN
+    DROP TABLE IF EXISTS pg_temp.councillor_merges;
+    CREATE TEMP TABLE councillor_merges ON COMMIT DROP AS
+    SELECT key::UUID AS id, value::UUID AS survivor_id FROM jsonb_each_text(p_merges);
+
+    IF EXISTS (
+        SELECT 1 FROM councillor_merges m
+        WHERE m.survivor_id IN (SELECT id FROM councillor_merges)
+           OR NOT EXISTS (SELECT 1 FROM councillors c WHERE c.id = m.survivor_id)
+    ) THEN
+        RAISE EXCEPTION 'merge_councillors: every survivor must be an existing councillor that is not merged away';
+    END IF;
+
+    -- Every foreign key to councillors(id), with the columns it is unique with
+    FOR ref IN SELECT * FROM (VALUES
+        ('bills', 'proposer_id', NULL::TEXT[]),
+        ('speeches', 'councillor_id', NULL),
+        ('subscriptions', 'councillor_id', NULL),
+        ('votes', 'councillor_id', ARRAY['bill_id']),
+        ('bill_cosponsors', 'councillor_id', ARRAY['bill_id']),
+        ('councillor_committees', 'councillor_id', ARRAY['committee_id', 'start_date']),
+        ('investigation_councillors', 'councillor_id', ARRAY['investigation_id'])
+    ) AS r(tbl, col, unique_with)
+    LOOP
+        dropped := 0;
+        IF ref.unique_with IS NOT NULL THEN
+            EXECUTE format(
+                'DELETE FROM %1$I t USING councillor_merges m
+                 WHERE t.%2$I = m.id AND EXISTS (
+                     SELECT 1 FROM %1$I o LEFT JOIN councillor_merges om ON om.id = o.%2$I
+                     WHERE %3$s AND COALESCE(om.survivor_id, o.%2$I) = m.survivor_id
+                       AND (om.id IS NULL OR o.id < t.id))',
+                ref.tbl, ref.col,
+                (SELECT string_agg(format('o.%1$I IS NOT DISTINCT FROM t.%1$I', c), ' AND ')
+                 FROM unnest(ref.unique_with) AS c)
+            );
+            GET DIAGNOSTICS dropped = ROW_COUNT;
+        END IF;
+
+        EXECUTE format(
+            'UPDATE %1$I t SET %2$I = m.survivor_id FROM councillor_merges m WHERE t.%2$I = m.id',
+            ref.tbl, ref.col
+        );
+        GET DIAGNOSTICS moved = ROW_COUNT;
+        result := result || jsonb_build_object(ref.tbl, jsonb_build_object('moved', moved, 'dropped', dropped));
+    END LOOP;
+
+    DELETE FROM councillors WHERE id IN (SELECT id FROM councillor_merges);
+    GET DIAGNOSTICS moved = ROW_COUNT;
+    RETURN result || jsonb_build_object('councillors', jsonb_build_object('deleted', moved));
+END;
+$$ LANGUAGE plpgsql;
+
+-- Only maintenance scripts (service role) merge councillors
+REVOKE EXECUTE ON FUNCTION merge_councillors(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION merge_councillors(JSONB) TO service_role;
+
+COMMENT ON FUNCTION merge_councillors(JSONB) IS 'Merge duplicate councillors into survivors across every referencing table in one transaction';
+
 -- =============================================
 -- ROW LEVEL SECURITY (RLS) POLICIES
 -- =============================================
@@ -342,3 +622,20 @@ CREATE POLICY "Users can delete own subscriptions" ON subscriptions
 -- Users can view their own chat history
 CREATE POLICY "Users can view own chat history" ON chat_history
     FOR SELECT USING (auth.uid() = user_id);
+
+-- Scraper state: only the service role may read or write it
+ALTER TABLE crawl_state ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "Allow service role to manage crawl_state" ON crawl_state
+    FOR ALL USING (auth.role() = 'service_role') WITH CHECK (auth.role() = 'service_role');
+ALTER TABLE llm_batches ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "Allow service role to manage llm_batches" ON llm_batches
+    FOR ALL USING (auth.role() = 'service_role') WITH CHECK (auth.role() = 'service_role');
+ALTER TABLE speech_checkpoints ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "Allow service role to manage speech_checkpoints" ON speech_checkpoints
+    FOR ALL USING (auth.role() = 'service_role') WITH CHECK (auth.role() = 'service_role');
+ALTER TABLE keyword_terms ENABLE ROW LEVEL SECURITY;
+ALTER TABLE keyword_meetings ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "Allow service role to manage keyword_terms" ON keyword_terms
+    FOR ALL USING (auth.role() = 'service_role') WITH CHECK (auth.role() = 'service_role');
+CREATE POLICY "Allow service role to manage keyword_meetings" ON keyword_meetings
+    FOR ALL USING (auth.role() = 'service_role') WITH CHECK (auth.role() = 'service_role');